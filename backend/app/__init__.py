@@ -12,6 +12,7 @@ from .routes.health import health_bp
 from .routes.reservations import reservations_admin_bp, reservations_bp
 from .routes.system_settings import bp as system_settings_bp
 from .routes.export import export_bp
+from .utils.email import outbox_dispatcher
 
 # Import models so Alembic autogenerate can discover metadata.
 from . import models  # noqa: F401
@@ -44,6 +45,9 @@ def create_app() -> Flask:
     app.register_blueprint(system_settings_bp)
     app.register_blueprint(export_bp)
 
+    if settings.outbox_dispatcher:
+        outbox_dispatcher.start()
+
     @app.get("/api/ping")
     def ping() -> tuple[dict[str, str], int]:
         """Lightweight endpoint useful for uptime checks."""
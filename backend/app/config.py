@@ -29,8 +29,43 @@ class Settings:
     mail_password: str | None
     mail_use_tls: bool
     mail_default_sender: str | None
+    mail_smtp_idle_seconds: int
     gas_webhook_url: str | None
     gas_webhook_secret: str | None
+    gas_connect_timeout_seconds: int
+    gas_read_timeout_seconds: int
+    gas_batch_size: int
+    mail_rate_limit: bool
+    mail_rate_max_wait_seconds: int
+    gas_send_per_minute: int
+    gas_send_burst: int
+    gas_send_daily: int
+    mail_send_per_minute: int
+    mail_send_burst: int
+    mail_send_daily: int
+    calendar_cache_size: int
+    calendar_cache_ttl_seconds: int
+    sse_max_subscribers: int
+    sse_queue_size: int
+    sse_heartbeat_seconds: int
+    sse_max_stream_seconds: int
+    pending_count_reconcile_seconds: int
+    export_dir: str
+    export_job_ttl_seconds: int
+    export_job_stale_seconds: int
+    export_workers: int
+    notification_workers: int
+    notification_queue_size: int
+    notification_overflow: str
+    admin_recipient_cache_ttl_seconds: int
+    notification_digest: bool
+    notification_digest_seconds: int
+    notification_digest_max: int
+    outbox_dispatcher: bool
+    outbox_batch_size: int
+    outbox_poll_seconds: int
+    outbox_max_attempts: int
+    outbox_retry_base_seconds: int
 
 
 @lru_cache(maxsize=1)
@@ -71,8 +106,50 @@ def get_settings() -> Settings:
     mail_password = os.getenv("MAIL_PASSWORD")
     mail_use_tls = _get_bool("MAIL_USE_TLS", True)
     mail_default_sender = os.getenv("MAIL_DEFAULT_SENDER")
+    mail_smtp_idle_seconds = _get_int("MAIL_SMTP_IDLE_SECONDS", 60)
     gas_webhook_url = os.getenv("GAS_WEBHOOK_URL")
     gas_webhook_secret = os.getenv("GAS_WEBHOOK_SECRET")
+    gas_connect_timeout_seconds = _get_int("GAS_CONNECT_TIMEOUT_SECONDS", 10)
+    gas_read_timeout_seconds = _get_int("GAS_READ_TIMEOUT_SECONDS", 30)
+    gas_batch_size = _get_int("GAS_BATCH_SIZE", 1)
+    # Apps Script MailApp allows 100 recipients/day on consumer accounts and
+    # Gmail SMTP about 500; both throttle bursts well before that.
+    mail_rate_limit = _get_bool("MAIL_RATE_LIMIT", True)
+    mail_rate_max_wait_seconds = _get_int("MAIL_RATE_MAX_WAIT_SECONDS", 30)
+    gas_send_per_minute = _get_int("GAS_SEND_PER_MINUTE", 60)
+    gas_send_burst = _get_int("GAS_SEND_BURST", 10)
+    gas_send_daily = _get_int("GAS_SEND_DAILY", 100)
+    mail_send_per_minute = _get_int("MAIL_SEND_PER_MINUTE", 30)
+    mail_send_burst = _get_int("MAIL_SEND_BURST", 5)
+    mail_send_daily = _get_int("MAIL_SEND_DAILY", 500)
+
+    calendar_cache_size = _get_int("CALENDAR_CACHE_SIZE", 256)
+    calendar_cache_ttl_seconds = _get_int("CALENDAR_CACHE_TTL_SECONDS", 60)
+
+    sse_max_subscribers = _get_int("SSE_MAX_SUBSCRIBERS", 32)
+    sse_queue_size = _get_int("SSE_QUEUE_SIZE", 100)
+    sse_heartbeat_seconds = _get_int("SSE_HEARTBEAT_SECONDS", 15)
+    sse_max_stream_seconds = _get_int("SSE_MAX_STREAM_SECONDS", 300)
+    pending_count_reconcile_seconds = _get_int("PENDING_COUNT_RECONCILE_SECONDS", 300)
+
+    export_dir = os.getenv("EXPORT_DIR", str(default_db.parent / "exports"))
+    export_job_ttl_seconds = _get_int("EXPORT_JOB_TTL_SECONDS", 900)
+    export_job_stale_seconds = _get_int("EXPORT_JOB_STALE_SECONDS", 120)
+    export_workers = _get_int("EXPORT_WORKERS", 2)
+
+    notification_workers = _get_int("NOTIFICATION_WORKERS", 2)
+    notification_queue_size = _get_int("NOTIFICATION_QUEUE_SIZE", 200)
+    notification_overflow = os.getenv("NOTIFICATION_OVERFLOW", "caller_runs").strip().lower()
+    admin_recipient_cache_ttl_seconds = _get_int("ADMIN_RECIPIENT_CACHE_TTL_SECONDS", 300)
+    notification_digest = _get_bool("NOTIFICATION_DIGEST", False)
+    notification_digest_seconds = _get_int("NOTIFICATION_DIGEST_SECONDS", 60)
+    notification_digest_max = _get_int("NOTIFICATION_DIGEST_MAX", 20)
+
+    outbox_dispatcher = _get_bool("OUTBOX_DISPATCHER", True)
+    outbox_batch_size = _get_int("OUTBOX_BATCH_SIZE", 20)
+    outbox_poll_seconds = _get_int("OUTBOX_POLL_SECONDS", 5)
+    outbox_max_attempts = _get_int("OUTBOX_MAX_ATTEMPTS", 6)
+    outbox_retry_base_seconds = _get_int("OUTBOX_RETRY_BASE_SECONDS", 30)
 
     return Settings(
         secret_key=secret,
@@ -89,6 +166,41 @@ def get_settings() -> Settings:
         mail_password=mail_password,
         mail_use_tls=mail_use_tls,
         mail_default_sender=mail_default_sender,
+        mail_smtp_idle_seconds=mail_smtp_idle_seconds,
         gas_webhook_url=gas_webhook_url,
         gas_webhook_secret=gas_webhook_secret,
+        gas_connect_timeout_seconds=gas_connect_timeout_seconds,
+        gas_read_timeout_seconds=gas_read_timeout_seconds,
+        gas_batch_size=gas_batch_size,
+        mail_rate_limit=mail_rate_limit,
+        mail_rate_max_wait_seconds=mail_rate_max_wait_seconds,
+        gas_send_per_minute=gas_send_per_minute,
+        gas_send_burst=gas_send_burst,
+        gas_send_daily=gas_send_daily,
+        mail_send_per_minute=mail_send_per_minute,
+        mail_send_burst=mail_send_burst,
+        mail_send_daily=mail_send_daily,
+        calendar_cache_size=calendar_cache_size,
+        calendar_cache_ttl_seconds=calendar_cache_ttl_seconds,
+        sse_max_subscribers=sse_max_subscribers,
+        sse_queue_size=sse_queue_size,
+        sse_heartbeat_seconds=sse_heartbeat_seconds,
+        sse_max_stream_seconds=sse_max_stream_seconds,
+        pending_count_reconcile_seconds=pending_count_reconcile_seconds,
+        export_dir=export_dir,
+        export_job_ttl_seconds=export_job_ttl_seconds,
+        export_job_stale_seconds=export_job_stale_seconds,
+        export_workers=export_workers,
+        notification_workers=notification_workers,
+        notification_queue_size=notification_queue_size,
+        notification_overflow=notification_overflow,
+        admin_recipient_cache_ttl_seconds=admin_recipient_cache_ttl_seconds,
+        notification_digest=notification_digest,
+        notification_digest_seconds=notification_digest_seconds,
+        notification_digest_max=notification_digest_max,
+        outbox_dispatcher=outbox_dispatcher,
+        outbox_batch_size=outbox_batch_size,
+        outbox_poll_seconds=outbox_poll_seconds,
+        outbox_max_attempts=outbox_max_attempts,
+        outbox_retry_base_seconds=outbox_retry_base_seconds,
     )
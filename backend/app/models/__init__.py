@@ -1,9 +1,19 @@
 """Expose ORM models for metadata discovery."""
 
+from .outbox import OutboxMessage
 from .refresh_token import RefreshToken
-from .reservation import Reservation
+from .reservation import Reservation, ReservationCounter, ReservationTombstone
 from .system_setting import SystemSetting
 from .user import User
 from .whitelist import WhitelistEntry
 
-__all__ = ["User", "Reservation", "WhitelistEntry", "RefreshToken", "SystemSetting"]
+__all__ = [
+    "User",
+    "Reservation",
+    "ReservationCounter",
+    "ReservationTombstone",
+    "WhitelistEntry",
+    "RefreshToken",
+    "SystemSetting",
+    "OutboxMessage",
+]
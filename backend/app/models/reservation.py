@@ -5,7 +5,7 @@ from __future__ import annotations
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -21,6 +21,12 @@ class ReservationStatus(str, enum.Enum):
     CANCELLATION_REQUESTED = "cancellation_requested"
 
 
+# Reservations waiting for an admin decision.
+PENDING_STATUSES = (ReservationStatus.PENDING, ReservationStatus.CANCELLATION_REQUESTED)
+# Enum columns store member names, so the partial index predicate uses them too.
+_PENDING_PREDICATE = text("status IN ('PENDING', 'CANCELLATION_REQUESTED')")
+
+
 class ReservationVisibility(str, enum.Enum):
     """Controls how much information is shown on the public calendar."""
 
@@ -32,10 +38,24 @@ class Reservation(Base):
     """Mountain hut reservation request."""
 
     __tablename__ = "reservations"
-    __table_args__ = (Index("ix_reservations_time_range", "start_time", "end_time"),)
+    __table_args__ = (
+        Index("ix_reservations_time_range", "start_time", "end_time"),
+        # Public calendar: status = approved within a window, ordered by start.
+        Index("ix_reservations_status_time_range", "status", "start_time", "end_time"),
+        # "Mine": one user's reservations ordered by start (also serves the FK).
+        Index("ix_reservations_user_start_time", "user_id", "start_time"),
+        # Pending count / admin queue: only the few undecided rows.
+        Index(
+            "ix_reservations_pending",
+            "status",
+            "start_time",
+            sqlite_where=_PENDING_PREDICATE,
+            postgresql_where=_PENDING_PREDICATE,
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     status_updated_by_user_id: Mapped[int | None] = mapped_column(
         ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
     )
@@ -59,8 +79,35 @@ class Reservation(Base):
     is_notification_sent: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False, index=True
     )
 
     user = relationship("User", back_populates="reservations", foreign_keys=[user_id])
     status_updated_by = relationship("User", foreign_keys=[status_updated_by_user_id])
+
+
+class ReservationTombstone(Base):
+    """Records a reservation leaving the public calendar so delta-sync clients can drop it.
+
+    Written when a reservation is deleted or stops being approved.
+    """
+
+    __tablename__ = "reservation_tombstones"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    reservation_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+
+class ReservationCounter(Base):
+    """Named reservation counts kept in step with every write.
+
+    Writers adjust ``value`` inside their own transaction; readers recount and
+    store the result when ``reconciled_at`` is older than the reconcile interval.
+    """
+
+    __tablename__ = "reservation_counters"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    value: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    reconciled_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -22,5 +22,8 @@ class WhitelistEntry(Base):
     is_admin_default: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     added_by_user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
 
     added_by_user = relationship("User", foreign_keys=[added_by_user_id])
@@ -15,7 +15,9 @@ from werkzeug.security import check_password_hash, generate_password_hash
 from app.config import get_settings
 from app.database import session_scope
 from app.models import RefreshToken, User, WhitelistEntry
+from app.routes.reservations import calendar_cache
 from app.schemas import serialize_user, serialize_whitelist_entry
+from app.utils.email import admin_recipient_cache
 
 auth_bp = Blueprint("auth", __name__)
 admin_bp = Blueprint("admin", __name__)
@@ -133,10 +135,14 @@ def register():
 
         token = _issue_token(user)
         refresh_token = _mint_refresh_token(session, user)
+        is_admin = user.is_admin
 
         response = jsonify({"user": _serialize_user_with_profile(session, user), "accessToken": token})
         _set_refresh_cookie(response, refresh_token)
-        return response, HTTPStatus.CREATED
+
+    if is_admin:
+        admin_recipient_cache.clear()
+    return response, HTTPStatus.CREATED
 
 
 @auth_bp.post("/api/auth/login")
@@ -286,7 +292,14 @@ def update_me():
             user.receives_notification = bool(data["receives_notification"])
 
         session.flush()
-        return jsonify({"user": _serialize_user_with_profile(session, user)}), HTTPStatus.OK
+        response_body = {"user": _serialize_user_with_profile(session, user)}
+        recipients_changed = user.is_admin and ("email" in data or "receives_notification" in data)
+
+    # Calendar events embed the applicant's display name.
+    calendar_cache.clear()
+    if recipients_changed:
+        admin_recipient_cache.clear()
+    return jsonify(response_body), HTTPStatus.OK
 
 
 @auth_bp.get("/api/auth/whitelist-check")
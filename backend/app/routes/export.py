@@ -1,23 +1,52 @@
-"""CSV export endpoint for reservation data (admin only)."""
+"""Reservation export endpoints (CSV / NDJSON, admin only)."""
 
 from __future__ import annotations
 
 import csv
+import hashlib
 import io
+import json
+import zlib
 from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, NamedTuple
 
-from flask import Blueprint, Response, request
+from flask import Blueprint, Response, request, send_file
 from flask_jwt_extended import get_jwt, jwt_required
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
+from app.config import get_settings
 from app.database import session_scope
 from app.models.reservation import Reservation, ReservationStatus
 from app.models.user import User
+from app.schemas import format_datetime
+from app.utils.export_jobs import COMPLETED, ExportJob, ExportJobStore
 
 export_bp = Blueprint("export", __name__)
 
+settings = get_settings()
+
 JST = timezone(timedelta(hours=9))
 
+# Rows fetched per round trip; also the unit in which CSV text is yielded.
+EXPORT_CHUNK_SIZE = 500
+
+# The watermark trails the clock so that a write stamped just before it, but
+# committed after the export read, is still picked up by the next incremental
+# export. Requests commit well within this margin.
+WATERMARK_LAG = timedelta(seconds=5)
+WATERMARK_HEADER = "X-Export-Watermark"
+
+# Exports too large for the request timeout run here and are downloaded later.
+export_jobs = ExportJobStore(
+    Path(settings.export_dir),
+    ttl=settings.export_job_ttl_seconds,
+    stale_after=settings.export_job_stale_seconds,
+    max_workers=settings.export_workers,
+)
+
 STATUS_LABELS = {
     "pending": "申請中",
     "approved": "承認済み",
@@ -57,6 +86,217 @@ def _display_name(user: User | None) -> str:
     return user.display_name or user.email
 
 
+CSV_HEADER = [
+    "予約ID",
+    "ステータス",
+    "担当者",
+    "申請者名",
+    "申請者メール",
+    "目的",
+    "利用開始日時",
+    "利用終了日時",
+    "人数",
+    "公開設定",
+    "詳細",
+    "表示メッセージ",
+    "却下理由",
+    "キャンセル理由",
+    "申請日時",
+]
+
+
+def _export_filters(args) -> tuple[dict[str, Any] | None, str | None]:
+    """Read the export filters; returns ``(filters, error)`` like the list endpoints."""
+    status = None
+    status_filter = args.get("status")  # e.g. "approved", "pending"
+    if status_filter:
+        try:
+            status = ReservationStatus(status_filter)
+        except ValueError:
+            pass
+
+    changed_since = None
+    raw_changed_since = args.get("changedSince")
+    if raw_changed_since:
+        # Unlike the other filters this one must not be dropped silently:
+        # ignoring it would turn an incremental sync into a full export.
+        changed_since = _naive_utc(_parse_date(raw_changed_since))
+        if changed_since is None:
+            return None, "changedSince が不正です"
+
+    return {
+        "status": status,
+        "start_from": _parse_date(args.get("startFrom")),
+        "start_to": _parse_date(args.get("startTo")),
+        "changed_since": changed_since,
+        # Rows updated after this instant belong to the next incremental export.
+        "watermark": datetime.utcnow() - WATERMARK_LAG,
+    }, None
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _format_watermark(value: datetime) -> str:
+    return value.isoformat() + "Z"
+
+
+def _export_key(filters: dict[str, Any], export_format: str) -> str:
+    """Stable hash of the format and effective filters, used to reuse a recent job."""
+    normalized = {
+        "format": export_format,
+        "status": filters["status"].value if filters["status"] else None,
+        "start_from": filters["start_from"].isoformat() if filters["start_from"] else None,
+        "start_to": filters["start_to"].isoformat() if filters["start_to"] else None,
+        "changed_since": filters["changed_since"].isoformat() if filters["changed_since"] else None,
+    }
+    return hashlib.sha1(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _export_filename(suffix: str) -> str:
+    now_jst = datetime.now(JST).strftime("%Y%m%d_%H%M%S")
+    return f"reservations_{now_jst}{suffix}"
+
+
+def _export_statement(filters: dict[str, Any]):
+    stmt = (
+        select(Reservation)
+        .join(User, Reservation.user_id == User.id)
+        .options(selectinload(Reservation.user), selectinload(Reservation.status_updated_by))
+        .order_by(Reservation.start_time.asc())
+    )
+    if filters["status"] is not None:
+        stmt = stmt.where(Reservation.status == filters["status"])
+    if filters["start_from"]:
+        stmt = stmt.where(Reservation.start_time >= filters["start_from"])
+    if filters["start_to"]:
+        stmt = stmt.where(Reservation.start_time <= filters["start_to"])
+    if filters["changed_since"]:
+        # Both bounds use ix_reservations_updated_at; the upper one keeps rows
+        # written during this export for the next run instead of skipping them.
+        stmt = stmt.where(
+            Reservation.updated_at > filters["changed_since"],
+            Reservation.updated_at <= filters["watermark"],
+        )
+    return stmt
+
+
+def _iter_reservation_chunks(filters: dict[str, Any]) -> Iterator[list[Reservation]]:
+    """Yield reservations ``EXPORT_CHUNK_SIZE`` at a time.
+
+    ``yield_per`` streams from a server-side cursor where the driver has one,
+    and the selectin loaders fetch the users of each chunk in one extra query.
+    Rows from earlier chunks are no longer referenced and get released, so
+    memory stays flat however large the export is.
+    """
+    stmt = _export_statement(filters).execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    with session_scope() as session:
+        for chunk in session.scalars(stmt).partitions():
+            yield chunk
+
+
+def _csv_row(r: Reservation) -> list[object]:
+    return [
+        r.id,
+        STATUS_LABELS.get(r.status.value, r.status.value),
+        _display_name(r.status_updated_by),
+        _display_name(r.user),
+        r.user.email if r.user else "",
+        r.purpose,
+        _format_jst(r.start_time),
+        _format_jst(r.end_time),
+        r.attendee_count,
+        VISIBILITY_LABELS.get(r.visibility.value, r.visibility.value),
+        r.description or "",
+        r.display_message or "",
+        r.rejection_reason or "",
+        r.cancellation_reason or "",
+        _format_jst(r.created_at),
+    ]
+
+
+def _csv_chunks(chunks: Iterable[list[Reservation]]) -> Iterator[str]:
+    """CSV text with a BOM (for Excel and Japanese text) and header first, then one piece per chunk."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_HEADER)
+    yield "\ufeff" + buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(_csv_row(r) for r in chunk)
+        yield buffer.getvalue()
+
+
+def _user_record(user: User | None) -> dict[str, object] | None:
+    if user is None:
+        return None
+    return {"id": user.id, "email": user.email, "displayName": user.display_name}
+
+
+def _ndjson_record(r: Reservation) -> dict[str, object]:
+    return {
+        "id": r.id,
+        "status": r.status.value,
+        "visibility": r.visibility.value,
+        "user": _user_record(r.user),
+        "statusUpdatedBy": _user_record(r.status_updated_by),
+        "purpose": r.purpose,
+        "displayMessage": r.display_message,
+        "description": r.description,
+        "attendeeCount": r.attendee_count,
+        "allowAdditionalMembers": r.allow_additional_members,
+        "notifyApplicant": r.notify_applicant,
+        "rejectionReason": r.rejection_reason,
+        "approvalMessage": r.approval_message,
+        "cancellationReason": r.cancellation_reason,
+        "startTime": format_datetime(r.start_time),
+        "endTime": format_datetime(r.end_time),
+        "createdAt": format_datetime(r.created_at),
+        "updatedAt": format_datetime(r.updated_at),
+    }
+
+
+def _ndjson_chunks(chunks: Iterable[list[Reservation]]) -> Iterator[str]:
+    """One JSON object per line; no header, so consumers can parse line by line."""
+    for chunk in chunks:
+        yield "".join(
+            json.dumps(_ndjson_record(r), ensure_ascii=False, separators=(",", ":")) + "\n" for r in chunk
+        )
+
+
+class _ExportFormat(NamedTuple):
+    render: Callable[[Iterable[list[Reservation]]], Iterator[str]]
+    mimetype: str
+    suffix: str
+
+
+EXPORT_FORMATS = {
+    "csv": _ExportFormat(_csv_chunks, "text/csv; charset=utf-8", ".csv"),
+    "ndjson": _ExportFormat(_ndjson_chunks, "application/x-ndjson; charset=utf-8", ".ndjson"),
+}
+
+
+def _export_format(args) -> tuple[str | None, str | None]:
+    name = args.get("format") or "csv"
+    if name not in EXPORT_FORMATS:
+        return None, "format は csv または ndjson で指定してください"
+    return name, None
+
+
+def _gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 @export_bp.get("/api/admin/reservations/export")
 @jwt_required()
 def export_reservations_csv():
@@ -64,87 +304,113 @@ def export_reservations_csv():
     if not claims.get("is_admin"):
         return {"message": "管理者権限が必要です"}, HTTPStatus.FORBIDDEN
 
-    # Parse query parameters for filtering
-    status_filter = request.args.get("status")  # e.g. "approved", "pending"
-    start_from = _parse_date(request.args.get("startFrom"))
-    start_to = _parse_date(request.args.get("startTo"))
+    # Parse query parameters for filtering before the response starts streaming.
+    filters, filter_error = _export_filters(request.args)
+    format_name, format_error = _export_format(request.args)
+    if filter_error or format_error:
+        return {"message": filter_error or format_error}, HTTPStatus.BAD_REQUEST
+    export_format = EXPORT_FORMATS[format_name]
+    use_gzip = "gzip" in request.accept_encodings
 
-    with session_scope() as session:
-        query = (
-            session.query(Reservation)
-            .join(User, Reservation.user_id == User.id)
-            .order_by(Reservation.start_time.asc())
-        )
+    headers = {
+        "Content-Disposition": f'attachment; filename="{_export_filename(export_format.suffix)}"',
+        # Pass back as changedSince to fetch only what changed after this export.
+        WATERMARK_HEADER: _format_watermark(filters["watermark"]),
+        "Access-Control-Expose-Headers": WATERMARK_HEADER,
+    }
 
-        # Apply filters
-        if status_filter:
-            try:
-                status_enum = ReservationStatus(status_filter)
-                query = query.filter(Reservation.status == status_enum)
-            except ValueError:
-                pass
-
-        if start_from:
-            query = query.filter(Reservation.start_time >= start_from)
-        if start_to:
-            query = query.filter(Reservation.start_time <= start_to)
-
-        reservations = query.all()
-
-        # Build CSV in memory
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Header row
-        writer.writerow([
-            "予約ID",
-            "ステータス",
-            "担当者",
-            "申請者名",
-            "申請者メール",
-            "目的",
-            "利用開始日時",
-            "利用終了日時",
-            "人数",
-            "公開設定",
-            "詳細",
-            "表示メッセージ",
-            "却下理由",
-            "キャンセル理由",
-            "申請日時",
-        ])
-
-        # Data rows
-        for r in reservations:
-            writer.writerow([
-                r.id,
-                STATUS_LABELS.get(r.status.value, r.status.value),
-                _display_name(r.status_updated_by),
-                _display_name(r.user),
-                r.user.email if r.user else "",
-                r.purpose,
-                _format_jst(r.start_time),
-                _format_jst(r.end_time),
-                r.attendee_count,
-                VISIBILITY_LABELS.get(r.visibility.value, r.visibility.value),
-                r.description or "",
-                r.display_message or "",
-                r.rejection_reason or "",
-                r.cancellation_reason or "",
-                _format_jst(r.created_at),
-            ])
-
-    csv_content = output.getvalue()
-
-    # Add BOM for Excel compatibility with Japanese characters
-    bom = "\ufeff"
-    now_jst = datetime.now(JST).strftime("%Y%m%d_%H%M%S")
-    filename = f"reservations_{now_jst}.csv"
-
-    return Response(
-        bom + csv_content,
-        mimetype="text/csv; charset=utf-8",
-        headers={
-            "Content-Disposition": f'attachment; filename="{filename}"',
-        },
+    body: Iterator[str] | Iterator[bytes] = export_format.render(_iter_reservation_chunks(filters))
+    if use_gzip:
+        body = _gzip_chunks(body)
+        headers["Content-Encoding"] = "gzip"
+
+    response = Response(body, mimetype=export_format.mimetype, headers=headers)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def _serialize_job(job: ExportJob) -> dict[str, object]:
+    def timestamp(value: float | None) -> str | None:
+        if value is None:
+            return None
+        return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+    return {
+        "id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "createdAt": timestamp(job.created_at),
+        "finishedAt": timestamp(job.finished_at),
+        "size": job.size,
+        "error": job.error,
+        "watermark": job.extra.get("watermark"),
+        "downloadUrl": f"/api/admin/reservations/export-jobs/{job.id}/download" if job.status == COMPLETED else None,
+    }
+
+
+@export_bp.post("/api/admin/reservations/export-jobs")
+@jwt_required()
+def create_export_job():
+    """Start a background export; the same format and filters within the TTL reuse the last job."""
+    claims = get_jwt()
+    if not claims.get("is_admin"):
+        return {"message": "管理者権限が必要です"}, HTTPStatus.FORBIDDEN
+
+    payload = request.get_json(silent=True) or {}
+    filters, filter_error = _export_filters(payload)
+    format_name, format_error = _export_format(payload)
+    if filter_error or format_error:
+        return {"message": filter_error or format_error}, HTTPStatus.BAD_REQUEST
+    export_format = EXPORT_FORMATS[format_name]
+
+    def write(handle: IO[str]) -> None:
+        handle.writelines(export_format.render(_iter_reservation_chunks(filters)))
+
+    export_jobs.cleanup()
+    job, reused = export_jobs.submit(
+        _export_key(filters, format_name),
+        filename=_export_filename(export_format.suffix),
+        suffix=export_format.suffix,
+        write=write,
+        extra={"format": format_name, "watermark": _format_watermark(filters["watermark"])},
+    )
+    body = {"job": _serialize_job(job), "reused": reused}
+    return body, HTTPStatus.OK if reused else HTTPStatus.ACCEPTED
+
+
+@export_bp.get("/api/admin/reservations/export-jobs/<job_id>")
+@jwt_required()
+def get_export_job(job_id: str):
+    claims = get_jwt()
+    if not claims.get("is_admin"):
+        return {"message": "管理者権限が必要です"}, HTTPStatus.FORBIDDEN
+
+    job = export_jobs.get(job_id)
+    if job is None:
+        return {"message": "エクスポートが見つかりません"}, HTTPStatus.NOT_FOUND
+    return {"job": _serialize_job(job)}, HTTPStatus.OK
+
+
+@export_bp.get("/api/admin/reservations/export-jobs/<job_id>/download")
+@jwt_required()
+def download_export_job(job_id: str):
+    claims = get_jwt()
+    if not claims.get("is_admin"):
+        return {"message": "管理者権限が必要です"}, HTTPStatus.FORBIDDEN
+
+    job = export_jobs.get(job_id)
+    if job is None:
+        return {"message": "エクスポートが見つかりません"}, HTTPStatus.NOT_FOUND
+    if job.status != COMPLETED:
+        return {"message": "エクスポートはまだ完了していません"}, HTTPStatus.CONFLICT
+
+    response = send_file(
+        export_jobs.artifact_path(job),
+        mimetype=EXPORT_FORMATS[job.extra.get("format", "csv")].mimetype,
+        as_attachment=True,
+        download_name=job.filename,
     )
+    if job.extra.get("watermark"):
+        response.headers[WATERMARK_HEADER] = job.extra["watermark"]
+        response.headers["Access-Control-Expose-Headers"] = WATERMARK_HEADER
+    return response
@@ -2,6 +2,18 @@
 
 from flask import Blueprint, jsonify
 
+from app.routes.auth import admin_required
+from app.routes.export import export_jobs
+from app.routes.reservations import calendar_cache, event_broker, occupancy_cache
+from app.utils.email import (
+    admin_recipient_cache,
+    gas_stats,
+    notification_pool,
+    outbox_dispatcher,
+    rate_limit_stats,
+    smtp_stats,
+)
+
 health_bp = Blueprint("health", __name__)
 
 
@@ -9,3 +21,21 @@ health_bp = Blueprint("health", __name__)
 def health_check():
     """Simple readiness endpoint used by monitors and tests."""
     return jsonify({"status": "ok"})
+
+
+@health_bp.get("/api/admin/metrics")
+@admin_required
+def metrics():
+    """In-process cache counters so admins can tune sizes and TTLs."""
+    return jsonify({
+        "calendarCache": calendar_cache.stats(),
+        "occupancyCache": occupancy_cache.stats(),
+        "eventStream": event_broker.stats(),
+        "exportJobs": export_jobs.stats(),
+        "notifications": notification_pool.stats(),
+        "adminRecipients": admin_recipient_cache.stats(),
+        "outbox": outbox_dispatcher.stats(),
+        "smtp": smtp_stats(),
+        "gasWebhook": gas_stats(),
+        "mailRateLimits": rate_limit_stats(),
+    })
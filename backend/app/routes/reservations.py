@@ -2,17 +2,38 @@
 
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any
+import base64
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Mapping, NamedTuple
 from http import HTTPStatus
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request
 from flask_jwt_extended import get_jwt, get_jwt_identity, jwt_required
-from sqlalchemy import or_
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
 
+from app.config import get_settings
 from app.database import session_scope
-from app.models.reservation import Reservation, ReservationStatus, ReservationVisibility
-from app.schemas import serialize_reservation
+from app.models.reservation import (
+    PENDING_STATUSES,
+    Reservation,
+    ReservationCounter,
+    ReservationStatus,
+    ReservationTombstone,
+    ReservationVisibility,
+)
+from app.models.user import User
+from app.models.whitelist import WhitelistEntry
+from app.schemas import ReservationSnapshot, format_datetime, reservation_values, serialize_reservation
+from app.schemas.reservation import RESERVATION_FIELDS, serialize_private_values, serialize_public_values
+from app.schemas.user import USER_FIELDS, serialize_user_values
+from app.utils.cache import TTLCache
+from app.utils.events import EventBroker, Subscriber
+from app.utils.occupancy import BUCKET_SIZES, bucket_bounds, local_date, sweep_occupancy
 from app.utils.email import (
     send_cancellation_request_notification,
     send_new_reservation_notification,
@@ -23,24 +44,261 @@ from app.utils.email import (
 reservations_bp = Blueprint("reservations", __name__)
 reservations_admin_bp = Blueprint("reservations_admin", __name__)
 
+settings = get_settings()
+
+# Calendar payloads per (window, visibility filter, viewer). Every reservation
+# write clears it after committing; the TTL bounds staleness across workers.
+calendar_cache = TTLCache(settings.calendar_cache_size, settings.calendar_cache_ttl_seconds)
+
+# Occupancy per (bucket size, bucket start), so overlapping windows share work.
+occupancy_cache = TTLCache(settings.calendar_cache_size * 16, settings.calendar_cache_ttl_seconds)
+MAX_OCCUPANCY_BUCKETS = 400
+
+# Live calendar / pending-count updates for /api/reservations/stream.
+event_broker = EventBroker(max_subscribers=settings.sse_max_subscribers, queue_size=settings.sse_queue_size)
+
+MAX_PAGE_LIMIT = 200
+
+# Deletions older than this are pruned; a delta-sync cursor older than this
+# cannot be served and the client is told to reload.
+TOMBSTONE_RETENTION = timedelta(days=30)
+
+# The delta-sync cursor trails the clock, like the export watermark, so a
+# write stamped just before a poll but committed after it is returned by the
+# next poll instead of falling behind the cursor.
+CHANGES_WATERMARK_LAG = timedelta(seconds=5)
+
+PENDING_COUNTER = "pending"
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+PENDING_RECONCILE_INTERVAL = timedelta(seconds=settings.pending_count_reconcile_seconds)
+
 
-def _calendar_payload(reservation: Reservation) -> dict[str, object]:
-    def format_dt(dt):
-        if not dt:
-            return None
-        if dt.tzinfo is None:
-            return dt.isoformat() + 'Z'
-        return dt.isoformat()
+class _Page(NamedTuple):
+    limit: int
+    after: tuple[datetime, int] | None
 
+
+@dataclass(frozen=True)
+class _ReservationChange:
+    """Calendar events for one written reservation, pre-rendered for each kind of viewer.
+
+    ``events`` maps public/owner/admin/adminOwner to the payload that viewer
+    would see, or None when the reservation is hidden from them. Viewers who may
+    have seen it before (``was_public``) are told to remove it instead, as are the
+    owner and admins when it was ``deleted``.
+    """
+
+    reservation_id: int
+    owner_id: int
+    was_public: bool
+    events: dict[str, dict[str, object] | None]
+    deleted: bool = False
+
+
+def _calendar_payload(values: Mapping[str, Any]) -> dict[str, object]:
     return {
-        "id": reservation.id,
-        "start": format_dt(reservation.start_time),
-        "end": format_dt(reservation.end_time),
-        "visibility": reservation.visibility.value,
-        "status": reservation.status.value,
+        "id": values["id"],
+        "start": format_datetime(values["start_time"]),
+        "end": format_datetime(values["end_time"]),
+        "visibility": values["visibility"].value,
+        "status": values["status"].value,
     }
 
 
+def _calendar_visibility(viewer_id: int | None, include_all: bool):
+    """SQL condition for the reservations a calendar viewer may see (None means all)."""
+    if include_all:
+        return None
+    if viewer_id is not None:
+        return or_(
+            Reservation.status == ReservationStatus.APPROVED,
+            Reservation.user_id == viewer_id,
+        )
+    return Reservation.status == ReservationStatus.APPROVED
+
+
+def _calendar_event(values: Mapping[str, Any], viewer_id: int | None, include_all: bool) -> dict[str, object]:
+    """Calendar event for one reservation, masked according to who is looking.
+
+    ``values`` is a calendar row (see :func:`_calendar_rows`) or the same keys
+    built from an ORM instance by :func:`_calendar_values`.
+    """
+    is_owner = viewer_id is not None and viewer_id == values["user_id"]
+    status = values["status"]
+
+    payload = _calendar_payload(values)
+    payload["isOwner"] = is_owner
+
+    if include_all or is_owner:
+        payload["title"] = values["display_message"] or values["purpose"]
+        payload["purpose"] = values["purpose"]
+        payload["description"] = values["description"]
+        payload["attendeeCount"] = values["attendee_count"]
+        payload["userDisplayName"] = values["applicant_display_name"] if values["applicant_id"] is not None else "Unknown"
+        if is_owner:
+            payload["displayMessage"] = values["display_message"]
+        if values["approver_id"] is not None:
+            payload["statusUpdatedByDisplayName"] = values["approver_display_name"] or values["approver_email"]
+        if status == ReservationStatus.REJECTED:
+            payload["rejectionReason"] = values["rejection_reason"]
+        if status in [ReservationStatus.APPROVED, ReservationStatus.CANCELLED]:
+            payload["approvalMessage"] = values["approval_message"]
+        if status == ReservationStatus.CANCELLATION_REQUESTED:
+            payload["cancellationReason"] = values["cancellation_reason"]
+    elif values["visibility"] == ReservationVisibility.PUBLIC:
+        user_name = values["applicant_display_name"] if values["applicant_id"] is not None else "Unknown"
+        if user_name is None:
+            user_name = "Unknown"
+        msg = values["display_message"] or "予約"
+        payload["title"] = f"{msg} ({user_name})"
+        payload["purpose"] = values["purpose"]
+        payload["description"] = values["description"]
+        payload["attendeeCount"] = values["attendee_count"]
+        payload["userDisplayName"] = user_name
+    else:
+        payload["title"] = None
+    return payload
+
+
+def _calendar_values(reservation: Reservation) -> dict[str, Any]:
+    """Calendar row keys for an ORM instance (used on the write paths)."""
+    values = dict(reservation_values(reservation))
+    user = reservation.user
+    approver = reservation.status_updated_by
+    values["applicant_id"] = user.id if user else None
+    values["applicant_display_name"] = user.display_name if user else None
+    values["approver_id"] = approver.id if approver else None
+    values["approver_display_name"] = approver.display_name if approver else None
+    values["approver_email"] = approver.email if approver else None
+    return values
+
+
+def _reservation_change(reservation: Reservation, *, was_public: bool) -> _ReservationChange:
+    owner_id = reservation.user_id
+    is_public = reservation.status == ReservationStatus.APPROVED
+    values = _calendar_values(reservation)
+    return _ReservationChange(
+        reservation_id=reservation.id,
+        owner_id=owner_id,
+        was_public=was_public,
+        events={
+            "public": _calendar_event(values, None, False) if is_public else None,
+            "owner": _calendar_event(values, owner_id, False),
+            "admin": _calendar_event(values, None, True),
+            "adminOwner": _calendar_event(values, owner_id, True),
+        },
+    )
+
+
+def _publish_change(change: _ReservationChange) -> None:
+    def data_for(subscriber: Subscriber) -> dict[str, object] | None:
+        is_owner = subscriber.viewer_id == change.owner_id
+        if subscriber.is_admin:
+            variant = "adminOwner" if is_owner else "admin"
+        else:
+            variant = "owner" if is_owner else "public"
+        event = change.events[variant]
+        if event is not None:
+            return {"action": "upsert", "event": event}
+        if change.was_public or (change.deleted and variant != "public"):
+            return {"action": "remove", "id": change.reservation_id}
+        return None
+
+    event_broker.publish("reservation", data_for)
+
+
+def _record_removal(session, reservation_id: int, now: datetime) -> None:
+    """Tombstone a reservation that left the public calendar, for delta-sync clients."""
+    session.add(ReservationTombstone(reservation_id=reservation_id, deleted_at=now))
+    session.query(ReservationTombstone).filter(
+        ReservationTombstone.deleted_at < now - TOMBSTONE_RETENTION
+    ).delete(synchronize_session=False)
+
+
+def _count_pending(session) -> int:
+    # Spelled as IN so the predicate matches the partial index ix_reservations_pending.
+    return session.query(Reservation).filter(Reservation.status.in_(PENDING_STATUSES)).count()
+
+
+def _pending_delta(previous: ReservationStatus | None, current: ReservationStatus | None) -> int:
+    return (current in PENDING_STATUSES) - (previous in PENDING_STATUSES)
+
+
+def _adjust_pending_count(session, delta: int) -> None:
+    """Shift the maintained counter inside the caller's transaction.
+
+    A single ``value = value + delta`` UPDATE is atomic, and it commits or rolls
+    back together with the reservation write. When the row does not exist yet
+    nothing happens; the next read upserts it from a full count.
+    """
+    if delta:
+        session.execute(
+            update(ReservationCounter)
+            .where(ReservationCounter.name == PENDING_COUNTER)
+            .values(value=ReservationCounter.value + delta)
+        )
+
+
+def _pending_count(session) -> int:
+    """Read the maintained pending counter: one primary-key lookup.
+
+    The counter is recounted when it is missing or was last reconciled more than
+    PENDING_COUNT_RECONCILE_SECONDS ago, which corrects any drift (for example
+    rows edited outside the API).
+    """
+    now = datetime.utcnow()
+    counter = session.get(ReservationCounter, PENDING_COUNTER)
+    if counter is not None and now - counter.reconciled_at < PENDING_RECONCILE_INTERVAL:
+        return counter.value
+
+    if counter is None:
+        actual = _count_pending(session)
+        # Concurrent writers may all find the row missing (the migration seeds it,
+        # but it can be deleted); an upsert lets the later ones overwrite instead
+        # of failing their whole transaction on the primary key.
+        insert = _UPSERT_INSERTS[session.get_bind().dialect.name]
+        statement = insert(ReservationCounter).values(name=PENDING_COUNTER, value=actual, reconciled_at=now)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ReservationCounter.name],
+                set_={"value": statement.excluded.value, "reconciled_at": statement.excluded.reconciled_at},
+            )
+        )
+        return actual
+
+    # Recount in the database rather than writing back a value read here, which
+    # would drop any value + delta committed in between. The row lock is taken
+    # first so the count, a statement of its own, sees every write that shifted
+    # the counter before it; writers queued behind the lock apply their delta on
+    # top. Whoever got the lock first may already have reconciled.
+    reconciled_at = session.execute(
+        select(ReservationCounter.reconciled_at)
+        .where(ReservationCounter.name == PENDING_COUNTER)
+        .with_for_update()
+    ).scalar_one()
+    if now - reconciled_at < PENDING_RECONCILE_INTERVAL:
+        return session.execute(
+            select(ReservationCounter.value).where(ReservationCounter.name == PENDING_COUNTER)
+        ).scalar_one()
+    pending = (
+        select(func.count())
+        .select_from(Reservation)
+        .where(Reservation.status.in_(PENDING_STATUSES))
+        .scalar_subquery()
+    )
+    return session.execute(
+        update(ReservationCounter)
+        .where(ReservationCounter.name == PENDING_COUNTER)
+        .values(value=pending, reconciled_at=now)
+        .returning(ReservationCounter.value)
+        .execution_options(synchronize_session="fetch")
+    ).scalar_one()
+
+
+def _publish_pending_count(count: int) -> None:
+    event_broker.publish("pending-count", lambda subscriber: {"count": count} if subscriber.is_admin else None)
+
+
 def _parse_datetime(value: str | None) -> datetime | None:
     if not value:
         return None
@@ -85,6 +343,224 @@ def _is_admin(claims: dict | None) -> bool:
     return bool(claims and claims.get("is_admin"))
 
 
+def _invalidate_read_caches() -> None:
+    """Called after every committed reservation write."""
+    calendar_cache.clear()
+    occupancy_cache.clear()
+
+
+_VERSION_QUERY = select(
+    func.count(Reservation.id),
+    func.max(Reservation.id),
+    func.max(Reservation.updated_at),
+    select(func.max(User.updated_at)).scalar_subquery(),
+    select(func.count(WhitelistEntry.id)).scalar_subquery(),
+    select(func.max(WhitelistEntry.updated_at)).scalar_subquery(),
+)
+
+
+def _reservations_version(session) -> str:
+    """Cheap token that changes whenever a reservation, user or whitelist entry changes.
+
+    Users and whitelist entries supply display names (and the whitelist decides
+    who may sign in). Inserts bump the count and max id, updates bump
+    max(updated_at), deletes drop the count. It is a single aggregate query and never loads ORM objects.
+    """
+    row = session.execute(_VERSION_QUERY).one()
+    return ":".join(str(value) for value in row)
+
+
+def _response_etag(version: str, viewer_key: tuple) -> str:
+    raw = "|".join([request.path, request.query_string.decode(), repr(viewer_key), version])
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _with_etag(response: Response, etag: str) -> Response:
+    response.set_etag(etag)
+    # Bodies differ per viewer; let browsers keep them but always revalidate.
+    response.headers["Cache-Control"] = "private, no-cache"
+    response.vary.add("Authorization")
+    return response
+
+
+def _not_modified(etag: str) -> Response:
+    return _with_etag(Response(status=HTTPStatus.NOT_MODIFIED), etag)
+
+
+_Applicant = aliased(User, name="applicant")
+_Approver = aliased(User, name="approver")
+_ApplicantWhitelist = aliased(WhitelistEntry, name="applicant_whitelist")
+_ApproverWhitelist = aliased(WhitelistEntry, name="approver_whitelist")
+
+_CALENDAR_FIELDS = (
+    "id",
+    "user_id",
+    "status",
+    "visibility",
+    "purpose",
+    "display_message",
+    "description",
+    "cancellation_reason",
+    "rejection_reason",
+    "approval_message",
+    "attendee_count",
+    "start_time",
+    "end_time",
+    "updated_at",
+)
+_USER_LABELS = {
+    prefix: tuple((name, f"{prefix}_{name}") for name in USER_FIELDS) for prefix in ("applicant", "approver")
+}
+
+
+# Read-only endpoints select plain rows instead of Reservation instances: no
+# identity map, no change tracking and only the columns the response uses.
+# Columns are labelled with the ORM attribute names, so a row's ``_mapping``
+# feeds the same serializers as a loaded instance.
+
+
+def _calendar_rows(session):
+    """Calendar columns plus the applicant's and approver's display names."""
+    return (
+        session.query(
+            *(getattr(Reservation, name) for name in _CALENDAR_FIELDS),
+            _Applicant.id.label("applicant_id"),
+            _Applicant.display_name.label("applicant_display_name"),
+            _Approver.id.label("approver_id"),
+            _Approver.display_name.label("approver_display_name"),
+            _Approver.email.label("approver_email"),
+        )
+        .outerjoin(_Applicant, Reservation.user_id == _Applicant.id)
+        .outerjoin(_Approver, Reservation.status_updated_by_user_id == _Approver.id)
+    )
+
+
+def _user_columns(user, whitelist, prefix: str) -> list:
+    return [
+        *(getattr(user, name).label(label) for name, label in _USER_LABELS[prefix]),
+        whitelist.id.label(f"{prefix}_whitelist_id"),
+        whitelist.display_name.label(f"{prefix}_whitelist_display_name"),
+    ]
+
+
+def _reservation_rows(session):
+    """Every serialized reservation column plus both users and their whitelist names."""
+    return (
+        session.query(
+            *(getattr(Reservation, name) for name in RESERVATION_FIELDS),
+            *_user_columns(_Applicant, _ApplicantWhitelist, "applicant"),
+            *_user_columns(_Approver, _ApproverWhitelist, "approver"),
+        )
+        .outerjoin(_Applicant, Reservation.user_id == _Applicant.id)
+        .outerjoin(_ApplicantWhitelist, _ApplicantWhitelist.email == _Applicant.email)
+        .outerjoin(_Approver, Reservation.status_updated_by_user_id == _Approver.id)
+        .outerjoin(_ApproverWhitelist, _ApproverWhitelist.email == _Approver.email)
+    )
+
+
+def _row_user(values: Mapping[str, Any], prefix: str, users: dict[int, dict]) -> dict[str, object] | None:
+    """Serialize a joined user once per response; later rows reuse the dict."""
+    user_id = values[f"{prefix}_id"]
+    if user_id is None:
+        return None
+    serialized = users.get(user_id)
+    if serialized is None:
+        user_values = {name: values[label] for name, label in _USER_LABELS[prefix]}
+        if not user_values["display_name"] and values[f"{prefix}_whitelist_id"] is not None:
+            user_values["display_name"] = values[f"{prefix}_whitelist_display_name"]
+        serialized = users[user_id] = serialize_user_values(user_values)
+    return serialized
+
+
+def _serialize_row(values: Mapping[str, Any], include_private: bool, users: dict[int, dict]) -> dict[str, object]:
+    if not include_private:
+        return serialize_public_values(values)
+    return serialize_private_values(
+        values,
+        _row_user(values, "applicant", users),
+        _row_user(values, "approver", users),
+    )
+
+
+def _encode_token(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_token(value: str) -> str:
+    padded = value + "=" * (-len(value) % 4)
+    return base64.urlsafe_b64decode(padded).decode("utf-8")
+
+
+def _encode_cursor(row) -> str:
+    return _encode_token(f"{row.start_time.isoformat()}|{row.id}")
+
+
+def _decode_cursor(value: str) -> tuple[datetime, int] | None:
+    try:
+        start_raw, id_raw = _decode_token(value).split("|")
+        return datetime.fromisoformat(start_raw), int(id_raw)
+    except ValueError:
+        return None
+
+
+def _decode_watermark(value: str) -> datetime | None:
+    try:
+        return datetime.fromisoformat(_decode_token(value))
+    except ValueError:
+        return None
+
+
+def _page_from_args(args) -> tuple[_Page | None, str | None]:
+    """Read the opt-in ``limit``/``cursor`` pagination parameters.
+
+    Returns ``(None, None)`` when the client did not ask for pagination.
+    """
+    raw_limit = args.get("limit")
+    raw_cursor = args.get("cursor")
+    if raw_limit is None and raw_cursor is None:
+        return None, None
+
+    try:
+        limit = int(raw_limit) if raw_limit is not None else MAX_PAGE_LIMIT
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_PAGE_LIMIT:
+        return None, f"limit は1以上{MAX_PAGE_LIMIT}以下で指定してください"
+
+    after = None
+    if raw_cursor:
+        after = _decode_cursor(raw_cursor)
+        if after is None:
+            return None, "cursor が不正です"
+    return _Page(limit, after), None
+
+
+def _paginate(query, page: _Page, *, descending: bool = False) -> tuple[list, str | None]:
+    """Keyset pagination on (start_time, id): each page is an index seek, never an OFFSET scan."""
+    if page.after is not None:
+        start_time, reservation_id = page.after
+        if descending:
+            query = query.filter(
+                or_(
+                    Reservation.start_time < start_time,
+                    and_(Reservation.start_time == start_time, Reservation.id < reservation_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    Reservation.start_time > start_time,
+                    and_(Reservation.start_time == start_time, Reservation.id > reservation_id),
+                )
+            )
+
+    rows = query.limit(page.limit + 1).all()
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        return rows, _encode_cursor(rows[-1])
+    return rows, None
+
+
 def _apply_filters(query, params: dict[str, Any]):
     start = _parse_datetime(params.get("start"))
     end = _parse_datetime(params.get("end"))
@@ -151,14 +627,21 @@ def create_reservation():
     with session_scope() as session:
         session.add(reservation)
         session.flush()
+        _adjust_pending_count(session, _pending_delta(None, reservation.status))
         response_body = serialize_reservation(reservation, include_private=True)
         reservation_id = reservation.id
-        should_notify_applicant = reservation.notify_applicant
+        change = _reservation_change(reservation, was_public=False)
+        pending_count = _pending_count(session)
+
+        # Written to the outbox in this transaction; delivered after commit.
+        snapshot = ReservationSnapshot.from_reservation(reservation)
+        send_new_reservation_notification(snapshot, session=session)
+        if reservation.notify_applicant:
+            send_reservation_received_notification(snapshot, session=session)
 
-    # Send notification email to admins
-    send_new_reservation_notification(reservation_id)
-    if should_notify_applicant:
-        send_reservation_received_notification(reservation_id)
+    _invalidate_read_caches()
+    _publish_change(change)
+    _publish_pending_count(pending_count)
 
     return jsonify({"reservation": response_body}), HTTPStatus.CREATED
 
@@ -175,21 +658,38 @@ def list_reservations():
         "end": request.args.get("end"),
         "visibility": request.args.get("visibility"),
     }
+    page, page_error = _page_from_args(request.args)
+    if page_error:
+        return jsonify({"message": page_error}), HTTPStatus.BAD_REQUEST
 
     with session_scope() as session:
-        query = session.query(Reservation).order_by(Reservation.start_time.asc())
+        etag = _response_etag(_reservations_version(session), (identity, include_all))
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag)
+
+        query = _reservation_rows(session).order_by(Reservation.start_time.asc(), Reservation.id.asc())
         if not include_all:
             query = query.filter(Reservation.status == ReservationStatus.APPROVED)
 
         query = _apply_filters(query, params)
 
-        reservations = query.all()
+        next_cursor = None
+        if page is None:
+            rows = query.all()
+        else:
+            rows, next_cursor = _paginate(query, page)
+        viewer_id = int(identity) if identity is not None else None
+        users: dict[int, dict] = {}
         serialized = []
-        for reservation in reservations:
-            include_private = include_all or (identity is not None and int(identity) == reservation.user_id)
-            serialized.append(serialize_reservation(reservation, include_private=include_private))
+        for row in rows:
+            values = row._mapping
+            include_private = include_all or viewer_id == values["user_id"]
+            serialized.append(_serialize_row(values, include_private, users))
 
-    return jsonify({"reservations": serialized}), HTTPStatus.OK
+    body: dict[str, object] = {"reservations": serialized}
+    if page is not None:
+        body["nextCursor"] = next_cursor
+    return _with_etag(jsonify(body), etag), HTTPStatus.OK
 
 
 @reservations_bp.get("/api/reservations/calendar")
@@ -205,66 +705,218 @@ def calendar_reservations():
         "visibility": request.args.get("visibility"),
     }
 
+    # Anonymous visitors share one entry per window; signed-in viewers see their
+    # own reservations (and admins see everything), so they get per-user entries.
+    viewer_key = ("user", int(identity), include_all) if identity is not None else ("public",)
+    cache_key = (params["start"], params["end"], params["visibility"], viewer_key)
+    cached = calendar_cache.get(cache_key)
+    if cached is not None:
+        etag, cached_events = cached
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag)
+        return _with_etag(jsonify({"events": cached_events}), etag), HTTPStatus.OK
+    cache_generation = calendar_cache.generation
+
     with session_scope() as session:
-        query = session.query(Reservation).order_by(Reservation.start_time.asc())
-        
+        etag = _response_etag(_reservations_version(session), viewer_key)
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag)
+
+        query = _calendar_rows(session).order_by(Reservation.start_time.asc())
+
+        viewer_id = int(identity) if identity is not None else None
+        visible = _calendar_visibility(viewer_id, include_all)
+        if visible is not None:
+            query = query.filter(visible)
+
+        query = _apply_filters(query, params)
+        events = [_calendar_event(row._mapping, viewer_id, include_all) for row in query.all()]
+
+    calendar_cache.set(cache_key, (etag, events), generation=cache_generation)
+    return _with_etag(jsonify({"events": events}), etag), HTTPStatus.OK
+
+
+@reservations_bp.get("/api/reservations/occupancy")
+@jwt_required(optional=True)
+def reservation_occupancy():
+    """Approved attendee totals and peak concurrency per JST day or week.
+
+    Every approved stay counts (the calendar shows them all as busy), but only
+    admins get the attendees of anonymous reservations, which the calendar
+    masks for everyone else; the two views are cached separately.
+    """
+    include_all = _is_admin(get_jwt())
+    viewer_class = "admin" if include_all else "public"
+    start = _parse_datetime(request.args.get("start"))
+    end = _parse_datetime(request.args.get("end"))
+    bucket = request.args.get("bucket", "day")
+
+    if not start or not end or end < start:
+        return jsonify({"message": "start と end はISO8601形式で指定してください"}), HTTPStatus.BAD_REQUEST
+    if bucket not in BUCKET_SIZES:
+        return jsonify({"message": "bucket は day または week で指定してください"}), HTTPStatus.BAD_REQUEST
+
+    bounds = bucket_bounds(local_date(start), local_date(end), bucket)
+    if len(bounds) - 1 > MAX_OCCUPANCY_BUCKETS:
+        return jsonify({"message": "期間が長すぎます"}), HTTPStatus.BAD_REQUEST
+
+    results = [occupancy_cache.get((bucket, viewer_class, bucket_start)) for bucket_start in bounds[:-1]]
+    missing = [index for index, result in enumerate(results) if result is None]
+    if missing:
+        # One ordered scan over the span of uncached buckets, aggregated in memory.
+        generation = occupancy_cache.generation
+        span = bounds[missing[0] : missing[-1] + 2]
+        attendees = Reservation.attendee_count
         if not include_all:
-            if identity:
-                query = query.filter(
-                    or_(
-                        Reservation.status == ReservationStatus.APPROVED,
-                        Reservation.user_id == int(identity)
-                    )
+            attendees = case((Reservation.visibility == ReservationVisibility.PUBLIC, attendees), else_=0)
+        with session_scope() as session:
+            rows = session.execute(
+                select(Reservation.start_time, Reservation.end_time, attendees)
+                .where(
+                    Reservation.status == ReservationStatus.APPROVED,
+                    Reservation.end_time > span[0],
+                    Reservation.start_time < span[-1],
                 )
-            else:
-                query = query.filter(Reservation.status == ReservationStatus.APPROVED)
+                .order_by(Reservation.start_time.asc())
+            )
+            computed = sweep_occupancy(rows, span)
+        for offset, result in enumerate(computed):
+            index = missing[0] + offset
+            results[index] = result
+            occupancy_cache.set((bucket, viewer_class, bounds[index]), result, generation=generation)
+
+    buckets = []
+    for bucket_start, bucket_end, result in zip(bounds, bounds[1:], results):
+        buckets.append({
+            "date": local_date(bucket_start).isoformat(),
+            "start": bucket_start.isoformat() + "Z",
+            "end": bucket_end.isoformat() + "Z",
+            **result,
+        })
+    return jsonify({"bucket": bucket, "buckets": buckets}), HTTPStatus.OK
+
+
+@reservations_bp.get("/api/reservations/changes")
+@jwt_required(optional=True)
+def reservation_changes():
+    """Delta sync: calendar events changed or removed since an opaque cursor.
 
-        query = _apply_filters(query, params)
-        reservations = query.all()
+    Without ``since`` the response only carries a starting cursor; clients load
+    the calendar as usual and then poll with it.
+    """
+    claims = get_jwt()
+    identity = get_jwt_identity()
+    include_all = _is_admin(claims)
+    viewer_id = int(identity) if identity is not None else None
+
+    raw_since = request.args.get("since")
+    since = _decode_watermark(raw_since) if raw_since else None
+    if raw_since and since is None:
+        return jsonify({"message": "since が不正です"}), HTTPStatus.BAD_REQUEST
+
+    now = datetime.utcnow()
+    watermark = now - CHANGES_WATERMARK_LAG
+    if since is None or since < now - TOMBSTONE_RETENTION:
+        return jsonify({
+            "changes": [],
+            "removed": [],
+            "cursor": _encode_token(watermark.isoformat()),
+            "reset": since is not None,
+        }), HTTPStatus.OK
+    watermark = max(watermark, since)
+
+    with session_scope() as session:
+        visible = _calendar_visibility(viewer_id, include_all)
+        query = (
+            _calendar_rows(session)
+            .filter(Reservation.updated_at > since, Reservation.updated_at <= watermark)
+            .order_by(Reservation.updated_at.asc())
+        )
+        if visible is not None:
+            query = query.filter(visible)
+        changes = [_calendar_event(row._mapping, viewer_id, include_all) for row in query.all()]
+
+        # Tombstones mark reservations that left the public calendar (deleted or
+        # no longer approved), so only rows this viewer may have seen are listed;
+        # those still visible to them (their own, or any for admins) are not removed.
+        tombstones = list(dict.fromkeys(session.scalars(
+            select(ReservationTombstone.reservation_id)
+            .where(ReservationTombstone.deleted_at > since, ReservationTombstone.deleted_at <= watermark)
+            .order_by(ReservationTombstone.deleted_at.asc())
+        )))
+        still_visible = set()
+        if tombstones:
+            still_visible_query = select(Reservation.id).where(Reservation.id.in_(tombstones))
+            if visible is not None:
+                still_visible_query = still_visible_query.where(visible)
+            still_visible = set(session.scalars(still_visible_query))
+        removed = [reservation_id for reservation_id in tombstones if reservation_id not in still_visible]
+
+    return jsonify({
+        "changes": changes,
+        "removed": removed,
+        "cursor": _encode_token(watermark.isoformat()),
+        "reset": False,
+    }), HTTPStatus.OK
+
+
+# EventSource cannot send an Authorization header, and query strings end up in
+# access logs, so streams authenticate with a short-lived ticket that is good
+# for nothing else instead of the access token.
+STREAM_TICKET_TTL = 60
+_stream_tickets = URLSafeTimedSerializer(settings.jwt_secret_key, salt="reservation-stream")
+
+
+@reservations_bp.post("/api/reservations/stream-ticket")
+@jwt_required()
+def create_stream_ticket():
+    ticket = _stream_tickets.dumps({"sub": get_jwt_identity(), "is_admin": _is_admin(get_jwt())})
+    return jsonify({"ticket": ticket, "expiresIn": STREAM_TICKET_TTL}), HTTPStatus.OK
 
-        viewer_id = int(identity) if identity is not None else None
-        events = []
-        for reservation in reservations:
-            is_owner = viewer_id is not None and viewer_id == reservation.user_id
-            
-            payload = _calendar_payload(reservation)
-            payload["isOwner"] = is_owner
-            
-            if include_all or is_owner:
-                payload["title"] = reservation.display_message or reservation.purpose
-                payload["purpose"] = reservation.purpose
-                payload["description"] = reservation.description
-                payload["attendeeCount"] = reservation.attendee_count
-                payload["userDisplayName"] = reservation.user.display_name if reservation.user else "Unknown"
-                if is_owner:
-                    payload["displayMessage"] = reservation.display_message
-                if reservation.status_updated_by:
-                    payload["statusUpdatedByDisplayName"] = (
-                        reservation.status_updated_by.display_name
-                        or reservation.status_updated_by.email
-                    )
-                if reservation.status == ReservationStatus.REJECTED:
-                    payload["rejectionReason"] = reservation.rejection_reason
-                if reservation.status in [ReservationStatus.APPROVED, ReservationStatus.CANCELLED]:
-                    payload["approvalMessage"] = reservation.approval_message
-                if reservation.status == ReservationStatus.CANCELLATION_REQUESTED:
-                    payload["cancellationReason"] = reservation.cancellation_reason
-            elif reservation.visibility == ReservationVisibility.PUBLIC:
-                user_name = reservation.user.display_name if reservation.user else "Unknown"
-                if user_name is None:
-                    user_name = "Unknown"
-                msg = reservation.display_message or "予約"
-                payload["title"] = f"{msg} ({user_name})"
-                payload["purpose"] = reservation.purpose
-                payload["description"] = reservation.description
-                payload["attendeeCount"] = reservation.attendee_count
-                payload["userDisplayName"] = user_name
-            else:
-                payload["title"] = None
-            
-            events.append(payload)
 
-    return jsonify({"events": events}), HTTPStatus.OK
+@reservations_bp.get("/api/reservations/stream")
+@jwt_required(optional=True)
+def reservation_stream():
+    """Server-sent events for calendar changes and, for admins, the pending count.
+
+    Browsers pass a ticket from ``POST /api/reservations/stream-ticket`` as
+    ``?ticket=``. Streams end after a few minutes and the browser reconnects,
+    which bounds how long one connection holds a thread.
+    """
+    raw_ticket = request.args.get("ticket")
+    if raw_ticket:
+        try:
+            claims = _stream_tickets.loads(raw_ticket, max_age=STREAM_TICKET_TTL)
+        except BadSignature:
+            return jsonify({"message": "トークンが無効です"}), HTTPStatus.UNAUTHORIZED
+        identity = claims.get("sub")
+    else:
+        claims = get_jwt()
+        identity = get_jwt_identity()
+    viewer_id = int(identity) if identity is not None else None
+    is_admin = _is_admin(claims)
+
+    subscriber = event_broker.subscribe(viewer_id, is_admin)
+    if subscriber is None:
+        return jsonify({"message": "接続数が上限に達しています"}), HTTPStatus.SERVICE_UNAVAILABLE
+
+    if is_admin:
+        with session_scope() as session:
+            subscriber.queue.put_nowait(("pending-count", {"count": _pending_count(session)}))
+
+    response = Response(
+        event_broker.stream(
+            subscriber,
+            heartbeat=settings.sse_heartbeat_seconds,
+            max_duration=settings.sse_max_stream_seconds,
+        ),
+        mimetype="text/event-stream",
+    )
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    # The generator's own cleanup never runs if the client leaves before the first chunk.
+    response.call_on_close(lambda: event_broker.unsubscribe(subscriber))
+    return response
 
 
 @reservations_bp.patch("/api/reservations/<int:reservation_id>")
@@ -281,6 +933,9 @@ def update_reservation(reservation_id: int):
         if reservation.user_id != int(user_id):
              return jsonify({"message": "権限がありません"}), HTTPStatus.FORBIDDEN
 
+        previous_status = reservation.status
+        was_public = previous_status == ReservationStatus.APPROVED
+
         if "description" in payload:
             reservation.description = payload["description"]
         
@@ -294,32 +949,58 @@ def update_reservation(reservation_id: int):
                     reservation.cancellation_reason = payload["cancellationReason"]
                 
                 # Send notification email to admins
-                send_cancellation_request_notification(reservation.id)
+                send_cancellation_request_notification(
+                    ReservationSnapshot.from_reservation(reservation), session=session
+                )
             else:
                 return jsonify({"message": "承認済みの予約のみキャンセル申請できます"}), HTTPStatus.BAD_REQUEST
             
         reservation.updated_at = datetime.utcnow()
+        if was_public and reservation.status != ReservationStatus.APPROVED:
+            _record_removal(session, reservation.id, reservation.updated_at)
         session.add(reservation)
         session.flush()
-        
-        return jsonify({"reservation": serialize_reservation(reservation, include_private=True)}), HTTPStatus.OK
+        _adjust_pending_count(session, _pending_delta(previous_status, reservation.status))
+        response_body = serialize_reservation(reservation, include_private=True)
+        change = _reservation_change(reservation, was_public=was_public)
+        pending_count = _pending_count(session)
+
+    _invalidate_read_caches()
+    _publish_change(change)
+    _publish_pending_count(pending_count)
+    return jsonify({"reservation": response_body}), HTTPStatus.OK
 
 
 @reservations_bp.get("/api/reservations/mine")
 @jwt_required()
 def list_my_reservations():
     user_id = get_jwt_identity()
+    page, page_error = _page_from_args(request.args)
+    if page_error:
+        return jsonify({"message": page_error}), HTTPStatus.BAD_REQUEST
 
     with session_scope() as session:
-        reservations = (
-            session.query(Reservation)
+        etag = _response_etag(_reservations_version(session), (user_id,))
+        if request.if_none_match.contains(etag):
+            return _not_modified(etag)
+
+        query = (
+            _reservation_rows(session)
             .filter(Reservation.user_id == int(user_id))
-            .order_by(Reservation.start_time.desc())
-            .all()
+            .order_by(Reservation.start_time.desc(), Reservation.id.desc())
         )
-        serialized = [serialize_reservation(r, include_private=True) for r in reservations]
+        next_cursor = None
+        if page is None:
+            rows = query.all()
+        else:
+            rows, next_cursor = _paginate(query, page, descending=True)
+        users: dict[int, dict] = {}
+        serialized = [_serialize_row(row._mapping, True, users) for row in rows]
 
-    return jsonify({"reservations": serialized}), HTTPStatus.OK
+    body: dict[str, object] = {"reservations": serialized}
+    if page is not None:
+        body["nextCursor"] = next_cursor
+    return _with_etag(jsonify(body), etag), HTTPStatus.OK
 
 
 @reservations_admin_bp.get("/api/admin/reservations/pending-count")
@@ -330,12 +1011,7 @@ def get_pending_count():
         return jsonify({"message": "管理者権限が必要です"}), HTTPStatus.FORBIDDEN
 
     with session_scope() as session:
-        count = session.query(Reservation).filter(
-            or_(
-                Reservation.status == ReservationStatus.PENDING,
-                Reservation.status == ReservationStatus.CANCELLATION_REQUESTED
-            )
-        ).count()
+        count = _pending_count(session)
 
     return jsonify({"count": count}), HTTPStatus.OK
 
@@ -356,14 +1032,14 @@ def update_reservation_status(reservation_id: int):
         return jsonify({"message": "status は必須です"}), HTTPStatus.BAD_REQUEST
 
     previous_status_value = None
-    should_notify_applicant = False
 
     with session_scope() as session:
         reservation = session.get(Reservation, reservation_id)
         if reservation is None:
             return jsonify({"message": "予約が見つかりません"}), HTTPStatus.NOT_FOUND
 
-        previous_status_value = reservation.status.value
+        previous_status = reservation.status
+        previous_status_value = previous_status.value
         reservation.status = new_status
         reservation.status_updated_by_user_id = int(admin_user_id) if admin_user_id else None
         if new_visibility is not None:
@@ -377,14 +1053,27 @@ def update_reservation_status(reservation_id: int):
             reservation.approval_message = payload.get("approvalMessage")
 
         reservation.updated_at = datetime.utcnow()
+        if previous_status == ReservationStatus.APPROVED and new_status != ReservationStatus.APPROVED:
+            _record_removal(session, reservation.id, reservation.updated_at)
         session.add(reservation)
         session.flush()
-        should_notify_applicant = reservation.notify_applicant and previous_status_value != new_status.value
+        _adjust_pending_count(session, _pending_delta(previous_status, new_status))
+        if reservation.notify_applicant and previous_status_value != new_status.value:
+            send_reservation_status_notification(
+                ReservationSnapshot.from_reservation(reservation),
+                previous_status=previous_status_value,
+                session=session,
+            )
 
         response_body = serialize_reservation(reservation, include_private=True)
+        change = _reservation_change(
+            reservation, was_public=previous_status_value == ReservationStatus.APPROVED.value
+        )
+        pending_count = _pending_count(session)
 
-    if should_notify_applicant:
-        send_reservation_status_notification(reservation_id, previous_status=previous_status_value)
+    _invalidate_read_caches()
+    _publish_change(change)
+    _publish_pending_count(pending_count)
 
     return jsonify({"reservation": response_body}), HTTPStatus.OK
 
@@ -401,5 +1090,21 @@ def delete_reservation(reservation_id: int):
         if reservation is None:
             return jsonify({"message": "予約が見つかりません"}), HTTPStatus.NOT_FOUND
 
+        was_public = reservation.status == ReservationStatus.APPROVED
         session.delete(reservation)
-        return "", HTTPStatus.NO_CONTENT
+        _adjust_pending_count(session, _pending_delta(reservation.status, None))
+        if was_public:
+            _record_removal(session, reservation_id, datetime.utcnow())
+        change = _ReservationChange(
+            reservation_id=reservation_id,
+            owner_id=reservation.user_id,
+            was_public=was_public,
+            events=dict.fromkeys(("public", "owner", "admin", "adminOwner")),
+            deleted=True,
+        )
+        pending_count = _pending_count(session)
+
+    _invalidate_read_caches()
+    _publish_change(change)
+    _publish_pending_count(pending_count)
+    return "", HTTPStatus.NO_CONTENT
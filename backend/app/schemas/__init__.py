@@ -1,7 +1,8 @@
 """Schema exports."""
 
-from .reservation import serialize_reservation
+from .notification import ReservationSnapshot
+from .reservation import format_datetime, reservation_values, serialize_reservation
 from .user import serialize_user
 from .whitelist import serialize_whitelist_entry
 
-__all__ = ["serialize_user", "serialize_whitelist_entry", "serialize_reservation"]
+__all__ = ["serialize_user", "serialize_whitelist_entry", "serialize_reservation", "format_datetime", "reservation_values", "ReservationSnapshot"]
@@ -0,0 +1,67 @@
+"""Immutable reservation snapshots carried by notification emails."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime
+from typing import Any
+
+from app.models.reservation import Reservation
+
+_DATETIME_FIELDS = ("start_time", "end_time")
+
+
+@dataclass(frozen=True)
+class ReservationSnapshot:
+    """Everything a notification needs, captured while the route holds the row.
+
+    Stored as JSON in the outbox, so delivery never re-reads the reservation
+    and always describes the state the request committed.
+    """
+
+    id: int
+    status: str
+    purpose: str
+    description: str | None
+    attendee_count: int
+    start_time: datetime
+    end_time: datetime
+    notify_applicant: bool
+    applicant_email: str | None
+    applicant_display_name: str | None
+    cancellation_reason: str | None = None
+    approval_message: str | None = None
+    rejection_reason: str | None = None
+
+    @classmethod
+    def from_reservation(cls, reservation: Reservation) -> "ReservationSnapshot":
+        user = reservation.user
+        return cls(
+            id=reservation.id,
+            status=reservation.status.value,
+            purpose=reservation.purpose,
+            description=reservation.description,
+            attendee_count=reservation.attendee_count,
+            start_time=reservation.start_time,
+            end_time=reservation.end_time,
+            notify_applicant=reservation.notify_applicant,
+            applicant_email=user.email if user else None,
+            applicant_display_name=user.display_name if user else None,
+            cancellation_reason=reservation.cancellation_reason,
+            approval_message=reservation.approval_message,
+            rejection_reason=reservation.rejection_reason,
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        payload = asdict(self)
+        for name in _DATETIME_FIELDS:
+            payload[name] = payload[name].isoformat()
+        return payload
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "ReservationSnapshot":
+        known = {field.name for field in fields(cls)}
+        values = {key: value for key, value in payload.items() if key in known}
+        for name in _DATETIME_FIELDS:
+            values[name] = datetime.fromisoformat(values[name])
+        return cls(**values)
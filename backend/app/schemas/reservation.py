@@ -2,41 +2,161 @@
 
 from __future__ import annotations
 
-from app.models.reservation import Reservation, ReservationVisibility
+from datetime import datetime
+from typing import Mapping
+
+from app.models.reservation import Reservation, ReservationStatus, ReservationVisibility
 from app.schemas.user import serialize_user
 
+RESERVATION_FIELDS = (
+    "id",
+    "user_id",
+    "status",
+    "visibility",
+    "purpose",
+    "display_message",
+    "description",
+    "cancellation_reason",
+    "rejection_reason",
+    "approval_message",
+    "attendee_count",
+    "allow_additional_members",
+    "notify_applicant",
+    "start_time",
+    "end_time",
+    "created_at",
+    "updated_at",
+)
+_FIELD_SET = frozenset(RESERVATION_FIELDS)
+
+# Enum.value goes through a descriptor; a dict lookup is several times cheaper.
+_STATUS_VALUES = {status: status.value for status in ReservationStatus}
+_VISIBILITY_VALUES = {visibility: visibility.value for visibility in ReservationVisibility}
+
+
+def format_datetime(dt: datetime | None) -> str | None:
+    """ISO 8601 string; naive datetimes are stored as UTC so they get a 'Z' suffix."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.isoformat() + "Z"
+    return dt.isoformat()
+
+
+def reservation_values(reservation: Reservation) -> Mapping[str, object]:
+    """Column values of a reservation, keyed by attribute name.
+
+    A loaded instance keeps its column values in ``__dict__``; reading them
+    there skips the ORM attribute descriptors, which dominate serialization
+    time. Expired or deferred instances fall back to normal attribute access.
+    """
+    state = reservation.__dict__
+    if _FIELD_SET <= state.keys():
+        return state
+    return {name: getattr(reservation, name) for name in RESERVATION_FIELDS}
+
+
+# One serializer per field plan: what a viewer may see depends only on whether
+# they are privileged and on the reservation's visibility, so each plan is a
+# flat dict literal with no per-field checks.
+
+
+def serialize_private_values(
+    values: Mapping[str, object],
+    user: dict[str, object] | None,
+    status_updated_by: dict[str, object] | None,
+) -> dict[str, object]:
+    return {
+        "id": values["id"],
+        "userId": values["user_id"],
+        "user": user,
+        "status": _STATUS_VALUES[values["status"]],
+        "visibility": _VISIBILITY_VALUES[values["visibility"]],
+        "purpose": values["purpose"],
+        "displayMessage": values["display_message"],
+        "description": values["description"],
+        "cancellationReason": values["cancellation_reason"],
+        "rejectionReason": values["rejection_reason"],
+        "approvalMessage": values["approval_message"],
+        "statusUpdatedBy": status_updated_by,
+        "attendeeCount": values["attendee_count"],
+        "allowAdditionalMembers": values["allow_additional_members"],
+        "notifyApplicant": values["notify_applicant"],
+        "startTime": format_datetime(values["start_time"]),
+        "endTime": format_datetime(values["end_time"]),
+        "createdAt": format_datetime(values["created_at"]),
+        "updatedAt": format_datetime(values["updated_at"]),
+    }
+
+
+def _serialize_public_values(values: Mapping[str, object]) -> dict[str, object]:
+    return {
+        "id": values["id"],
+        "userId": values["user_id"],
+        "user": None,
+        "status": _STATUS_VALUES[values["status"]],
+        "visibility": _VISIBILITY_VALUES[values["visibility"]],
+        "purpose": values["purpose"],
+        "displayMessage": values["display_message"],
+        "description": None,
+        "cancellationReason": None,
+        "rejectionReason": None,
+        "approvalMessage": None,
+        "statusUpdatedBy": None,
+        "attendeeCount": values["attendee_count"],
+        "allowAdditionalMembers": values["allow_additional_members"],
+        "notifyApplicant": values["notify_applicant"],
+        "startTime": format_datetime(values["start_time"]),
+        "endTime": format_datetime(values["end_time"]),
+        "createdAt": format_datetime(values["created_at"]),
+        "updatedAt": format_datetime(values["updated_at"]),
+    }
+
+
+def _serialize_anonymous_values(values: Mapping[str, object]) -> dict[str, object]:
+    return {
+        "id": values["id"],
+        "userId": values["user_id"],
+        "user": None,
+        "status": _STATUS_VALUES[values["status"]],
+        "visibility": _VISIBILITY_VALUES[values["visibility"]],
+        "purpose": None,
+        "displayMessage": None,
+        "description": None,
+        "cancellationReason": None,
+        "rejectionReason": None,
+        "approvalMessage": None,
+        "statusUpdatedBy": None,
+        "attendeeCount": values["attendee_count"],
+        "allowAdditionalMembers": values["allow_additional_members"],
+        "notifyApplicant": values["notify_applicant"],
+        "startTime": format_datetime(values["start_time"]),
+        "endTime": format_datetime(values["end_time"]),
+        "createdAt": format_datetime(values["created_at"]),
+        "updatedAt": format_datetime(values["updated_at"]),
+    }
+
+
+_PUBLIC_PLANS = {
+    ReservationVisibility.PUBLIC: _serialize_public_values,
+    ReservationVisibility.ANONYMOUS: _serialize_anonymous_values,
+}
+
+
+def serialize_public_values(values: Mapping[str, object]) -> dict[str, object]:
+    """What a non-privileged viewer sees, chosen by the reservation's visibility."""
+    return _PUBLIC_PLANS[values["visibility"]](values)
+
 
 def serialize_reservation(reservation: Reservation, *, include_private: bool = False) -> dict[str, object]:
     """Serialize a reservation into JSON ready dict."""
-    def format_dt(dt):
-        if not dt:
-            return None
-        # If the datetime is naive, assume it is UTC and append 'Z'
-        if dt.tzinfo is None:
-            return dt.isoformat() + 'Z'
-        return dt.isoformat()
-
-    data = {
-        "id": reservation.id,
-        "userId": reservation.user_id,
-        "user": serialize_user(reservation.user) if include_private and reservation.user else None,
-        "status": reservation.status.value,
-        "visibility": reservation.visibility.value,
-        "purpose": reservation.purpose if include_private or reservation.visibility == ReservationVisibility.PUBLIC else None,
-        "displayMessage": reservation.display_message if include_private or reservation.visibility == ReservationVisibility.PUBLIC else None,
-        "description": reservation.description if include_private else None,
-        "cancellationReason": reservation.cancellation_reason if include_private else None,
-        "rejectionReason": reservation.rejection_reason if include_private else None,
-        "approvalMessage": reservation.approval_message if include_private else None,
-        "statusUpdatedBy": serialize_user(reservation.status_updated_by)
-        if include_private and reservation.status_updated_by
-        else None,
-        "attendeeCount": reservation.attendee_count,
-        "allowAdditionalMembers": reservation.allow_additional_members,
-        "notifyApplicant": reservation.notify_applicant,
-        "startTime": format_dt(reservation.start_time),
-        "endTime": format_dt(reservation.end_time),
-        "createdAt": format_dt(reservation.created_at),
-        "updatedAt": format_dt(reservation.updated_at),
-    }
-    return data
+    values = reservation_values(reservation)
+    if not include_private:
+        return serialize_public_values(values)
+    user = reservation.user
+    status_updated_by = reservation.status_updated_by
+    return serialize_private_values(
+        values,
+        serialize_user(user) if user else None,
+        serialize_user(status_updated_by) if status_updated_by else None,
+    )
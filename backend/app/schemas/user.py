@@ -2,22 +2,44 @@
 
 from __future__ import annotations
 
+from typing import Mapping
+
 from app.models import User
 
+USER_FIELDS = (
+    "id",
+    "email",
+    "display_name",
+    "is_admin",
+    "receives_notification",
+    "is_active",
+    "created_at",
+    "updated_at",
+)
+
 
 def serialize_user(user: User) -> dict[str, object]:
     """Return a JSON-serializable representation of a user."""
-    display_name = user.display_name
-    if not display_name and user.whitelist_entry:
-        display_name = user.whitelist_entry.display_name
+    values = {name: getattr(user, name) for name in USER_FIELDS}
+    if not values["display_name"] and user.whitelist_entry:
+        values["display_name"] = user.whitelist_entry.display_name
+    return serialize_user_values(values)
+
+
+def serialize_user_values(values: Mapping[str, object]) -> dict[str, object]:
+    """Same as :func:`serialize_user` for user columns keyed by attribute name.
 
+    ``display_name`` must already include the whitelist fallback.
+    """
+    created_at = values["created_at"]
+    updated_at = values["updated_at"]
     return {
-        "id": user.id,
-        "email": user.email,
-        "displayName": display_name,
-        "isAdmin": user.is_admin,
-        "receivesNotification": user.receives_notification,
-        "isActive": user.is_active,
-        "createdAt": user.created_at.isoformat() if user.created_at else None,
-        "updatedAt": user.updated_at.isoformat() if user.updated_at else None,
+        "id": values["id"],
+        "email": values["email"],
+        "displayName": values["display_name"],
+        "isAdmin": values["is_admin"],
+        "receivesNotification": values["receives_notification"],
+        "isActive": values["is_active"],
+        "createdAt": created_at.isoformat() if created_at else None,
+        "updatedAt": updated_at.isoformat() if updated_at else None,
     }
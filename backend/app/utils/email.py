@@ -1,24 +1,197 @@
-import smtplib
-import threading
+import json
 import sys
+import threading
 import traceback
-import socket
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from email.message import EmailMessage
+from sqlalchemy import select
 from app.config import get_settings
 from app.models.user import User
 from app.models.reservation import Reservation, ReservationStatus
 from app.database import session_scope
+from app.schemas.notification import ReservationSnapshot
+from app.utils.cache import TTLCache
+from app.utils.email_templates import templates
+from app.utils.http_pool import HttpConnectionPool
+from app.utils.outbox import Deferred, OutboxDispatcher
+from app.utils.rate_limit import RateLimited, RateLimiter
+from app.utils.smtp import SmtpTransport
+from app.utils.worker_pool import OVERFLOW_POLICIES, WorkerPool
+
+NEW_RESERVATION = "new_reservation"
+RESERVATION_RECEIVED = "reservation_received"
+CANCELLATION_REQUEST = "cancellation_request"
+RESERVATION_STATUS = "reservation_status"
 
 def log(msg):
     print(f"[EMAIL DEBUG] {msg}", file=sys.stdout, flush=True)
 
+def _build_notification_pool() -> WorkerPool:
+    settings = get_settings()
+    overflow = settings.notification_overflow
+    if overflow not in OVERFLOW_POLICIES:
+        log(f"Unknown NOTIFICATION_OVERFLOW {overflow!r}; using caller_runs.")
+        overflow = "caller_runs"
+    return WorkerPool(
+        workers=settings.notification_workers,
+        queue_size=settings.notification_queue_size,
+        overflow=overflow,
+        name="notification",
+    )
+
+# A few long-lived workers instead of one thread (and DB session) per email;
+# each task may block for up to 30s on SMTP or the GAS webhook.
+notification_pool = _build_notification_pool()
+
+def _submit(task, *args):
+    if not notification_pool.submit(task, *args):
+        log(f"Notification queue full; dropped a task ({notification_pool.overflow}).")
+
+def _build_outbox_dispatcher() -> OutboxDispatcher:
+    settings = get_settings()
+    return OutboxDispatcher(
+        submit=_submit,
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_seconds,
+        max_attempts=settings.outbox_max_attempts,
+        retry_base=timedelta(seconds=settings.outbox_retry_base_seconds),
+        digest_window=timedelta(seconds=settings.notification_digest_seconds) if settings.notification_digest else None,
+        digest_max=settings.notification_digest_max,
+    )
+
+# Notifications are rows in notification_outbox written by the request's own
+# transaction; the dispatcher delivers them on the pool above and retries.
+outbox_dispatcher = _build_outbox_dispatcher()
+
+# Cleared by the auth routes whenever an admin flag, email or the
+# receives_notification preference changes; the TTL covers edits made
+# outside the app (scripts, other processes).
+admin_recipient_cache = TTLCache(maxsize=1, ttl=get_settings().admin_recipient_cache_ttl_seconds)
+ADMIN_RECIPIENTS = "admins"
+
+class NotificationError(Exception):
+    """Raised by an outbox handler when a send failed and should be retried."""
+
+# Keep-alive connections to the webhook host; every message used to pay a
+# fresh TCP + TLS handshake (and another for the script.googleusercontent redirect).
+_gas_http = None
+_gas_http_lock = threading.Lock()
+
+def _gas_pool(settings) -> HttpConnectionPool:
+    global _gas_http
+    with _gas_http_lock:
+        if _gas_http is None:
+            _gas_http = HttpConnectionPool(
+                connect_timeout=settings.gas_connect_timeout_seconds,
+                read_timeout=settings.gas_read_timeout_seconds,
+            )
+    return _gas_http
+
+def gas_stats() -> dict | None:
+    return _gas_http.stats() if _gas_http is not None else None
+
+# Both transports enforce per-second and daily quotas; a burst of approvals
+# waits here on the notification workers instead of failing at the provider.
+_rate_limiters: dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def _rate_limiter(transport: str, settings) -> RateLimiter | None:
+    if not settings.mail_rate_limit:
+        return None
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(transport)
+        if limiter is None:
+            if transport == "gas":
+                quota = (settings.gas_send_per_minute, settings.gas_send_burst, settings.gas_send_daily)
+            else:
+                quota = (settings.mail_send_per_minute, settings.mail_send_burst, settings.mail_send_daily)
+            limiter = _rate_limiters[transport] = RateLimiter(
+                name=transport,
+                per_minute=quota[0],
+                burst=quota[1],
+                daily=quota[2],
+                max_wait=settings.mail_rate_max_wait_seconds,
+            )
+    return limiter
+
+# Sends already paid for by _prepaid_sends, per worker thread and transport.
+_prepaid = threading.local()
+
+def _throttle(transport: str, settings, count: int = 1):
+    """Wait for ``count`` sends on ``transport``; raises RateLimited past the max wait."""
+    credit = getattr(_prepaid, transport, 0)
+    if credit:
+        paid = min(credit, count)
+        setattr(_prepaid, transport, credit - paid)
+        count -= paid
+        if not count:
+            return
+    limiter = _rate_limiter(transport, settings)
+    if limiter is None:
+        return
+    waited = limiter.acquire(count)
+    if waited:
+        log(f"Waited {waited:.1f}s for the {transport} send rate.")
+
+@contextmanager
+def _prepaid_sends(transport: str | None, settings, count: int):
+    """Take the tokens for an event's first sends before anything is sent.
+
+    If the quota cannot cover them, RateLimited is raised here and the event is
+    deferred before any recipient receives it. At most one bucket's capacity is
+    prepaid, since a larger reservation could never be granted; the remaining
+    sends acquire as they go, and a RateLimited among them is a failure that
+    uses an attempt, as recipients have already been sent the message.
+    """
+    limiter = _rate_limiter(transport, settings) if transport is not None else None
+    if limiter is None:
+        yield
+        return
+    first = min(count, limiter.capacity)
+    _throttle(transport, settings, first)
+    setattr(_prepaid, transport, first)
+    try:
+        yield
+    except RateLimited as exc:
+        raise NotificationError(f"{exc} partway through the event") from exc
+    finally:
+        setattr(_prepaid, transport, 0)
+
+def _primary_transport(settings) -> str | None:
+    if settings.gas_webhook_url and settings.gas_webhook_secret:
+        return "gas"
+    if settings.mail_server and settings.mail_username and settings.mail_password:
+        return "smtp"
+    return None
+
+def rate_limit_stats() -> dict:
+    with _rate_limiters_lock:
+        limiters = dict(_rate_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
+
+def _post_gas(data: dict, webhook_url: str) -> dict | None:
+    """POST ``data`` to the webhook; returns the decoded reply or None on failure."""
+    _throttle("gas", get_settings(), len(data.get("messages", ())) or 1)
+    try:
+        response = _gas_pool(get_settings()).request(
+            "POST",
+            webhook_url,
+            body=json.dumps(data).encode('utf-8'),
+            headers={"Content-Type": "application/json"},
+        )
+        resp_body = response.body.decode('utf-8')
+        if response.status >= 400:
+            log(f"GAS webhook failed: {response.status} {resp_body}")
+            return None
+        log(f"GAS response: {response.status} {resp_body}")
+        return json.loads(resp_body)
+    except Exception as e:
+        log(f"GAS webhook failed: {e}")
+        return None
+
 def _send_email_gas(to_email: str, subject: str, body: str, webhook_url: str, webhook_secret: str):
     """Send email via Google Apps Script webhook (HTTP POST)."""
-    import json
-    import urllib.request
-    import urllib.error
-
     log("Attempting to send via Google Apps Script webhook...")
     data = {
         "to": to_email,
@@ -26,42 +199,89 @@ def _send_email_gas(to_email: str, subject: str, body: str, webhook_url: str, we
         "body": body,
         "secret": webhook_secret,
     }
+    result = _post_gas(data, webhook_url)
+    if result is None:
+        return False
+    if result.get("status") == "ok":
+        log(f"Email sent successfully to {to_email} via GAS")
+        return True
+    log(f"GAS returned error: {result}")
+    return False
 
-    try:
-        req = urllib.request.Request(
-            webhook_url,
-            data=json.dumps(data).encode('utf-8'),
-            headers={"Content-Type": "application/json"},
-            method='POST',
+def _send_email_gas_batch(recipients: list[str], subject: str, body: str, settings) -> list[str]:
+    """Send one message to many recipients in GAS_BATCH_SIZE-sized POSTs.
+
+    The script receives ``{"secret", "messages": [{"to", "subject", "body"}, ...]}``
+    and answers ``{"status": "ok", "results": [{"status": "ok"}, ...]}`` in the
+    same order (``results`` may be omitted when everything was sent). Returns
+    the recipients that were not delivered.
+    """
+    undelivered = []
+    for offset in range(0, len(recipients), settings.gas_batch_size):
+        chunk = recipients[offset:offset + settings.gas_batch_size]
+        log(f"Sending {len(chunk)} message(s) in one GAS batch...")
+        result = _post_gas(
+            {
+                "secret": settings.gas_webhook_secret,
+                "messages": [{"to": to, "subject": subject, "body": body} for to in chunk],
+            },
+            settings.gas_webhook_url,
         )
-        with urllib.request.urlopen(req, timeout=30) as response:
-            resp_body = response.read().decode('utf-8')
-            log(f"GAS response: {response.status} {resp_body}")
-            result = json.loads(resp_body)
-            if result.get("status") == "ok":
-                log(f"Email sent successfully to {to_email} via GAS")
-                return True
-            else:
+        if result is None or result.get("status") != "ok":
+            if result is not None:
                 log(f"GAS returned error: {result}")
-    except urllib.error.HTTPError as e:
-        log(f"GAS webhook failed: {e.code} {e.read().decode('utf-8')}")
-    except Exception as e:
-        log(f"GAS webhook failed: {e}")
-    return False
-
-def _send_email_sync(to_email: str, subject: str, body: str):
+            undelivered.extend(chunk)
+            continue
+        results = result.get("results") or [{"status": "ok"}] * len(chunk)
+        for to, item in zip(chunk, results):
+            if item.get("status") == "ok":
+                log(f"Email sent successfully to {to} via GAS batch")
+            else:
+                undelivered.append(to)
+        undelivered.extend(chunk[len(results):])
+    return undelivered
+
+# One transport per process; each worker thread keeps its own SMTP session open
+# so an event's recipients share one connect/STARTTLS/login.
+_smtp = None
+_smtp_lock = threading.Lock()
+
+def _smtp_transport(settings) -> SmtpTransport:
+    global _smtp
+    with _smtp_lock:
+        if _smtp is None:
+            _smtp = SmtpTransport(
+                host=settings.mail_server,
+                port=settings.mail_port,
+                username=settings.mail_username,
+                # Remove spaces from password just in case (Gmail app passwords often have spaces)
+                password=settings.mail_password.replace(" ", ""),
+                use_tls=settings.mail_use_tls,
+                idle_timeout=settings.mail_smtp_idle_seconds,
+                log=log,
+            )
+    return _smtp
+
+def smtp_stats() -> dict | None:
+    return _smtp.stats() if _smtp is not None else None
+
+def _send_email_sync(to_email: str, subject: str, body: str) -> bool:
+    """Send one email; returns False only when a configured transport failed."""
     settings = get_settings()
 
     # Try Google Apps Script webhook first (works on Render free plan)
     if settings.gas_webhook_url and settings.gas_webhook_secret:
         if _send_email_gas(to_email, subject, body, settings.gas_webhook_url, settings.gas_webhook_secret):
-            return
+            return True
         log("GAS webhook failed, falling back to SMTP...")
+        return _send_email_smtp(to_email, subject, body, settings, gas_failed=True)
+    return _send_email_smtp(to_email, subject, body, settings)
 
+def _send_email_smtp(to_email: str, subject: str, body: str, settings, gas_failed: bool = False) -> bool:
     # Fallback: direct SMTP (works locally, blocked on Render free plan)
     if not settings.mail_server or not settings.mail_username or not settings.mail_password:
         log("Email settings not configured. Skipping email.")
-        return
+        return not gas_failed
 
     msg = EmailMessage()
     msg.set_content(body)
@@ -69,309 +289,221 @@ def _send_email_sync(to_email: str, subject: str, body: str):
     msg['From'] = settings.mail_default_sender or settings.mail_username
     msg['To'] = to_email
 
-    # Remove spaces from password just in case (Gmail app passwords often have spaces)
-    password = settings.mail_password.replace(" ", "")
-
+    _throttle("smtp", settings)
     try:
-        # Force IPv4 resolution to avoid [Errno 101] Network is unreachable on IPv6-disabled environments
-        log(f"Resolving {settings.mail_server} (IPv4)...")
-        addr_info = socket.getaddrinfo(settings.mail_server, settings.mail_port, socket.AF_INET, socket.SOCK_STREAM)
-        server_ip = addr_info[0][4][0]
-        log(f"Resolved to {server_ip}")
-
-        log(f"Connecting to {server_ip}:{settings.mail_port} with timeout=30s...")
-        
-        if settings.mail_port == 465:
-            # Use implicit SSL for port 465
-            import ssl
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            
-            with smtplib.SMTP_SSL(server_ip, settings.mail_port, context=context, timeout=30) as server:
-                log("Connected. Logging in...")
-                server.login(settings.mail_username, password)
-                
-                log(f"Sending message to {to_email}...")
-                server.send_message(msg)
-        else:
-            # Use STARTTLS for port 587 (or others)
-            with smtplib.SMTP(server_ip, settings.mail_port, timeout=30) as server:
-                # server.set_debuglevel(1)
-                if settings.mail_use_tls:
-                    log("Connected. Starting TLS...")
-                    import ssl
-                    context = ssl.create_default_context()
-                    context.check_hostname = False
-                    server.starttls(context=context)
-                
-                log("Logging in...")
-                server.login(settings.mail_username, password)
-                
-                log(f"Sending message to {to_email}...")
-                server.send_message(msg)
-                
+        _smtp_transport(settings).send(msg)
         log(f"Email sent successfully to {to_email}")
+        return True
     except Exception as e:
         log(f"Failed to send email to {to_email}: {e}")
         traceback.print_exc()
+        return False
 
 def send_email_async(to_email: str, subject: str, body: str):
-    thread = threading.Thread(target=_send_email_sync, args=(to_email, subject, body))
-    thread.start()
-
-def send_new_reservation_notification(reservation_id: int):
-    def _notify():
-        log(f"Starting notification thread for reservation {reservation_id}")
-        try:
-            with session_scope() as session:
-                reservation = session.get(Reservation, reservation_id)
-                if not reservation:
-                    log(f"Reservation {reservation_id} not found in thread.")
-                    return
-                
-                # Eager load user to avoid detachment issues if we were passing object
-                # But here we are in a session, so it's fine.
-                user_name = reservation.user.display_name if reservation.user else "Unknown"
-                user_email = reservation.user.email if reservation.user else "Unknown"
-                purpose = reservation.purpose
-                start = _format_dt_jst(reservation.start_time)
-                end = _format_dt_jst(reservation.end_time)
-                count = reservation.attendee_count
-                desc = reservation.description or 'なし'
-
-                admins = session.query(User).filter(
-                    User.is_admin == True,
-                    User.receives_notification == True
-                ).all()
-                
-                admin_emails = [admin.email for admin in admins]
-                log(f"Found {len(admin_emails)} admins to notify: {admin_emails}")
-            
-            if not admin_emails:
-                log("No admins to notify.")
-                return
-
-            subject = f"【KC Reserve】新規予約申請: {purpose}"
-            body = f"""
-新規の予約申請がありました。
-
-申請者: {user_name} ({user_email})
-目的: {purpose}
-日時: {start} - {end}
-人数: {count}人
-詳細: {desc}
-
-管理画面から確認・承認してください。
-https://kcreserve.onrender.com/
-"""
-
-            for email in admin_emails:
-                _send_email_sync(email, subject, body)
-        except Exception as e:
-            log(f"Error in notification thread: {e}")
-            traceback.print_exc()
-
-    thread = threading.Thread(target=_notify)
-    thread.start()
-
-def send_reservation_received_notification(reservation_id: int):
-    def _notify():
-        log(f"Starting applicant received notification thread for reservation {reservation_id}")
-        try:
-            with session_scope() as session:
-                reservation = session.get(Reservation, reservation_id)
-                if not reservation:
-                    log(f"Reservation {reservation_id} not found in thread.")
-                    return
-                if not reservation.notify_applicant:
-                    log(f"Applicant notification disabled for reservation {reservation_id}.")
-                    return
-                if not reservation.user or not reservation.user.email:
-                    log(f"Reservation {reservation_id} has no applicant email.")
-                    return
-
-                applicant_email = reservation.user.email
-                user_name = reservation.user.display_name or reservation.user.email
-                purpose = reservation.purpose
-                start = _format_dt_jst(reservation.start_time)
-                end = _format_dt_jst(reservation.end_time)
-                count = reservation.attendee_count
-                desc = reservation.description or "なし"
-
-            subject = f"【KC Reserve】予約申請を受け付けました: {purpose}"
-            body = f"""
-{user_name} 様
-
-以下の予約申請を受け付けました。
-管理者が内容を確認し、承認または却下を行います。
-
-目的: {purpose}
-日時: {start} - {end}
-人数: {count}人
-詳細: {desc}
-
-https://kcreserve.onrender.com/
-"""
-
-            _send_email_sync(applicant_email, subject, body)
-        except Exception as e:
-            log(f"Error in applicant received notification thread: {e}")
-            traceback.print_exc()
-
-    thread = threading.Thread(target=_notify)
-    thread.start()
-
-def send_cancellation_request_notification(reservation_id: int):
-    def _notify():
-        log(f"Starting cancellation notification thread for reservation {reservation_id}")
-        try:
-            with session_scope() as session:
-                reservation = session.get(Reservation, reservation_id)
-                if not reservation:
-                    log(f"Reservation {reservation_id} not found in thread.")
-                    return
-                
-                user_name = reservation.user.display_name if reservation.user else "Unknown"
-                user_email = reservation.user.email if reservation.user else "Unknown"
-                purpose = reservation.purpose
-                start = _format_dt_jst(reservation.start_time)
-                end = _format_dt_jst(reservation.end_time)
-                reason = reservation.cancellation_reason or 'なし'
-
-                admins = session.query(User).filter(
-                    User.is_admin == True,
-                    User.receives_notification == True
-                ).all()
-                
-                admin_emails = [admin.email for admin in admins]
-                log(f"Found {len(admin_emails)} admins to notify: {admin_emails}")
-            
-            if not admin_emails:
-                log("No admins to notify.")
-                return
-
-            subject = f"【KC Reserve】キャンセル申請: {purpose}"
-            body = f"""
-予約のキャンセル申請がありました。
-
-申請者: {user_name} ({user_email})
-目的: {purpose}
-日時: {start} - {end}
-キャンセル理由: {reason}
-
-管理画面から確認・承認してください。
-https://kcreserve.onrender.com/
-"""
-
-            for email in admin_emails:
-                _send_email_sync(email, subject, body)
-        except Exception as e:
-            log(f"Error in cancellation notification thread: {e}")
-            traceback.print_exc()
-
-    thread = threading.Thread(target=_notify)
-    thread.start()
-
-def send_reservation_status_notification(reservation_id: int, previous_status: str | None = None):
-    def _notify():
-        log(f"Starting applicant status notification thread for reservation {reservation_id}")
-        try:
-            with session_scope() as session:
-                reservation = session.get(Reservation, reservation_id)
-                if not reservation:
-                    log(f"Reservation {reservation_id} not found in thread.")
-                    return
-                if not reservation.notify_applicant:
-                    log(f"Applicant notification disabled for reservation {reservation_id}.")
-                    return
-                if not reservation.user or not reservation.user.email:
-                    log(f"Reservation {reservation_id} has no applicant email.")
-                    return
-
-                applicant_email = reservation.user.email
-                user_name = reservation.user.display_name or reservation.user.email
-                purpose = reservation.purpose
-                start = _format_dt_jst(reservation.start_time)
-                end = _format_dt_jst(reservation.end_time)
-                status = reservation.status
-                approval_message = reservation.approval_message or "なし"
-                rejection_reason = reservation.rejection_reason or "なし"
-
-            status_messages = {
-                ReservationStatus.APPROVED: (
-                    "予約が承認されました",
-                    f"""
-{user_name} 様
-
-以下の予約が承認されました。
-
-目的: {purpose}
-日時: {start} - {end}
-管理者からのメッセージ: {approval_message}
-
-https://kcreserve.onrender.com/
-""",
-                ),
-                ReservationStatus.REJECTED: (
-                    "予約が却下されました",
-                    f"""
-{user_name} 様
-
-以下の予約が却下されました。
-
-目的: {purpose}
-日時: {start} - {end}
-却下理由: {rejection_reason}
-
-https://kcreserve.onrender.com/
-""",
-                ),
-                ReservationStatus.CANCELLED: (
-                    "キャンセル申請が承認されました",
-                    f"""
-{user_name} 様
-
-以下の予約のキャンセル申請が承認されました。
-
-目的: {purpose}
-日時: {start} - {end}
-管理者からのメッセージ: {approval_message}
-
-https://kcreserve.onrender.com/
-""",
-                ),
-            }
-
-            if (
-                status == ReservationStatus.APPROVED
-                and previous_status == ReservationStatus.CANCELLATION_REQUESTED.value
-            ):
-                title = "キャンセル申請が却下されました"
-                body = f"""
-{user_name} 様
-
-以下の予約のキャンセル申請が却下され、予約は承認済みに戻りました。
-
-目的: {purpose}
-日時: {start} - {end}
-管理者からのメッセージ: {approval_message}
-
-https://kcreserve.onrender.com/
-"""
-            elif status in status_messages:
-                title, body = status_messages[status]
-            else:
-                log(f"No applicant email template for status {status.value}.")
-                return
+    _submit(_send_email_sync, to_email, subject, body)
+
+def _send_all(recipients, subject: str, body: str):
+    settings = get_settings()
+    recipients = list(recipients)
+    try:
+        with _prepaid_sends(_primary_transport(settings), settings, len(recipients)):
+            _deliver_all(recipients, subject, body, settings)
+    except RateLimited as exc:
+        log(str(exc))
+        raise Deferred(str(exc), timedelta(seconds=exc.retry_after)) from exc
+
+def _deliver_all(recipients: list[str], subject: str, body: str, settings):
+    if (
+        settings.gas_batch_size > 1
+        and len(recipients) > 1
+        and settings.gas_webhook_url
+        and settings.gas_webhook_secret
+    ):
+        undelivered = _send_email_gas_batch(recipients, subject, body, settings)
+        if undelivered:
+            log("GAS batch incomplete, falling back to SMTP...")
+        failed = [
+            email for email in undelivered
+            if not _send_email_smtp(email, subject, body, settings, gas_failed=True)
+        ]
+    else:
+        failed = [email for email in recipients if not _send_email_sync(email, subject, body)]
+    if failed:
+        # The whole event is retried, so recipients that did get it may see it twice.
+        raise NotificationError(f"Failed to send to {', '.join(failed)}")
+
+def _admin_recipient_emails() -> list[str]:
+    """Addresses of admins who receive notifications, cached between events."""
+    generation = admin_recipient_cache.generation
+    cached = admin_recipient_cache.get(ADMIN_RECIPIENTS)
+    if cached is not None:
+        return list(cached)
+    with session_scope() as session:
+        emails = tuple(
+            session.scalars(
+                select(User.email)
+                .where(User.is_admin == True, User.receives_notification == True)
+                .order_by(User.id)
+            )
+        )
+    admin_recipient_cache.set(ADMIN_RECIPIENTS, emails, generation=generation)
+    return list(emails)
+
+def _enqueue(kind: str, session, **payload):
+    """Write an outbox row in ``session``, or in a transaction of its own if None."""
+    if session is not None:
+        outbox_dispatcher.enqueue(session, kind, **payload)
+        return
+    with session_scope() as own_session:
+        outbox_dispatcher.enqueue(own_session, kind, **payload)
+
+def send_new_reservation_notification(snapshot: ReservationSnapshot, *, session=None):
+    _enqueue(NEW_RESERVATION, session, reservation=snapshot.to_payload())
+
+def send_reservation_received_notification(snapshot: ReservationSnapshot, *, session=None):
+    _enqueue(RESERVATION_RECEIVED, session, reservation=snapshot.to_payload())
+
+def send_cancellation_request_notification(snapshot: ReservationSnapshot, *, session=None):
+    _enqueue(CANCELLATION_REQUEST, session, reservation=snapshot.to_payload())
+
+def send_reservation_status_notification(
+    snapshot: ReservationSnapshot, previous_status: str | None = None, *, session=None
+):
+    _enqueue(RESERVATION_STATUS, session, reservation=snapshot.to_payload(), previous_status=previous_status)
+
+def _snapshot(reservation: dict | None, reservation_id: int | None) -> ReservationSnapshot | None:
+    """Rebuild the enqueued snapshot; outbox rows written before snapshots only carry an id."""
+    if reservation is not None:
+        return ReservationSnapshot.from_payload(reservation)
+    with session_scope() as session:
+        row = session.get(Reservation, reservation_id)
+        if not row:
+            log(f"Reservation {reservation_id} not found.")
+            return None
+        return ReservationSnapshot.from_reservation(row)
+
+def _template_values(snapshot: ReservationSnapshot, *, for_admin: bool) -> dict[str, object]:
+    """Placeholder values for every template, computed once per message."""
+    if for_admin:
+        user_name = snapshot.applicant_display_name if snapshot.applicant_email else "Unknown"
+    else:
+        user_name = snapshot.applicant_display_name or snapshot.applicant_email
+    return {
+        "user_name": user_name,
+        "user_email": snapshot.applicant_email or "Unknown",
+        "purpose": snapshot.purpose,
+        "start": _format_dt_jst(snapshot.start_time),
+        "end": _format_dt_jst(snapshot.end_time),
+        "count": snapshot.attendee_count,
+        "desc": snapshot.description or "なし",
+        "reason": snapshot.cancellation_reason or "なし",
+        "approval_message": snapshot.approval_message or "なし",
+        "rejection_reason": snapshot.rejection_reason or "なし",
+    }
+
+def _status_template(status: ReservationStatus, previous_status: str | None) -> str | None:
+    if status == ReservationStatus.APPROVED and previous_status == ReservationStatus.CANCELLATION_REQUESTED.value:
+        return "cancellation_rejected"
+    return _STATUS_TEMPLATES.get(status)
+
+_STATUS_TEMPLATES = {
+    ReservationStatus.APPROVED: "status_approved",
+    ReservationStatus.REJECTED: "status_rejected",
+    ReservationStatus.CANCELLED: "status_cancelled",
+}
+
+def _deliver_to_admins(kind: str, reservation: dict | None, reservation_id: int | None):
+    snapshot = _snapshot(reservation, reservation_id)
+    if snapshot is None:
+        return
+    log(f"Delivering {kind} notification for reservation {snapshot.id}")
+
+    admin_emails = _admin_recipient_emails()
+    log(f"Found {len(admin_emails)} admins to notify: {admin_emails}")
+    if not admin_emails:
+        log("No admins to notify.")
+        return
+
+    subject, body = templates.render(kind, _template_values(snapshot, for_admin=True))
+    _send_all(admin_emails, subject, body)
+
+def _deliver_to_applicant(kind: str, reservation: dict | None, reservation_id: int | None, previous_status=None):
+    snapshot = _snapshot(reservation, reservation_id)
+    if snapshot is None:
+        return
+    log(f"Delivering {kind} notification for reservation {snapshot.id}")
+    if not snapshot.notify_applicant:
+        log(f"Applicant notification disabled for reservation {snapshot.id}.")
+        return
+    if not snapshot.applicant_email:
+        log(f"Reservation {snapshot.id} has no applicant email.")
+        return
+
+    if kind == RESERVATION_STATUS:
+        name = _status_template(ReservationStatus(snapshot.status), previous_status)
+        if name is None:
+            log(f"No applicant email template for status {snapshot.status}.")
+            return
+    else:
+        name = kind
+
+    subject, body = templates.render(name, _template_values(snapshot, for_admin=False))
+    _send_all([snapshot.applicant_email], subject, body)
+
+@outbox_dispatcher.handler(NEW_RESERVATION)
+def _deliver_new_reservation(reservation: dict | None = None, reservation_id: int | None = None):
+    _deliver_to_admins(NEW_RESERVATION, reservation, reservation_id)
+
+@outbox_dispatcher.handler(CANCELLATION_REQUEST)
+def _deliver_cancellation_request(reservation: dict | None = None, reservation_id: int | None = None):
+    _deliver_to_admins(CANCELLATION_REQUEST, reservation, reservation_id)
+
+@outbox_dispatcher.handler(RESERVATION_RECEIVED)
+def _deliver_reservation_received(reservation: dict | None = None, reservation_id: int | None = None):
+    _deliver_to_applicant(RESERVATION_RECEIVED, reservation, reservation_id)
+
+@outbox_dispatcher.handler(RESERVATION_STATUS)
+def _deliver_reservation_status(
+    reservation: dict | None = None, reservation_id: int | None = None, previous_status: str | None = None
+):
+    _deliver_to_applicant(RESERVATION_STATUS, reservation, reservation_id, previous_status)
+
+@outbox_dispatcher.digest_handler(NEW_RESERVATION, CANCELLATION_REQUEST)
+def _deliver_admin_digest(messages: list[tuple[str, dict]]):
+    """One summary email per admin for a burst of admin-facing events."""
+    events = []
+    for kind, payload in messages:
+        snapshot = _snapshot(payload.get("reservation"), payload.get("reservation_id"))
+        if snapshot is not None:
+            events.append((kind, snapshot))
+    log(f"Delivering admin digest with {len(events)} event(s)")
+    if not events:
+        return
+
+    admin_emails = _admin_recipient_emails()
+    log(f"Found {len(admin_emails)} admins to notify: {admin_emails}")
+    if not admin_emails:
+        log("No admins to notify.")
+        return
 
-            subject = f"【KC Reserve】{title}: {purpose}"
-            _send_email_sync(applicant_email, subject, body)
-        except Exception as e:
-            log(f"Error in applicant status notification thread: {e}")
-            traceback.print_exc()
+    sections = []
+    counts = dict.fromkeys(_DIGEST_SECTIONS, 0)
+    for kind, snapshot in events:
+        sections.append(templates[_DIGEST_SECTIONS[kind]].body.render(_template_values(snapshot, for_admin=True)))
+        counts[kind] += 1
+    summary = "・".join(
+        templates[_DIGEST_SECTIONS[kind]].subject.render({"n": count}) for kind, count in counts.items() if count
+    )
+    subject, body = templates.render(
+        "digest", {"summary": summary, "total": len(events), "sections": "\n\n".join(sections)}
+    )
+    _send_all(admin_emails, subject, body)
+
+_DIGEST_SECTIONS = {
+    NEW_RESERVATION: "digest_new_reservation",
+    CANCELLATION_REQUEST: "digest_cancellation_request",
+}
 
-    thread = threading.Thread(target=_notify)
-    thread.start()
 
 JST = timezone(timedelta(hours=9))
 
@@ -0,0 +1,237 @@
+"""Notification email templates, parsed once at import.
+
+Templates use ``str.format`` placeholders (``{purpose}``; ``{{`` for a literal
+brace). Registering a template rewrites it with positional fields and an
+``itemgetter`` for its names, so rendering is one C-level format call over
+values the caller computed once per message, and only the template that was
+selected is ever rendered.
+"""
+
+from __future__ import annotations
+
+import operator
+import string
+from dataclasses import dataclass
+from typing import Mapping
+
+SITE_URL = "https://kcreserve.onrender.com/"
+
+
+class _Compiled:
+    """A template rewritten as positional ``str.format`` plus a value getter."""
+
+    __slots__ = ("_format", "_values", "fields")
+
+    def __init__(self, source: str) -> None:
+        pieces: list[str] = []
+        names: list[str] = []
+        for literal, field, spec, conversion in string.Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"Format specs are not supported: {{{field}!{conversion}:{spec}}}")
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if not field.isidentifier():
+                raise ValueError(f"Placeholder must be a plain name: {{{field}}}")
+            pieces.append(f"{{{len(names)}}}")
+            names.append(field)
+        self._format = "".join(pieces).format
+        self.fields = frozenset(names)
+        if not names:
+            self._values = lambda values: ()
+        elif len(names) == 1:
+            getter = operator.itemgetter(names[0])
+            self._values = lambda values: (getter(values),)
+        else:
+            self._values = operator.itemgetter(*names)
+
+    def render(self, values: Mapping[str, object]) -> str:
+        return self._format(*self._values(values))
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    name: str
+    subject: _Compiled
+    body: _Compiled
+
+    @property
+    def fields(self) -> frozenset[str]:
+        return self.subject.fields | self.body.fields
+
+    def render(self, values: Mapping[str, object]) -> tuple[str, str]:
+        """Return ``(subject, body)``; raises KeyError for a missing value."""
+        return self.subject.render(values), self.body.render(values)
+
+
+class TemplateRegistry:
+    def __init__(self) -> None:
+        self._templates: dict[str, EmailTemplate] = {}
+
+    def register(self, name: str, *, subject: str, body: str) -> EmailTemplate:
+        template = EmailTemplate(name, _Compiled(subject), _Compiled(body))
+        self._templates[name] = template
+        return template
+
+    def __getitem__(self, name: str) -> EmailTemplate:
+        return self._templates[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._templates
+
+    def names(self) -> list[str]:
+        return sorted(self._templates)
+
+    def render(self, name: str, values: Mapping[str, object]) -> tuple[str, str]:
+        return self._templates[name].render(values)
+
+
+templates = TemplateRegistry()
+
+NEW_RESERVATION = templates.register(
+    "new_reservation",
+    subject="【KC Reserve】新規予約申請: {purpose}",
+    body=f"""
+新規の予約申請がありました。
+
+申請者: {{user_name}} ({{user_email}})
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+人数: {{count}}人
+詳細: {{desc}}
+
+管理画面から確認・承認してください。
+{SITE_URL}
+""",
+)
+
+RESERVATION_RECEIVED = templates.register(
+    "reservation_received",
+    subject="【KC Reserve】予約申請を受け付けました: {purpose}",
+    body=f"""
+{{user_name}} 様
+
+以下の予約申請を受け付けました。
+管理者が内容を確認し、承認または却下を行います。
+
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+人数: {{count}}人
+詳細: {{desc}}
+
+{SITE_URL}
+""",
+)
+
+CANCELLATION_REQUEST = templates.register(
+    "cancellation_request",
+    subject="【KC Reserve】キャンセル申請: {purpose}",
+    body=f"""
+予約のキャンセル申請がありました。
+
+申請者: {{user_name}} ({{user_email}})
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+キャンセル理由: {{reason}}
+
+管理画面から確認・承認してください。
+{SITE_URL}
+""",
+)
+
+STATUS_APPROVED = templates.register(
+    "status_approved",
+    subject="【KC Reserve】予約が承認されました: {purpose}",
+    body=f"""
+{{user_name}} 様
+
+以下の予約が承認されました。
+
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+管理者からのメッセージ: {{approval_message}}
+
+{SITE_URL}
+""",
+)
+
+STATUS_REJECTED = templates.register(
+    "status_rejected",
+    subject="【KC Reserve】予約が却下されました: {purpose}",
+    body=f"""
+{{user_name}} 様
+
+以下の予約が却下されました。
+
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+却下理由: {{rejection_reason}}
+
+{SITE_URL}
+""",
+)
+
+STATUS_CANCELLED = templates.register(
+    "status_cancelled",
+    subject="【KC Reserve】キャンセル申請が承認されました: {purpose}",
+    body=f"""
+{{user_name}} 様
+
+以下の予約のキャンセル申請が承認されました。
+
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+管理者からのメッセージ: {{approval_message}}
+
+{SITE_URL}
+""",
+)
+
+CANCELLATION_REJECTED = templates.register(
+    "cancellation_rejected",
+    subject="【KC Reserve】キャンセル申請が却下されました: {purpose}",
+    body=f"""
+{{user_name}} 様
+
+以下の予約のキャンセル申請が却下され、予約は承認済みに戻りました。
+
+目的: {{purpose}}
+日時: {{start}} - {{end}}
+管理者からのメッセージ: {{approval_message}}
+
+{SITE_URL}
+""",
+)
+
+# Digest: one section per event, joined between the header and footer.
+DIGEST = templates.register(
+    "digest",
+    subject="【KC Reserve】{summary}",
+    body=f"""
+{{total}}件の申請がありました。
+
+{{sections}}
+
+管理画面から確認・承認してください。
+{SITE_URL}
+""",
+)
+
+DIGEST_NEW_RESERVATION = templates.register(
+    "digest_new_reservation",
+    subject="新規予約申請 {n}件",
+    body="""■ 新規予約申請: {purpose}
+申請者: {user_name} ({user_email})
+日時: {start} - {end}
+人数: {count}人
+詳細: {desc}""",
+)
+
+DIGEST_CANCELLATION_REQUEST = templates.register(
+    "digest_cancellation_request",
+    subject="キャンセル申請 {n}件",
+    body="""■ キャンセル申請: {purpose}
+申請者: {user_name} ({user_email})
+日時: {start} - {end}
+キャンセル理由: {reason}""",
+)
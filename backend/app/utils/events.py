@@ -0,0 +1,118 @@
+"""In-process fan-out of server-sent events to connected clients.
+
+Each subscriber owns a bounded queue. Publishing never blocks: when a slow
+client's queue is full its backlog is discarded and replaced by a single
+``resync`` event, telling the client to catch up through the delta-sync API.
+
+Subscribers only see events published in the same process, so the API runs
+as a single gthread worker; ``gunicorn.conf.py`` pins that and refuses to
+start with more workers, or with too few threads to leave room for requests
+once ``max_subscribers`` streams are open.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+
+@dataclass(eq=False)
+class Subscriber:
+    """One connected stream and the permissions of the viewer behind it."""
+
+    viewer_id: int | None
+    is_admin: bool
+    queue: queue.Queue = field(repr=False)
+
+
+class EventBroker:
+    """Tracks subscribers and delivers events filtered per viewer."""
+
+    def __init__(self, *, max_subscribers: int, queue_size: int) -> None:
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscribers: set[Subscriber] = set()
+        self._lock = threading.Lock()
+        self.published = 0
+        self.overflows = 0
+        self.rejected = 0
+
+    def subscribe(self, viewer_id: int | None, is_admin: bool) -> Subscriber | None:
+        """Register a stream; returns None when the broker is at capacity."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            subscriber = Subscriber(viewer_id, is_admin, queue.Queue(maxsize=self.queue_size))
+            self._subscribers.add(subscriber)
+            return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event: str, data_for: Callable[[Subscriber], dict | None]) -> None:
+        """Send ``event`` to every subscriber for whom ``data_for`` returns data."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+
+        for subscriber in subscribers:
+            data = data_for(subscriber)
+            if data is None:
+                continue
+            try:
+                subscriber.queue.put_nowait((event, data))
+            except queue.Full:
+                self._overflow(subscriber)
+
+    def _overflow(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self.overflows += 1
+        while True:
+            try:
+                subscriber.queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            subscriber.queue.put_nowait(("resync", {}))
+        except queue.Full:  # pragma: no cover - another publisher refilled it first
+            pass
+
+    def stream(self, subscriber: Subscriber, *, heartbeat: float, max_duration: float) -> Iterator[str]:
+        """Yield SSE frames until ``max_duration`` elapses; clients then reconnect."""
+        deadline = time.monotonic() + max_duration
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    event, data = subscriber.queue.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, data)
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            subscribers = list(self._subscribers)
+            return {
+                "subscribers": len(subscribers),
+                "maxSubscribers": self.max_subscribers,
+                "queuedEvents": sum(subscriber.queue.qsize() for subscriber in subscribers),
+                "published": self.published,
+                "overflows": self.overflows,
+                "rejected": self.rejected,
+            }
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, separators=(',', ':'))}\n\n"
@@ -0,0 +1,211 @@
+"""File-backed background export jobs.
+
+Each job is a ``<id>.json`` metadata file next to its ``<id><suffix>`` artifact
+in one directory, so job state survives restarts and is shared by every
+thread of the process. Artifacts are written to a ``.part`` file and renamed
+when complete, so a download never sees a half-written file.
+
+Unfinished jobs are kept alive by a heartbeat from the process that owns them
+rather than by their age, so an export that runs longer than the TTL is not
+dropped (and duplicated) while it is still being written.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Callable
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+@dataclass
+class ExportJob:
+    id: str
+    key: str
+    status: str
+    filename: str
+    suffix: str
+    created_at: float
+    heartbeat_at: float | None = None
+    finished_at: float | None = None
+    size: int | None = None
+    error: str | None = None
+    extra: dict[str, str] = field(default_factory=dict)
+
+
+class ExportJobStore:
+    """Runs export writers on a small thread pool and tracks their artifacts.
+
+    Jobs with the same ``key`` (a hash of the filters) finished within ``ttl``
+    seconds are reused instead of recomputed; anything older is deleted by
+    :meth:`cleanup`, which callers run opportunistically. Queued and running
+    jobs are reused for as long as they are alive: this store's own jobs always
+    are, and another process's jobs until their heartbeat is ``stale_after``
+    seconds old, which is how a worker lost to a restart is detected.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        ttl: float,
+        stale_after: float,
+        max_workers: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._lock = threading.Lock()
+        self._active: dict[str, ExportJob] = {}
+        self._heartbeat_thread: threading.Thread | None = None
+
+    def submit(
+        self,
+        key: str,
+        *,
+        filename: str,
+        suffix: str,
+        write: Callable[[IO[str]], None],
+        extra: dict[str, str] | None = None,
+    ) -> tuple[ExportJob, bool]:
+        """Start a job for ``key`` unless a live one exists; returns ``(job, reused)``."""
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for job in self._jobs():
+                if job.key == key and job.status != FAILED and not self._expired(job):
+                    return job, True
+
+            job = ExportJob(
+                id=uuid.uuid4().hex,
+                key=key,
+                status=QUEUED,
+                filename=filename,
+                suffix=suffix,
+                created_at=self._clock(),
+                extra=extra or {},
+            )
+            job.heartbeat_at = job.created_at
+            self._save(job)
+            self._active[job.id] = job
+            self._start_heartbeat()
+        self._executor.submit(self._run, job, write)
+        return job, False
+
+    def get(self, job_id: str) -> ExportJob | None:
+        if not _JOB_ID.fullmatch(job_id):
+            return None
+        job = self._load(self._metadata_path(job_id))
+        if job is None or self._expired(job):
+            return None
+        return job
+
+    def artifact_path(self, job: ExportJob) -> Path:
+        return self.directory / f"{job.id}{job.suffix}"
+
+    def cleanup(self) -> int:
+        """Delete expired jobs and their artifacts; returns how many were removed."""
+        removed = 0
+        with self._lock:
+            for job in self._jobs():
+                if not self._expired(job):
+                    continue
+                for path in (self.artifact_path(job), self._part_path(job), self._metadata_path(job.id)):
+                    path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def heartbeat(self) -> None:
+        """Mark every queued or running job of this store as still alive."""
+        with self._lock:
+            now = self._clock()
+            for job in self._active.values():
+                job.heartbeat_at = now
+                self._save(job)
+
+    def _start_heartbeat(self) -> None:
+        if self._heartbeat_thread is None:
+            self._heartbeat_thread = threading.Thread(
+                target=self._heartbeat_loop, name="export-heartbeat", daemon=True
+            )
+            self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while True:
+            time.sleep(self.stale_after / 3)
+            self.heartbeat()
+
+    def _run(self, job: ExportJob, write: Callable[[IO[str]], None]) -> None:
+        with self._lock:
+            job.status = RUNNING
+            self._save(job)
+        part = self._part_path(job)
+        try:
+            with part.open("w", encoding="utf-8", newline="") as handle:
+                write(handle)
+            os.replace(part, self.artifact_path(job))
+        except Exception as exc:  # noqa: BLE001 - recorded on the job for the client
+            part.unlink(missing_ok=True)
+            status, error, size = FAILED, str(exc) or exc.__class__.__name__, None
+        else:
+            status, error, size = COMPLETED, None, self.artifact_path(job).stat().st_size
+        with self._lock:
+            job.status, job.error, job.size = status, error, size
+            job.finished_at = self._clock()
+            self._save(job)
+            del self._active[job.id]
+
+    def _expired(self, job: ExportJob) -> bool:
+        if job.finished_at is not None:
+            return self._clock() - job.finished_at >= self.ttl
+        if job.id in self._active:
+            return False
+        # Another process's job, or one orphaned by a restart: alive while it
+        # keeps heartbeating. Metadata written before heartbeats has none.
+        return self._clock() - (job.heartbeat_at or job.created_at) >= self.stale_after
+
+    def _jobs(self) -> list[ExportJob]:
+        if not self.directory.exists():
+            return []
+        jobs = (self._load(path) for path in self.directory.glob("*.json"))
+        return [job for job in jobs if job is not None]
+
+    def _metadata_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def _part_path(self, job: ExportJob) -> Path:
+        return self.directory / f"{job.id}{job.suffix}.part"
+
+    def _save(self, job: ExportJob) -> None:
+        path = self._metadata_path(job.id)
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(asdict(job)), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _load(path: Path) -> ExportJob | None:
+        try:
+            return ExportJob(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def stats(self) -> dict[str, object]:
+        counts: dict[str, int] = {}
+        for job in self._jobs():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {"jobs": counts, "ttlSeconds": self.ttl, "staleAfterSeconds": self.stale_after}
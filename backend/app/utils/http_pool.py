@@ -0,0 +1,148 @@
+"""Small keep-alive HTTP(S) connection pool built on ``http.client``."""
+
+from __future__ import annotations
+
+import http.client
+import threading
+import time
+from typing import Callable, NamedTuple
+from urllib.parse import urljoin, urlsplit
+
+_REDIRECTS = (301, 302, 303, 307, 308)
+# Errors that mean a reused keep-alive connection was closed by the server.
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, BrokenPipeError, ConnectionResetError)
+
+
+class HttpResponse(NamedTuple):
+    status: int
+    body: bytes
+    url: str
+
+
+class HttpConnectionPool:
+    """Keeps up to ``max_idle`` open connections per host for reuse.
+
+    Thread-safe: a connection is owned by one request at a time and returned
+    to its host's idle stack only after the response has been read in full.
+    Idle connections older than ``idle_timeout`` are discarded instead of
+    reused, since servers close them on their side anyway.
+    """
+
+    def __init__(
+        self,
+        *,
+        connect_timeout: float = 10,
+        read_timeout: float = 30,
+        max_idle: int = 4,
+        idle_timeout: float = 60,
+        max_redirects: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.max_redirects = max_redirects
+        self._clock = clock
+        self._idle: dict[tuple[str, str, int], list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.reused = 0
+
+    def request(self, method: str, url: str, *, body: bytes | None = None, headers: dict[str, str] | None = None) -> HttpResponse:
+        """Send a request, following redirects the way browsers do.
+
+        301/302/303 turn a POST into a body-less GET (Apps Script answers a
+        POST with a 302 to the script's output); 307/308 repeat the request.
+        """
+        headers = dict(headers or {})
+        for _ in range(self.max_redirects + 1):
+            status, location, payload = self._send(method, url, body, headers)
+            if status not in _REDIRECTS or not location:
+                return HttpResponse(status, payload, url)
+            url = urljoin(url, location)
+            if status in (301, 302, 303) and method != "HEAD":
+                method, body = "GET", None
+                headers.pop("Content-Type", None)
+        raise http.client.HTTPException(f"Too many redirects (last: {url})")
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection, _ in connections:
+                connection.close()
+
+    def _send(self, method: str, url: str, body: bytes | None, headers: dict[str, str]) -> tuple[int, str | None, bytes]:
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname or "", parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target += f"?{parts.query}"
+
+        connection, reused = self._checkout(key)
+        try:
+            try:
+                response = self._exchange(connection, method, target, body, headers)
+            except _STALE_ERRORS:
+                if not reused:
+                    raise
+                connection.close()
+                connection, reused = self._open(key), False
+                response = self._exchange(connection, method, target, body, headers)
+            payload = response.read()
+        except Exception:
+            connection.close()
+            raise
+
+        with self._lock:
+            self.requests += 1
+            self.reused += int(reused)
+        if response.will_close:
+            connection.close()
+        else:
+            self._checkin(key, connection)
+        return response.status, response.getheader("Location"), payload
+
+    def _exchange(self, connection, method, target, body, headers) -> http.client.HTTPResponse:
+        if connection.sock is None:
+            connection.connect()
+            connection.sock.settimeout(self.read_timeout)
+        connection.request(method, target, body=body, headers=headers)
+        return connection.getresponse()
+
+    def _checkout(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        now = self._clock()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                connection, returned_at = idle.pop()
+                if now - returned_at < self.idle_timeout:
+                    return connection, True
+                connection.close()
+        return self._open(key), False
+
+    def _checkin(self, key: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((connection, self._clock()))
+                return
+        connection.close()
+
+    def _open(self, key: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        connection_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        with self._lock:
+            self.connections += 1
+        return connection_class(host, port, timeout=self.connect_timeout)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "reused": self.reused,
+                "idle": sum(len(connections) for connections in self._idle.values()),
+            }
@@ -0,0 +1,87 @@
+"""Occupancy aggregation over reservation intervals.
+
+Buckets follow the hut's local calendar (JST) while reservation times are
+stored as naive UTC, so bucket boundaries are returned as naive UTC too.
+"""
+
+from __future__ import annotations
+
+import heapq
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+JST = timezone(timedelta(hours=9))
+
+BUCKET_SIZES = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+
+
+def local_date(dt: datetime) -> date:
+    """JST calendar date of a naive-UTC or aware datetime."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(JST).date()
+
+
+def bucket_bounds(first_day: date, last_day: date, bucket: str) -> list[datetime]:
+    """Naive-UTC boundaries covering ``first_day``..``last_day`` (inclusive).
+
+    ``len(bounds) - 1`` buckets are described; weekly buckets start on Monday.
+    """
+    size = BUCKET_SIZES[bucket]
+    if bucket == "week":
+        first_day -= timedelta(days=first_day.weekday())
+    current = datetime.combine(first_day, datetime.min.time(), JST).astimezone(timezone.utc).replace(tzinfo=None)
+    stop = datetime.combine(last_day + timedelta(days=1), datetime.min.time(), JST)
+    stop = stop.astimezone(timezone.utc).replace(tzinfo=None)
+
+    bounds = [current]
+    while current < stop:
+        current += size
+        bounds.append(current)
+    return bounds
+
+
+def sweep_occupancy(rows: Iterable[tuple[datetime, datetime, int]], bounds: list[datetime]) -> list[dict[str, int]]:
+    """Aggregate ``(start, end, attendees)`` rows into the buckets between ``bounds``.
+
+    ``rows`` must be ordered by start time. One pass keeps a min-heap of the
+    end times of reservations still in progress: starts raise the concurrency,
+    ends that precede the next start lower it. Intervals are half-open, so a
+    stay ending exactly when another begins does not count as an overlap.
+    """
+    rows = iter(rows)
+    pending = next(rows, None)
+    active: list[tuple[datetime, int]] = []
+    active_attendees = 0
+    results = []
+
+    for bucket_start, bucket_end in zip(bounds, bounds[1:]):
+        while active and active[0][0] <= bucket_start:
+            active_attendees -= heapq.heappop(active)[1]
+
+        reservation_count = len(active)
+        attendee_total = active_attendees
+        peak_concurrent = len(active)
+        peak_attendees = active_attendees
+
+        while pending is not None and pending[0] < bucket_end:
+            start, end, attendees = pending
+            pending = next(rows, None)
+            if end <= bucket_start:
+                continue
+            while active and active[0][0] <= start:
+                active_attendees -= heapq.heappop(active)[1]
+            heapq.heappush(active, (end, attendees))
+            active_attendees += attendees
+            reservation_count += 1
+            attendee_total += attendees
+            peak_concurrent = max(peak_concurrent, len(active))
+            peak_attendees = max(peak_attendees, active_attendees)
+
+        results.append({
+            "reservationCount": reservation_count,
+            "attendeeTotal": attendee_total,
+            "peakConcurrent": peak_concurrent,
+            "peakAttendees": peak_attendees,
+        })
+    return results
@@ -0,0 +1,316 @@
+"""Dispatcher for the transactional notification outbox.
+
+Writers call :func:`enqueue` with their own session, so a notification exists
+exactly when the change it describes was committed. The dispatcher claims due
+rows in batches, hands each one to a registered handler and records the
+outcome: sent, retried with exponential backoff, or dead-lettered once
+``max_attempts`` is used up. A handler that raises :class:`Deferred` (say,
+because a send quota is exhausted) is rescheduled without using an attempt.
+Delivery is at-least-once; a crash between
+sending and recording the result repeats the send after the claim lease.
+
+Kinds registered with :meth:`OutboxDispatcher.digest_handler` can be held
+for a digest window: they become due ``digest_window`` after being written
+(or at once when ``digest_max`` of them are waiting), and when one is claimed
+every other waiting message of those kinds is claimed with it and delivered
+as a single digest.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import event, func, select, update
+from sqlalchemy.orm import Session
+
+from app.database import session_scope
+from app.models.outbox import OUTBOX_DEAD, OUTBOX_PENDING, OUTBOX_SENDING, OUTBOX_SENT, OutboxMessage
+
+CLAIM_LEASE = timedelta(minutes=10)
+MAX_BACKOFF = timedelta(hours=6)
+
+Handler = Callable[..., None]
+DigestHandler = Callable[[list[tuple[str, dict[str, Any]]]], None]
+
+
+class Deferred(Exception):
+    """Raised by a handler to retry after ``delay`` without counting an attempt."""
+
+    def __init__(self, message: str, delay: timedelta) -> None:
+        super().__init__(message)
+        self.delay = delay
+
+
+class OutboxDispatcher:
+    """Claims due outbox rows and runs their handlers through ``submit``.
+
+    ``submit(fn, *args)`` is normally a worker pool's submit, so sends run on
+    the bounded notification workers; a task the pool drops simply waits for
+    its claim lease to expire and is picked up again.
+    """
+
+    def __init__(
+        self,
+        *,
+        submit: Callable[..., Any],
+        batch_size: int,
+        poll_interval: float,
+        max_attempts: int,
+        retry_base: timedelta,
+        digest_window: timedelta | None = None,
+        digest_max: int = 20,
+        clock: Callable[[], datetime] = datetime.utcnow,
+    ) -> None:
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.digest_window = digest_window
+        self.digest_max = digest_max
+        self._submit = submit
+        self._clock = clock
+        self._handlers: dict[str, Handler] = {}
+        self._digest_kinds: tuple[str, ...] = ()
+        self._digest_handler: DigestHandler | None = None
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.claimed = 0
+        self.sent = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.deferred = 0
+        self.digests = 0
+
+    def handler(self, kind: str) -> Callable[[Handler], Handler]:
+        """Register the function that delivers messages of ``kind``.
+
+        Handlers receive the payload as keyword arguments and raise to signal
+        a failed delivery.
+        """
+
+        def register(fn: Handler) -> Handler:
+            self._handlers[kind] = fn
+            return fn
+
+        return register
+
+    def digest_handler(self, *kinds: str) -> Callable[[DigestHandler], DigestHandler]:
+        """Register the function that delivers several ``kinds`` messages at once.
+
+        It receives a list of ``(kind, payload)`` pairs, oldest first. Single
+        messages still go to their own :meth:`handler`.
+        """
+
+        def register(fn: DigestHandler) -> DigestHandler:
+            self._digest_kinds = kinds
+            self._digest_handler = fn
+            return fn
+
+        return register
+
+    @property
+    def digesting(self) -> bool:
+        return bool(self.digest_window and self._digest_handler is not None)
+
+    def enqueue(self, session: Session, kind: str, **payload: Any) -> OutboxMessage:
+        """Add a message to ``session``; the dispatcher is woken after commit."""
+        now = self._clock()
+        held = self.digesting and kind in self._digest_kinds
+        message = OutboxMessage(
+            kind=kind,
+            payload=json.dumps(payload),
+            status=OUTBOX_PENDING,
+            attempts=0,
+            next_attempt_at=now + self.digest_window if held else now,
+        )
+        session.add(message)
+        if held:
+            self._flush_full_digest(session, now)
+        event.listen(session, "after_commit", lambda _session: self.wake(), once=True)
+        return message
+
+    def _flush_full_digest(self, session: Session, now: datetime) -> None:
+        waiting = self._waiting_digest()
+        session.flush()
+        count = session.scalar(select(func.count()).select_from(OutboxMessage).where(*waiting))
+        if count >= self.digest_max:
+            session.execute(update(OutboxMessage).where(*waiting).values(next_attempt_at=now))
+
+    def _waiting_digest(self) -> tuple:
+        """Digest messages still in their hold window.
+
+        Ones that already failed or were deferred keep their own schedule rather
+        than being pulled forward with the next digest.
+        """
+        return (
+            OutboxMessage.status == OUTBOX_PENDING,
+            OutboxMessage.kind.in_(self._digest_kinds),
+            OutboxMessage.attempts == 0,
+            OutboxMessage.last_error.is_(None),
+        )
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._loop, name="outbox-dispatcher", daemon=True)
+            self._thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def run_once(self) -> int:
+        """Claim one batch of due messages and submit them; returns the batch size."""
+        claimed = self._claim()
+        digest = [message for message in claimed if self.digesting and message[1] in self._digest_kinds]
+        for message in claimed:
+            if len(digest) < 2 or message not in digest:
+                self._submit(self._deliver, *message)
+        if len(digest) >= 2:
+            self._submit(self._deliver_digest, digest)
+        return len(claimed)
+
+    def _loop(self) -> None:
+        while True:
+            try:
+                claimed = self.run_once()
+            except Exception:  # noqa: BLE001 - keep dispatching after a DB hiccup
+                traceback.print_exc()
+                claimed = 0
+            if claimed < self.batch_size:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def _claim(self) -> list[tuple[int, str, dict[str, Any], int]]:
+        now = self._clock()
+        with session_scope() as session:
+            messages = session.scalars(
+                select(OutboxMessage)
+                .where(
+                    OutboxMessage.status.in_((OUTBOX_PENDING, OUTBOX_SENDING)),
+                    OutboxMessage.next_attempt_at <= now,
+                )
+                .order_by(OutboxMessage.next_attempt_at, OutboxMessage.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if self.digesting and any(message.kind in self._digest_kinds for message in messages):
+                # The oldest held message is due: take the whole burst along with it.
+                claimed_ids = [message.id for message in messages]
+                messages = list(messages) + list(session.scalars(
+                    select(OutboxMessage)
+                    .where(*self._waiting_digest(), OutboxMessage.id.not_in(claimed_ids))
+                    .order_by(OutboxMessage.id)
+                    .limit(self.digest_max)
+                    .with_for_update(skip_locked=True)
+                ))
+            claimed = []
+            for message in messages:
+                message.status = OUTBOX_SENDING
+                message.attempts += 1
+                message.next_attempt_at = now + CLAIM_LEASE
+                claimed.append((message.id, message.kind, json.loads(message.payload), message.attempts))
+        with self._lock:
+            self.claimed += len(claimed)
+        return claimed
+
+    def _deliver(self, message_id: int, kind: str, payload: dict[str, Any], attempts: int) -> None:
+        try:
+            handler = self._handlers.get(kind)
+            if handler is None:
+                raise LookupError(f"No outbox handler for {kind!r}")
+            handler(**payload)
+        except Deferred as exc:
+            self._record_deferral(message_id, attempts, exc)
+        except Exception as exc:  # noqa: BLE001 - recorded on the row for inspection
+            self._record_failure(message_id, attempts, exc)
+        else:
+            self._record(message_id, status=OUTBOX_SENT, sent_at=self._clock(), last_error=None)
+            with self._lock:
+                self.sent += 1
+
+    def _deliver_digest(self, messages: list[tuple[int, str, dict[str, Any], int]]) -> None:
+        messages = sorted(messages)
+        try:
+            self._digest_handler([(kind, payload) for _, kind, payload, _ in messages])
+        except Deferred as exc:
+            for message_id, _, _, attempts in messages:
+                self._record_deferral(message_id, attempts, exc)
+            return
+        except Exception as exc:  # noqa: BLE001 - recorded on every row of the digest
+            for message_id, _, _, attempts in messages:
+                self._record_failure(message_id, attempts, exc)
+            return
+        sent_at = self._clock()
+        for message_id, _, _, _ in messages:
+            self._record(message_id, status=OUTBOX_SENT, sent_at=sent_at, last_error=None)
+        with self._lock:
+            self.sent += len(messages)
+            self.digests += 1
+
+    def _record_failure(self, message_id: int, attempts: int, exc: Exception) -> None:
+        error = f"{exc.__class__.__name__}: {exc}"[:2000]
+        if attempts >= self.max_attempts:
+            self._record(message_id, status=OUTBOX_DEAD, last_error=error)
+            with self._lock:
+                self.dead_lettered += 1
+            return
+        delay = min(self.retry_base * 2 ** (attempts - 1), MAX_BACKOFF)
+        self._record(message_id, status=OUTBOX_PENDING, next_attempt_at=self._clock() + delay, last_error=error)
+        with self._lock:
+            self.retried += 1
+
+    def _record_deferral(self, message_id: int, attempts: int, exc: Deferred) -> None:
+        self._record(
+            message_id,
+            status=OUTBOX_PENDING,
+            attempts=attempts - 1,
+            next_attempt_at=self._clock() + exc.delay,
+            last_error=f"Deferred: {exc}"[:2000],
+        )
+        with self._lock:
+            self.deferred += 1
+
+    @staticmethod
+    def _record(message_id: int, **values: Any) -> None:
+        with session_scope() as session:
+            session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id == message_id, OutboxMessage.status == OUTBOX_SENDING)
+                .values(**values)
+            )
+
+    def replay(self, session: Session, message_ids: Iterable[int] | None = None) -> int:
+        """Move dead-lettered messages (all, or just ``message_ids``) back to pending."""
+        statement = update(OutboxMessage).where(OutboxMessage.status == OUTBOX_DEAD)
+        if message_ids is not None:
+            statement = statement.where(OutboxMessage.id.in_(list(message_ids)))
+        result = session.execute(
+            statement.values(status=OUTBOX_PENDING, attempts=0, next_attempt_at=self._clock(), last_error=None)
+        )
+        if result.rowcount:
+            event.listen(session, "after_commit", lambda _session: self.wake(), once=True)
+        return result.rowcount
+
+    def stats(self) -> dict[str, object]:
+        with session_scope() as session:
+            counts = dict(
+                session.execute(select(OutboxMessage.status, func.count()).group_by(OutboxMessage.status)).all()
+            )
+        with self._lock:
+            return {
+                "messages": counts,
+                "running": self._thread is not None,
+                "claimed": self.claimed,
+                "sent": self.sent,
+                "retried": self.retried,
+                "deadLettered": self.dead_lettered,
+                "deferred": self.deferred,
+                "digests": self.digests,
+                "digestWindowSeconds": self.digest_window.total_seconds() if self.digesting else None,
+            }
@@ -0,0 +1,129 @@
+"""Token-bucket rate limiting for outbound mail transports."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+DAY_SECONDS = 24 * 60 * 60
+
+
+class RateLimited(Exception):
+    """Raised instead of waiting when the next token is more than ``max_wait`` away."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"{name} send rate exceeded; next slot in {retry_after:.0f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """``capacity`` tokens refilled continuously at ``rate`` per second.
+
+    Tokens may go negative: a caller that takes more than is available has
+    reserved the shortfall and waits it out, and later callers queue behind it.
+    """
+
+    def __init__(self, *, rate: float, capacity: float, now: float) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._updated = now
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, count: int) -> float:
+        """Seconds until ``count`` tokens are available (after :meth:`refill`)."""
+        return max(0.0, (count - self.tokens) / self.rate)
+
+    def take(self, count: int) -> None:
+        self.tokens -= count
+
+
+class RateLimiter:
+    """Per-transport limiter combining a short-term rate with a daily quota.
+
+    :meth:`acquire` reserves tokens from every bucket under one lock, then
+    sleeps outside it until the reservation is due, so concurrent senders are
+    served in arrival order. When the wait would exceed ``max_wait`` nothing
+    is reserved and :class:`RateLimited` tells the caller when to come back;
+    the daily bucket refills evenly, so an exhausted quota frees one send every
+    ``DAY_SECONDS / daily`` seconds rather than all at midnight.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        per_minute: int,
+        burst: int,
+        daily: int,
+        max_wait: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.name = name
+        self.max_wait = max_wait
+        self._clock = clock
+        self._sleep = sleep
+        now = clock()
+        self._rate = TokenBucket(rate=per_minute / 60, capacity=burst, now=now)
+        self._daily = TokenBucket(rate=daily / DAY_SECONDS, capacity=daily, now=now)
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.delayed = 0
+        self.deferred = 0
+        self.waiting = 0
+        self.waited_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """The most tokens that can ever be available at once."""
+        return int(min(self._rate.capacity, self._daily.capacity))
+
+    def acquire(self, count: int = 1) -> float:
+        """Take ``count`` tokens, sleeping until they are available; returns the wait."""
+        with self._lock:
+            now = self._clock()
+            for bucket in (self._rate, self._daily):
+                bucket.refill(now)
+            delay = max(self._rate.delay(count), self._daily.delay(count))
+            if delay > self.max_wait:
+                self.deferred += 1
+                raise RateLimited(self.name, delay)
+            self._rate.take(count)
+            self._daily.take(count)
+            self.acquired += count
+            if delay:
+                self.delayed += 1
+                self.waiting += 1
+                self.waited_seconds += delay
+        if delay:
+            try:
+                self._sleep(delay)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        return delay
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            now = self._clock()
+            for bucket in (self._rate, self._daily):
+                bucket.refill(now)
+            return {
+                "perMinute": round(self._rate.rate * 60),
+                "burst": self._rate.capacity,
+                "daily": self._daily.capacity,
+                "available": max(0, int(min(self._rate.tokens, self._daily.tokens))),
+                "dailyRemaining": max(0, int(self._daily.tokens)),
+                "waiting": self.waiting,
+                "backlogSeconds": round(max(self._rate.delay(0), self._daily.delay(0)), 3),
+                "acquired": self.acquired,
+                "delayed": self.delayed,
+                "deferred": self.deferred,
+                "waitedSeconds": round(self.waited_seconds, 3),
+            }
@@ -0,0 +1,137 @@
+"""Persistent SMTP sessions for notification mail."""
+
+from __future__ import annotations
+
+import smtplib
+import socket
+import ssl
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable
+
+
+class SmtpTransport:
+    """Sends messages over one authenticated SMTP session per thread.
+
+    The server name is resolved (IPv4 only) once per ``resolve_ttl`` seconds
+    and each worker thread keeps its session open between messages, so the
+    recipients of one event cost one connect/STARTTLS/login instead of one per
+    recipient. A session idle for ``idle_timeout`` seconds is closed before
+    reuse, and a send on a session the server already dropped is retried once
+    on a fresh one.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        use_tls: bool,
+        timeout: float = 30,
+        idle_timeout: float = 60,
+        resolve_ttl: float = 3600,
+        log: Callable[[str], None] = lambda message: None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.resolve_ttl = resolve_ttl
+        self._log = log
+        self._clock = clock
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._address: tuple[str, float] | None = None
+        self.resolves = 0
+        self.connections = 0
+        self.reconnects = 0
+        self.sent = 0
+
+    def send(self, message: EmailMessage) -> None:
+        """Send ``message``; raises on failure after one reconnect attempt."""
+        try:
+            self._session().send_message(message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            with self._lock:
+                self.reconnects += 1
+            self._log("SMTP session was dropped by the server; reconnecting...")
+            self.close()
+            self._session().send_message(message)
+        self._local.last_used = self._clock()
+        with self._lock:
+            self.sent += 1
+
+    def close(self) -> None:
+        """Close this thread's session, if any."""
+        server = getattr(self._local, "server", None)
+        self._local.server = None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+
+    def _session(self) -> smtplib.SMTP:
+        server = getattr(self._local, "server", None)
+        if server is not None and self._clock() - self._local.last_used >= self.idle_timeout:
+            self._log("SMTP session idle too long; reconnecting...")
+            self.close()
+            server = None
+        if server is None:
+            server = self._connect()
+            self._local.server = server
+            self._local.last_used = self._clock()
+        return server
+
+    def _server_ip(self) -> str:
+        with self._lock:
+            if self._address is not None and self._clock() - self._address[1] < self.resolve_ttl:
+                return self._address[0]
+        # Force IPv4 resolution to avoid [Errno 101] Network is unreachable on IPv6-disabled environments
+        self._log(f"Resolving {self.host} (IPv4)...")
+        addr_info = socket.getaddrinfo(self.host, self.port, socket.AF_INET, socket.SOCK_STREAM)
+        server_ip = addr_info[0][4][0]
+        self._log(f"Resolved to {server_ip}")
+        with self._lock:
+            self._address = (server_ip, self._clock())
+            self.resolves += 1
+        return server_ip
+
+    def _connect(self) -> smtplib.SMTP:
+        server_ip = self._server_ip()
+        self._log(f"Connecting to {server_ip}:{self.port} with timeout={self.timeout}s...")
+        # Connected by IP, so the certificate cannot match the host name.
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        if self.port == 465:
+            server = smtplib.SMTP_SSL(server_ip, self.port, context=context, timeout=self.timeout)
+        else:
+            server = smtplib.SMTP(server_ip, self.port, timeout=self.timeout)
+            if self.use_tls:
+                server.starttls(context=context)
+        try:
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        with self._lock:
+            self.connections += 1
+        return server
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "resolves": self.resolves,
+                "connections": self.connections,
+                "reconnects": self.reconnects,
+                "sent": self.sent,
+                "idleTimeoutSeconds": self.idle_timeout,
+            }
@@ -0,0 +1,124 @@
+"""Fixed-size thread pool with a bounded queue and an explicit overflow policy."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import traceback
+from typing import Any, Callable
+
+CALLER_RUNS = "caller_runs"
+DROP_OLDEST = "drop_oldest"
+DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICIES = (CALLER_RUNS, DROP_OLDEST, DROP_NEWEST)
+
+
+class WorkerPool:
+    """Runs submitted callables on ``workers`` threads fed by one bounded queue.
+
+    When the queue is full the overflow policy decides what happens:
+    ``caller_runs`` runs the task in the submitting thread (back-pressure on
+    the request), ``drop_oldest`` discards the longest-waiting task and
+    ``drop_newest`` rejects the new one. Threads start lazily on first submit.
+    """
+
+    def __init__(self, *, workers: int, queue_size: int, overflow: str = CALLER_RUNS, name: str = "worker") -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.workers = workers
+        self.overflow = overflow
+        self.name = name
+        self._queue: queue.Queue[tuple[Callable[..., Any], tuple]] = queue.Queue(maxsize=queue_size)
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.caller_runs = 0
+        self.busy = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> bool:
+        """Queue ``fn(*args)``; returns False when the overflow policy dropped it."""
+        self._ensure_started()
+        with self._lock:
+            self.submitted += 1
+        try:
+            self._queue.put_nowait((fn, args))
+            return True
+        except queue.Full:
+            pass
+
+        if self.overflow == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+                self._queue.task_done()
+                with self._lock:
+                    self.dropped += 1
+                self._queue.put_nowait((fn, args))
+                return True
+            except (queue.Empty, queue.Full):
+                pass  # raced with workers or other submitters; fall through and drop this one
+
+        if self.overflow == CALLER_RUNS:
+            with self._lock:
+                self.caller_runs += 1
+            self._run(fn, args)
+            return True
+
+        with self._lock:
+            self.dropped += 1
+        return False
+
+    def join(self) -> None:
+        """Block until every queued task has finished (tests and shutdown)."""
+        self._queue.join()
+
+    def _ensure_started(self) -> None:
+        if len(self._threads) >= self.workers:
+            return
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._work, name=f"{self.name}-{len(self._threads) + 1}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            fn, args = self._queue.get()
+            with self._lock:
+                self.busy += 1
+            try:
+                self._run(fn, args)
+            finally:
+                with self._lock:
+                    self.busy -= 1
+                self._queue.task_done()
+
+    def _run(self, fn: Callable[..., Any], args: tuple) -> None:
+        try:
+            fn(*args)
+        except Exception:  # noqa: BLE001 - one failing task must not kill the worker
+            traceback.print_exc()
+            with self._lock:
+                self.failed += 1
+        else:
+            with self._lock:
+                self.completed += 1
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "busy": self.busy,
+                "queued": self._queue.qsize(),
+                "maxQueue": self._queue.maxsize,
+                "overflowPolicy": self.overflow,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "callerRuns": self.caller_runs,
+            }
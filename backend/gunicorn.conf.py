@@ -0,0 +1,34 @@
+"""Gunicorn settings, picked up automatically when started from ``backend/``.
+
+Server-sent events are fanned out by an in-process ``EventBroker``: a write
+handled by one worker process never reaches streams held open by another. The
+API therefore runs as exactly one process and refuses to start with more.
+
+Each open stream occupies a gthread thread for up to SSE_MAX_STREAM_SECONDS,
+so the pool holds SSE_MAX_SUBSCRIBERS streams plus REQUEST_THREADS kept free
+for ordinary requests; streams beyond the cap get 503 and the browser retries.
+"""
+
+import os
+
+REQUEST_THREADS = 16
+# Read from the environment rather than app.config so the master does not
+# import the application before forking.
+SSE_MAX_SUBSCRIBERS = int(os.getenv("SSE_MAX_SUBSCRIBERS", "32"))
+
+worker_class = "gthread"
+workers = 1
+threads = SSE_MAX_SUBSCRIBERS + REQUEST_THREADS
+
+
+def on_starting(server):
+    if server.cfg.workers != 1:
+        raise RuntimeError(
+            "Run a single gunicorn worker: server-sent events only reach streams "
+            f"in the process that published them (got --workers {server.cfg.workers})."
+        )
+    if server.cfg.threads <= SSE_MAX_SUBSCRIBERS:
+        raise RuntimeError(
+            f"--threads {server.cfg.threads} leaves no thread for requests once "
+            f"SSE_MAX_SUBSCRIBERS={SSE_MAX_SUBSCRIBERS} streams are open."
+        )
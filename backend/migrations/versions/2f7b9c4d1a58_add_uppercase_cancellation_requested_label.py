@@ -0,0 +1,35 @@
+"""Add the CANCELLATION_REQUESTED enum label
+
+Revision ID: 2f7b9c4d1a58
+Revises: 3d9a1f6c2b47
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2f7b9c4d1a58'
+down_revision: Union[str, Sequence[str], None] = '3d9a1f6c2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    if bind.engine.name == 'postgresql':
+        # SQLAlchemy stores enum member names, but 62341d6d83fa added the value
+        # in lowercase, so writing the status failed on PostgreSQL. New enum
+        # labels must be committed before they can be used.
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE reservationstatus ADD VALUE IF NOT EXISTS 'CANCELLATION_REQUESTED'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # PostgreSQL cannot drop a label from an enum type; the unused label stays.
+    pass
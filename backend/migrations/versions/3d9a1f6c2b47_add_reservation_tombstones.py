@@ -0,0 +1,43 @@
+"""Add reservation tombstones and updated_at index
+
+Revision ID: 3d9a1f6c2b47
+Revises: c4f0b2d6a91e
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d9a1f6c2b47'
+down_revision: Union[str, Sequence[str], None] = 'c4f0b2d6a91e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_reservations_updated_at'), 'reservations', ['updated_at'], unique=False)
+    op.create_table(
+        'reservation_tombstones',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('reservation_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_reservation_tombstones_deleted_at'),
+        'reservation_tombstones',
+        ['deleted_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_reservation_tombstones_deleted_at'), table_name='reservation_tombstones')
+    op.drop_table('reservation_tombstones')
+    op.drop_index(op.f('ix_reservations_updated_at'), table_name='reservations')
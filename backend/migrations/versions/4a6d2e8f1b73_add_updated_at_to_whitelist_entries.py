@@ -0,0 +1,31 @@
+"""Add updated_at to whitelist entries
+
+Revision ID: 4a6d2e8f1b73
+Revises: 8d3f6a2c4e10
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a6d2e8f1b73'
+down_revision: Union[str, Sequence[str], None] = '8d3f6a2c4e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'whitelist_entries',
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.func.current_timestamp()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('whitelist_entries', 'updated_at')
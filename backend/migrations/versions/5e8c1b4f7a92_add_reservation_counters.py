@@ -0,0 +1,40 @@
+"""Add reservation counters
+
+Revision ID: 5e8c1b4f7a92
+Revises: 9b2e4d7a1c35
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8c1b4f7a92'
+down_revision: Union[str, Sequence[str], None] = '9b2e4d7a1c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'reservation_counters',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.Column('reconciled_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # Seed from the current rows; the old reconciled_at makes the first read recount anyway.
+    op.execute(
+        "INSERT INTO reservation_counters (name, value, reconciled_at) "
+        "SELECT 'pending', COUNT(*), '2000-01-01 00:00:00' FROM reservations "
+        "WHERE status IN ('PENDING', 'CANCELLATION_REQUESTED')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reservation_counters')
@@ -0,0 +1,50 @@
+"""Add composite and partial indexes for reservation queries
+
+Revision ID: 9b2e4d7a1c35
+Revises: 2f7b9c4d1a58
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2e4d7a1c35'
+down_revision: Union[str, Sequence[str], None] = '2f7b9c4d1a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_PREDICATE = sa.text("status IN ('PENDING', 'CANCELLATION_REQUESTED')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_reservations_status_time_range',
+        'reservations',
+        ['status', 'start_time', 'end_time'],
+        unique=False,
+    )
+    op.create_index('ix_reservations_user_start_time', 'reservations', ['user_id', 'start_time'], unique=False)
+    # ix_reservations_user_start_time leads with user_id, so it serves every
+    # user_id lookup (and the users.id foreign key) the single-column index did.
+    op.drop_index('ix_reservations_user_id', table_name='reservations')
+    op.create_index(
+        'ix_reservations_pending',
+        'reservations',
+        ['status', 'start_time'],
+        unique=False,
+        sqlite_where=PENDING_PREDICATE,
+        postgresql_where=PENDING_PREDICATE,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reservations_pending', table_name='reservations')
+    op.create_index('ix_reservations_user_id', 'reservations', ['user_id'], unique=False)
+    op.drop_index('ix_reservations_user_start_time', table_name='reservations')
+    op.drop_index('ix_reservations_status_time_range', table_name='reservations')
@@ -0,0 +1,122 @@
+"""Per-message render cost of the notification email templates.
+
+Usage:
+    uv run python -m scripts.benchmark_email_templates --number 20000
+
+Compares the template registry with the previous inline f-strings, which
+built all three status bodies before picking one, and with ``str.format_map``
+over the raw template source (parsing on every call).
+"""
+
+from __future__ import annotations
+
+import argparse
+import timeit
+from datetime import datetime
+
+from app.models.reservation import ReservationStatus
+from app.schemas.notification import ReservationSnapshot
+from app.utils.email import _status_template, _template_values
+from app.utils.email_templates import SITE_URL, templates
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="Renders per measurement")
+    parser.add_argument("--repeat", type=int, default=5)
+    return parser.parse_args()
+
+
+def legacy_status(values: dict[str, object], status: ReservationStatus) -> tuple[str, str]:
+    """The pre-registry status notification: every template rendered, one used."""
+    user_name = values["user_name"]
+    purpose = values["purpose"]
+    start = values["start"]
+    end = values["end"]
+    approval_message = values["approval_message"]
+    rejection_reason = values["rejection_reason"]
+    status_messages = {
+        ReservationStatus.APPROVED: (
+            "予約が承認されました",
+            f"""
+{user_name} 様
+
+以下の予約が承認されました。
+
+目的: {purpose}
+日時: {start} - {end}
+管理者からのメッセージ: {approval_message}
+
+{SITE_URL}
+""",
+        ),
+        ReservationStatus.REJECTED: (
+            "予約が却下されました",
+            f"""
+{user_name} 様
+
+以下の予約が却下されました。
+
+目的: {purpose}
+日時: {start} - {end}
+却下理由: {rejection_reason}
+
+{SITE_URL}
+""",
+        ),
+        ReservationStatus.CANCELLED: (
+            "キャンセル申請が承認されました",
+            f"""
+{user_name} 様
+
+以下の予約のキャンセル申請が承認されました。
+
+目的: {purpose}
+日時: {start} - {end}
+管理者からのメッセージ: {approval_message}
+
+{SITE_URL}
+""",
+        ),
+    }
+    title, body = status_messages[status]
+    return f"【KC Reserve】{title}: {purpose}", body
+
+
+def main() -> None:
+    args = parse_args()
+    snapshot = ReservationSnapshot(
+        id=1,
+        status=ReservationStatus.APPROVED.value,
+        purpose="山小屋合宿",
+        description="詳細" * 20,
+        attendee_count=12,
+        start_time=datetime(2030, 1, 1, 1),
+        end_time=datetime(2030, 1, 2, 3),
+        notify_applicant=True,
+        applicant_email="member@example.com",
+        applicant_display_name="山田",
+        approval_message="よろしくお願いします",
+    )
+    values = _template_values(snapshot, for_admin=False)
+    name = _status_template(ReservationStatus.APPROVED, None)
+    template = templates[name]
+    sources = (
+        "【KC Reserve】予約が承認されました: {purpose}",
+        template.body.render({field: f"{{{field}}}" for field in template.body.fields}),
+    )
+    assert legacy_status(values, ReservationStatus.APPROVED) == templates.render(name, values)
+
+    cases = {
+        "values (per message)": lambda: _template_values(snapshot, for_admin=False),
+        "legacy f-strings": lambda: legacy_status(values, ReservationStatus.APPROVED),
+        "str.format_map": lambda: tuple(source.format_map(values) for source in sources),
+        "registry": lambda: templates.render(name, values),
+    }
+    for label, run in cases.items():
+        best = min(timeit.repeat(run, number=args.number, repeat=args.repeat))
+        print(f"{label:<22} {best / args.number * 1e6:7.2f} µs/message")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Peak memory of the reservation export for growing row counts.
+
+Usage:
+    uv run python -m scripts.benchmark_export --rows 1000 10000 50000
+
+Each run fills a throwaway SQLite file and drains the streaming export
+generator, recording the tracemalloc peak. For comparison the previous
+implementation (``query.all()`` into one ``StringIO``) is measured too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000])
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    workdir = Path(tempfile.mkdtemp())
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir / 'export.db'}"
+
+    # Imported late so the app binds to the throwaway database.
+    import csv
+    import io
+
+    from sqlalchemy import insert
+
+    from app.database import Base, engine, session_scope
+    from app.models import Reservation, User
+    from app.routes.export import (
+        CSV_HEADER,
+        _csv_chunks,
+        _csv_row,
+        _export_filters,
+        _export_statement,
+        _iter_reservation_chunks,
+    )
+
+    Base.metadata.create_all(engine)
+    with session_scope() as session:
+        session.add(User(email="benchmark@example.com", display_name="Benchmark", hashed_password="x"))
+    filters, _ = _export_filters({})
+
+    def streaming() -> int:
+        return sum(len(piece) for piece in _csv_chunks(_iter_reservation_chunks(filters)))
+
+    def in_memory() -> int:
+        with session_scope() as session:
+            reservations = session.scalars(_export_statement(filters)).all()
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(CSV_HEADER)
+            writer.writerows(_csv_row(r) for r in reservations)
+            return len("\ufeff" + output.getvalue())
+
+    seeded = 0
+    base = datetime(2030, 1, 1)
+    for rows in sorted(args.rows):
+        with engine.begin() as connection:
+            connection.execute(
+                insert(Reservation),
+                [
+                    {
+                        "user_id": 1,
+                        "purpose": f"予約 {index}",
+                        "description": "詳細" * 50,
+                        "start_time": base + timedelta(hours=index),
+                        "end_time": base + timedelta(hours=index + 2),
+                        "created_at": base,
+                        "updated_at": base,
+                    }
+                    for index in range(seeded, rows)
+                ],
+            )
+        seeded = rows
+
+        for label, run in (("streaming", streaming), ("in-memory", in_memory)):
+            tracemalloc.start()
+            started = time.perf_counter()
+            size = run()
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{rows:>8} rows  {label:<10} peak {peak / 1024 / 1024:7.1f} MiB  "
+                f"output {size / 1e6:6.1f}M chars  {elapsed:6.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
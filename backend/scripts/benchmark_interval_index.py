@@ -0,0 +1,113 @@
+"""Compare calendar window lookups: SQL range scan vs. the in-memory interval index.
+
+Usage:
+    uv run python -m scripts.benchmark_interval_index --rows 20000 --queries 500
+    uv run python -m scripts.benchmark_interval_index --database-url postgresql://...
+
+Without ``--database-url`` a throwaway SQLite database is filled with random
+reservations. Against an existing database the current rows are used as-is.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models import Reservation, User
+from scripts.interval_index import IntervalIndex
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000, help="Reservations to generate (SQLite only)")
+    parser.add_argument("--queries", type=int, default=500, help="Number of random windows to look up")
+    parser.add_argument("--window-days", type=int, default=35, help="Width of each window (a month view)")
+    parser.add_argument("--database-url", help="Benchmark against an existing database instead")
+    return parser.parse_args()
+
+
+def _seed(session: Session, rows: int, rng: random.Random) -> None:
+    user = User(email="benchmark@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    base = datetime(2020, 1, 1)
+    session.add_all(
+        Reservation(
+            user_id=user.id,
+            purpose="benchmark",
+            start_time=(start := base + timedelta(hours=rng.randint(0, 24 * 365 * 5))),
+            end_time=start + timedelta(hours=rng.randint(1, 72)),
+        )
+        for _ in range(rows)
+    )
+    session.commit()
+
+
+def _timed(label: str, queries: int, fn) -> list[list[int]]:
+    started = time.perf_counter()
+    results = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed * 1000:9.1f} ms total  {elapsed / queries * 1e6:9.1f} us/query")
+    return results
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(42)
+    engine = create_engine(args.database_url or "sqlite://", future=True)
+
+    with Session(engine) as session:
+        if args.database_url is None:
+            Base.metadata.create_all(engine)
+            _seed(session, args.rows, rng)
+
+        rows = session.execute(select(Reservation.id, Reservation.start_time, Reservation.end_time)).all()
+        if not rows:
+            raise SystemExit("No reservations to benchmark against")
+        first = min(row.start_time for row in rows)
+        last = max(row.end_time for row in rows)
+        span_hours = max(1, int((last - first).total_seconds() // 3600))
+        windows = []
+        for _ in range(args.queries):
+            start = first + timedelta(hours=rng.randint(0, span_hours))
+            windows.append((start, start + timedelta(days=args.window_days)))
+
+        started = time.perf_counter()
+        index = IntervalIndex()
+        index.load(rows)
+        index.overlapping(first, first)  # build the tree outside the timed loop
+        print(f"{len(rows)} reservations, index built in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        def sql_range():
+            return [
+                session.scalars(
+                    select(Reservation.id).where(Reservation.end_time >= start, Reservation.start_time <= end)
+                ).all()
+                for start, end in windows
+            ]
+
+        def index_only():
+            return [index.overlapping(start, end) for start, end in windows]
+
+        def index_then_sql():
+            return [
+                session.scalars(select(Reservation.id).where(Reservation.id.in_(index.overlapping(start, end)))).all()
+                for start, end in windows
+            ]
+
+        expected = _timed("SQL range scan", args.queries, sql_range)
+        from_index = _timed("index lookup only", args.queries, index_only)
+        _timed("index lookup + id IN query", args.queries, index_then_sql)
+
+        mismatches = sum(sorted(a) != sorted(b) for a, b in zip(expected, from_index))
+        print(f"result mismatches: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Compare ORM hydration with the Core row projections used by the read endpoints.
+
+Usage:
+    uv run python -m scripts.benchmark_row_projection --rows 5000
+
+Fills a throwaway SQLite database, then for the calendar and list shapes
+measures the time to fetch and serialize every reservation and the memory held
+by the fetched results (tracemalloc), checking that both paths produce the same
+JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import Base
+from app.models import Reservation, User, WhitelistEntry
+from app.models.reservation import ReservationStatus, ReservationVisibility
+from app.routes.reservations import (
+    _calendar_event,
+    _calendar_rows,
+    _calendar_values,
+    _reservation_rows,
+    _serialize_row,
+)
+from app.schemas import serialize_reservation
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3, help="Best-of-N timing runs")
+    return parser.parse_args()
+
+
+def _seed(session: Session, rows: int) -> None:
+    rng = random.Random(42)
+    base = datetime(2030, 1, 1)
+    users = [User(email=f"user{index}@example.com", hashed_password="x") for index in range(100)]
+    session.add_all(users)
+    session.add_all(WhitelistEntry(email=user.email, display_name=f"User {index}") for index, user in enumerate(users))
+    session.flush()
+    for index in range(rows):
+        start = base + timedelta(hours=rng.randint(0, 20000))
+        session.add(Reservation(
+            user_id=rng.choice(users).id,
+            status_updated_by_user_id=rng.choice(users).id if index % 3 else None,
+            status=rng.choice(list(ReservationStatus)),
+            visibility=rng.choice(list(ReservationVisibility)),
+            purpose=f"目的 {index}",
+            display_message=f"表示 {index}" if index % 2 else None,
+            description="詳細" * 200,
+            attendee_count=rng.randint(1, 20),
+            start_time=start,
+            end_time=start + timedelta(hours=rng.randint(1, 72)),
+        ))
+    session.commit()
+
+
+def _orm_query(session: Session, *, include_whitelist: bool):
+    user_option = joinedload(Reservation.user)
+    approver_option = joinedload(Reservation.status_updated_by)
+    if include_whitelist:
+        user_option = user_option.joinedload(User.whitelist_entry)
+        approver_option = approver_option.joinedload(User.whitelist_entry)
+    return session.query(Reservation).options(user_option, approver_option).order_by(Reservation.id)
+
+
+def _fetch_memory(engine, fetch) -> int:
+    """Bytes still allocated after fetching, i.e. what the result objects cost."""
+    with Session(engine) as session:
+        gc.collect()
+        tracemalloc.start()
+        results = fetch(session)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del results
+    return size
+
+
+def _best_of(repeat: int, engine, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        with Session(engine) as session:
+            started = time.perf_counter()
+            run(session)
+            timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        _seed(session, args.rows)
+
+    # Admin view: every row is serialized with private details.
+    cases = {
+        "calendar": (
+            lambda session: _orm_query(session, include_whitelist=False).all(),
+            lambda session: _calendar_rows(session).order_by(Reservation.id).all(),
+            lambda reservations: [_calendar_event(_calendar_values(r), None, True) for r in reservations],
+            lambda rows: [_calendar_event(row._mapping, None, True) for row in rows],
+        ),
+        "list": (
+            lambda session: _orm_query(session, include_whitelist=True).all(),
+            lambda session: _reservation_rows(session).order_by(Reservation.id).all(),
+            lambda reservations: [serialize_reservation(r, include_private=True) for r in reservations],
+            lambda rows: (lambda users: [_serialize_row(row._mapping, True, users) for row in rows])({}),
+        ),
+    }
+
+    print(f"{args.rows} reservations")
+    for label, (fetch_orm, fetch_rows, serialize_orm, serialize_rows) in cases.items():
+        with Session(engine) as session:
+            orm_json = json.dumps(serialize_orm(fetch_orm(session)), ensure_ascii=False)
+        with Session(engine) as session:
+            rows_json = json.dumps(serialize_rows(fetch_rows(session)), ensure_ascii=False)
+        if orm_json != rows_json:
+            raise SystemExit(f"{label}: row projection output differs from the ORM path")
+
+        orm_time = _best_of(args.repeat, engine, lambda session: serialize_orm(fetch_orm(session)))
+        rows_time = _best_of(args.repeat, engine, lambda session: serialize_rows(fetch_rows(session)))
+        orm_memory = _fetch_memory(engine, fetch_orm)
+        rows_memory = _fetch_memory(engine, fetch_rows)
+        print(
+            f"{label:<9} fetch+serialize  orm {orm_time / args.rows * 1e6:6.1f} us/row  "
+            f"rows {rows_time / args.rows * 1e6:6.1f} us/row  ({orm_time / rows_time:4.2f}x)\n"
+            f"{'':<9} memory held      orm {orm_memory / args.rows:6.0f} B/row   "
+            f"rows {rows_memory / args.rows:6.0f} B/row   ({orm_memory / rows_memory:4.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Micro-benchmark of reservation serialization against the previous implementation.
+
+Usage:
+    uv run python -m scripts.benchmark_serializers --rows 10000
+
+Loads reservations (with their users eagerly joined, as the endpoints do) from
+a throwaway SQLite database, checks that the current serializers produce
+byte-identical JSON to the pre-compilation versions kept below, and prints the
+time per row for each.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import Base
+from app.models import Reservation, User
+from app.models.reservation import ReservationStatus, ReservationVisibility
+from app.routes.reservations import _calendar_payload
+from app.schemas import reservation_values, serialize_reservation, serialize_user
+
+
+def legacy_serialize_reservation(reservation: Reservation, *, include_private: bool = False) -> dict[str, object]:
+    def format_dt(dt):
+        if not dt:
+            return None
+        if dt.tzinfo is None:
+            return dt.isoformat() + 'Z'
+        return dt.isoformat()
+
+    return {
+        "id": reservation.id,
+        "userId": reservation.user_id,
+        "user": serialize_user(reservation.user) if include_private and reservation.user else None,
+        "status": reservation.status.value,
+        "visibility": reservation.visibility.value,
+        "purpose": reservation.purpose if include_private or reservation.visibility == ReservationVisibility.PUBLIC else None,
+        "displayMessage": reservation.display_message if include_private or reservation.visibility == ReservationVisibility.PUBLIC else None,
+        "description": reservation.description if include_private else None,
+        "cancellationReason": reservation.cancellation_reason if include_private else None,
+        "rejectionReason": reservation.rejection_reason if include_private else None,
+        "approvalMessage": reservation.approval_message if include_private else None,
+        "statusUpdatedBy": serialize_user(reservation.status_updated_by)
+        if include_private and reservation.status_updated_by
+        else None,
+        "attendeeCount": reservation.attendee_count,
+        "allowAdditionalMembers": reservation.allow_additional_members,
+        "notifyApplicant": reservation.notify_applicant,
+        "startTime": format_dt(reservation.start_time),
+        "endTime": format_dt(reservation.end_time),
+        "createdAt": format_dt(reservation.created_at),
+        "updatedAt": format_dt(reservation.updated_at),
+    }
+
+
+def legacy_calendar_payload(reservation: Reservation) -> dict[str, object]:
+    def format_dt(dt):
+        if not dt:
+            return None
+        if dt.tzinfo is None:
+            return dt.isoformat() + 'Z'
+        return dt.isoformat()
+
+    return {
+        "id": reservation.id,
+        "start": format_dt(reservation.start_time),
+        "end": format_dt(reservation.end_time),
+        "visibility": reservation.visibility.value,
+        "status": reservation.status.value,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="Best-of-N timing runs")
+    return parser.parse_args()
+
+
+def build_reservations(session: Session, rows: int) -> list[Reservation]:
+    rng = random.Random(42)
+    base = datetime(2030, 1, 1)
+    users = [
+        User(email=f"user{index}@example.com", display_name=f"User {index}", hashed_password="x")
+        for index in range(1, 51)
+    ]
+    session.add_all(users)
+    session.flush()
+    for index in range(1, rows + 1):
+        start = base + timedelta(hours=rng.randint(0, 20000))
+        user = rng.choice(users)
+        session.add(Reservation(
+            user_id=user.id,
+            status_updated_by_user_id=rng.choice(users).id if index % 3 else None,
+            status=rng.choice(list(ReservationStatus)),
+            visibility=rng.choice(list(ReservationVisibility)),
+            purpose=f"目的 {index}",
+            display_message=f"表示 {index}" if index % 2 else None,
+            description="詳細" * 20,
+            attendee_count=rng.randint(1, 20),
+            allow_additional_members=bool(index % 2),
+            start_time=start,
+            end_time=start + timedelta(hours=rng.randint(1, 72)),
+        ))
+    session.commit()
+
+    query = select(Reservation).options(
+        joinedload(Reservation.user), joinedload(Reservation.status_updated_by)
+    ).order_by(Reservation.id)
+    return list(session.scalars(query).unique())
+
+
+def best_of(repeat: int, fn) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    session = Session(engine)
+    reservations = build_reservations(session, args.rows)
+
+    cases = [
+        ("serialize_reservation (public)",
+         lambda r: legacy_serialize_reservation(r), lambda r: serialize_reservation(r)),
+        ("serialize_reservation (private)",
+         lambda r: legacy_serialize_reservation(r, include_private=True),
+         lambda r: serialize_reservation(r, include_private=True)),
+        ("calendar payload", legacy_calendar_payload, lambda r: _calendar_payload(reservation_values(r))),
+    ]
+    for label, legacy, current in cases:
+        legacy_json = json.dumps([legacy(r) for r in reservations], ensure_ascii=False)
+        current_json = json.dumps([current(r) for r in reservations], ensure_ascii=False)
+        if legacy_json != current_json:
+            raise SystemExit(f"{label}: output differs from the legacy serializer")
+
+        legacy_time = best_of(args.repeat, lambda: [legacy(r) for r in reservations])
+        current_time = best_of(args.repeat, lambda: [current(r) for r in reservations])
+        print(
+            f"{label:<34} legacy {legacy_time / args.rows * 1e6:6.2f} us/row  "
+            f"current {current_time / args.rows * 1e6:6.2f} us/row  "
+            f"speedup {legacy_time / current_time:4.2f}x  (identical output)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Print the query plan of every reservation endpoint query.
+
+Usage:
+    uv run python -m scripts.explain_queries
+    uv run python -m scripts.explain_queries --database-url postgresql://...
+
+Uses ``EXPLAIN QUERY PLAN`` on SQLite and ``EXPLAIN`` on PostgreSQL against the
+configured database (run ``alembic upgrade head`` first). The statements are
+built by the same helpers the endpoints use, so a plan that stops using an
+index after a code or schema change shows up here.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.reservation import PENDING_STATUSES, Reservation, ReservationStatus
+from app.routes.export import _export_filters, _export_statement
+from app.routes.reservations import (
+    _apply_filters,
+    _calendar_rows,
+    _calendar_visibility,
+    _reservation_rows,
+    _VERSION_QUERY,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=get_settings().database_url)
+    return parser.parse_args()
+
+
+def endpoint_queries(session: Session) -> dict[str, object]:
+    now = datetime.utcnow()
+    window = {"start": now.isoformat(), "end": (now + timedelta(days=35)).isoformat(), "visibility": None}
+    public = _calendar_visibility(None, False)
+    member = _calendar_visibility(1, False)
+
+    return {
+        "calendar (anonymous)": _apply_filters(_calendar_rows(session).filter(public), window)
+        .order_by(Reservation.start_time.asc()),
+        "calendar (member)": _apply_filters(_calendar_rows(session).filter(member), window)
+        .order_by(Reservation.start_time.asc()),
+        "calendar (admin)": _apply_filters(_calendar_rows(session), window).order_by(Reservation.start_time.asc()),
+        "list (public page)": _apply_filters(
+            _reservation_rows(session).filter(Reservation.status == ReservationStatus.APPROVED), window
+        )
+        .order_by(Reservation.start_time.asc(), Reservation.id.asc())
+        .limit(51),
+        "mine (page)": _reservation_rows(session)
+        .filter(Reservation.user_id == 1)
+        .order_by(Reservation.start_time.desc(), Reservation.id.desc())
+        .limit(51),
+        "changes since": _calendar_rows(session)
+        .filter(Reservation.updated_at > now - timedelta(hours=1), public)
+        .order_by(Reservation.updated_at.asc()),
+        "pending count (reconcile)": select(func.count()).select_from(Reservation).where(Reservation.status.in_(PENDING_STATUSES)),
+        "export (changedSince)": _export_statement(
+            _export_filters({"changedSince": (now - timedelta(days=1)).isoformat()})[0]
+        ),
+        "etag version": _VERSION_QUERY,
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    engine = create_engine(args.database_url, future=True)
+    is_sqlite = engine.dialect.name == "sqlite"
+    prefix = "EXPLAIN QUERY PLAN " if is_sqlite else "EXPLAIN "
+
+    with Session(engine) as session:
+        for label, query in endpoint_queries(session).items():
+            statement = getattr(query, "statement", query)
+            sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+            print(f"== {label}")
+            for row in session.execute(text(prefix + sql)):
+                # SQLite: (id, parent, notused, detail); PostgreSQL: one text column.
+                print(f"   {row[-1]}")
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""In-process interval index for reservation window lookups.
+
+The candidate measured by ``benchmark_interval_index``; it lives with the
+benchmark because the application does not use it. Feeding its ids back to the
+database as an ``IN`` list measured no faster than the ``(status, start_time,
+end_time)`` range scan, so calendar windows stay in SQL.
+"""
+
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Iterable
+
+_EMPTY = datetime.min
+
+
+class IntervalIndex:
+    """Reservation ids kept in (start, id) order with a max-end segment tree.
+
+    A window query binary-searches the last interval starting before the window
+    ends, then walks only the tree nodes whose maximum end reaches the window
+    start: O(log n) to locate plus O(log n) per match. Inserts and removals keep
+    the sorted arrays current; the tree is rebuilt lazily on the next query.
+    """
+
+    def __init__(self) -> None:
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._intervals: dict[int, tuple[datetime, datetime]] = {}
+        self._keys: list[tuple[datetime, int]] = []
+        self._ends: list[datetime] = []
+        self._tree: list[datetime] | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def load(self, rows: Iterable[tuple[int, datetime, datetime]]) -> None:
+        """Replace the contents with ``(id, start, end)`` rows and mark the index usable."""
+        with self._lock:
+            self._intervals = {reservation_id: (start, end) for reservation_id, start, end in rows}
+            ordered = sorted((start, reservation_id, end) for reservation_id, (start, end) in self._intervals.items())
+            self._keys = [(start, reservation_id) for start, reservation_id, _ in ordered]
+            self._ends = [end for _, _, end in ordered]
+            self._tree = None
+            self.loaded = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._intervals.clear()
+            self._keys.clear()
+            self._ends.clear()
+            self._tree = None
+            self.loaded = False
+
+    def upsert(self, reservation_id: int, start: datetime, end: datetime) -> None:
+        with self._lock:
+            self._remove(reservation_id)
+            self._intervals[reservation_id] = (start, end)
+            key = (start, reservation_id)
+            position = bisect_left(self._keys, key)
+            self._keys.insert(position, key)
+            self._ends.insert(position, end)
+            self._tree = None
+
+    def discard(self, reservation_id: int) -> None:
+        with self._lock:
+            self._remove(reservation_id)
+
+    def _remove(self, reservation_id: int) -> None:
+        interval = self._intervals.pop(reservation_id, None)
+        if interval is None:
+            return
+        position = bisect_left(self._keys, (interval[0], reservation_id))
+        del self._keys[position]
+        del self._ends[position]
+        self._tree = None
+
+    def overlapping(self, start: datetime | None, end: datetime | None) -> list[int]:
+        """Ids with ``interval.end >= start`` and ``interval.start <= end`` (bounds optional)."""
+        with self._lock:
+            if end is None:
+                limit = len(self._keys)
+            else:
+                # (end, max id) sorts after every key whose start equals ``end``.
+                limit = bisect_right(self._keys, (end, float("inf")))
+            if start is None:
+                return [reservation_id for _, reservation_id in self._keys[:limit]]
+
+            tree = self._tree if self._tree is not None else self._build_tree()
+            matches: list[int] = []
+            stack = [(1, 0, self._size)]
+            while stack:
+                node, low, high = stack.pop()
+                if low >= limit or tree[node] < start:
+                    continue
+                if high - low == 1:
+                    matches.append(self._keys[low][1])
+                    continue
+                middle = (low + high) // 2
+                stack.append((2 * node + 1, middle, high))
+                stack.append((2 * node, low, middle))
+            return matches
+
+    def _build_tree(self) -> list[datetime]:
+        size = 1
+        while size < len(self._ends):
+            size *= 2
+        tree = [_EMPTY] * (2 * size)
+        tree[size : size + len(self._ends)] = self._ends
+        for node in range(size - 1, 0, -1):
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+        self._size = size
+        return tree
+
+    def stats(self) -> dict[str, object]:
+        return {"loaded": self.loaded, "size": len(self._keys)}
+
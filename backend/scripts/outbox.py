@@ -0,0 +1,85 @@
+"""Inspect and replay the notification outbox.
+
+Usage:
+    uv run python -m scripts.outbox list --status dead
+    uv run python -m scripts.outbox show 42
+    uv run python -m scripts.outbox replay 42 43
+    uv run python -m scripts.outbox replay --all
+    uv run python -m scripts.outbox run-once
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from sqlalchemy import select
+
+from app.database import session_scope
+from app.models.outbox import OUTBOX_DEAD, OUTBOX_PENDING, OUTBOX_SENDING, OUTBOX_SENT, OutboxMessage
+from app.utils.email import notification_pool, outbox_dispatcher
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", help="List outbox messages, newest first")
+    listing.add_argument("--status", choices=(OUTBOX_PENDING, OUTBOX_SENDING, OUTBOX_SENT, OUTBOX_DEAD))
+    listing.add_argument("--limit", type=int, default=50)
+
+    show = commands.add_parser("show", help="Print one message with its payload and last error")
+    show.add_argument("message_id", type=int)
+
+    replay = commands.add_parser("replay", help="Move dead-lettered messages back to pending")
+    replay.add_argument("message_ids", type=int, nargs="*")
+    replay.add_argument("--all", action="store_true", help="Replay every dead-lettered message")
+
+    commands.add_parser("run-once", help="Deliver one batch of due messages in this process")
+    return parser.parse_args()
+
+
+def _summary(message: OutboxMessage) -> str:
+    error = (message.last_error or "").splitlines()[0][:80] if message.last_error else ""
+    return (
+        f"#{message.id:<6} {message.status:<8} {message.kind:<22} attempts={message.attempts} "
+        f"next={message.next_attempt_at:%Y-%m-%d %H:%M:%S}  {error}"
+    )
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.command == "list":
+        with session_scope() as session:
+            statement = select(OutboxMessage).order_by(OutboxMessage.id.desc()).limit(args.limit)
+            if args.status:
+                statement = statement.where(OutboxMessage.status == args.status)
+            for message in session.scalars(statement):
+                print(_summary(message))
+
+    elif args.command == "show":
+        with session_scope() as session:
+            message = session.get(OutboxMessage, args.message_id)
+            if message is None:
+                raise SystemExit(f"Outbox message #{args.message_id} not found")
+            print(_summary(message))
+            print(f"payload: {message.payload}")
+            print(f"created: {message.created_at}  sent: {message.sent_at}")
+            if message.last_error:
+                print(f"last error: {message.last_error}")
+
+    elif args.command == "replay":
+        if not args.message_ids and not args.all:
+            raise SystemExit("Pass message IDs or --all")
+        with session_scope() as session:
+            count = outbox_dispatcher.replay(session, None if args.all else args.message_ids)
+        print(f"{count} message(s) moved back to pending")
+
+    elif args.command == "run-once":
+        claimed = outbox_dispatcher.run_once()
+        notification_pool.join()
+        print(f"{claimed} message(s) processed: {outbox_dispatcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,6 +16,8 @@ if str(PROJECT_ROOT) not in sys.path:
 
 TEST_DB_PATH = PROJECT_ROOT / "tests" / "test.db"
 os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_PATH}"
+# Tests drive the outbox with run_once() instead of a background thread.
+os.environ["OUTBOX_DISPATCHER"] = "false"
 
 from app.config import get_settings
 
@@ -23,6 +25,8 @@ get_settings.cache_clear()
 
 from app import create_app
 from app.database import Base, engine
+from app.routes.reservations import calendar_cache, occupancy_cache
+from app.utils.email import admin_recipient_cache
 
 
 @pytest.fixture(autouse=True)
@@ -30,6 +34,9 @@ def _prepare_database():
     """Recreate the schema for each test for isolation."""
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    for cache in (calendar_cache, occupancy_cache, admin_recipient_cache):
+        cache.clear()
+        cache.reset_stats()
     yield
     Base.metadata.drop_all(bind=engine)
 
@@ -0,0 +1,66 @@
+"""Tests for the precompiled notification email templates."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+from app.models.reservation import ReservationStatus
+from app.schemas.notification import ReservationSnapshot
+from app.utils.email import _status_template, _template_values
+from app.utils.email_templates import SITE_URL, TemplateRegistry, templates
+
+
+def _snapshot(**overrides) -> ReservationSnapshot:
+    values = dict(
+        id=1,
+        status=ReservationStatus.APPROVED.value,
+        purpose="山小屋合宿",
+        description=None,
+        attendee_count=12,
+        start_time=datetime(2030, 1, 1, 1),
+        end_time=datetime(2030, 1, 2, 3),
+        notify_applicant=True,
+        applicant_email="member@example.com",
+        applicant_display_name="山田",
+        approval_message="よろしくお願いします",
+    )
+    values.update(overrides)
+    return ReservationSnapshot(**values)
+
+
+def test_every_registered_template_renders_from_message_values():
+    values = _template_values(_snapshot(), for_admin=True) | {"n": 2, "summary": "要約", "total": 2, "sections": "…"}
+    for name in templates.names():
+        subject, body = templates.render(name, values)
+        assert "{" not in subject + body and "}" not in subject + body
+
+
+def test_status_template_selects_and_renders_one_message():
+    values = _template_values(_snapshot(), for_admin=False)
+
+    subject, body = templates.render(_status_template(ReservationStatus.APPROVED, None), values)
+    assert subject == "【KC Reserve】予約が承認されました: 山小屋合宿"
+    assert body.startswith("\n山田 様\n")
+    assert "日時: 2030/01/01 10:00 - 2030/01/02 12:00\n" in body
+    assert "管理者からのメッセージ: よろしくお願いします\n" in body
+    assert body.endswith(f"{SITE_URL}\n")
+
+    reverted = _status_template(ReservationStatus.APPROVED, ReservationStatus.CANCELLATION_REQUESTED.value)
+    assert reverted == "cancellation_rejected"
+    assert _status_template(ReservationStatus.PENDING, None) is None
+
+
+def test_registry_keeps_literal_braces_and_rejects_format_specs():
+    registry = TemplateRegistry()
+    template = registry.register("t", subject="{a}", body="{{x}} {a} {b} {a}")
+    assert template.fields == frozenset({"a", "b"})
+    assert registry.render("t", {"a": 1, "b": None}) == ("1", "{x} 1 None 1")
+
+    with pytest.raises(KeyError):
+        registry.render("t", {"a": 1})
+    with pytest.raises(ValueError):
+        registry.register("bad", subject="{a:>10}", body="")
+    with pytest.raises(ValueError):
+        registry.register("bad", subject="{a.b}", body="")
@@ -0,0 +1,133 @@
+"""Tests for the server-sent event stream."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.events import EventBroker
+from tests.utils import register_user_and_get_token
+
+
+def _read_event(chunks) -> tuple[str, dict]:
+    for chunk in chunks:
+        text = chunk.decode("utf-8") if isinstance(chunk, bytes) else chunk
+        if text.startswith("event: "):
+            header, data = text.strip().split("\n")
+            return header.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+    raise AssertionError("stream ended without an event")
+
+
+def test_broker_filters_per_viewer_and_bounds_queues():
+    broker = EventBroker(max_subscribers=2, queue_size=2)
+    admin = broker.subscribe(None, True)
+    member = broker.subscribe(7, False)
+    assert broker.subscribe(None, False) is None
+
+    for count in range(3):
+        broker.publish("pending-count", lambda sub, count=count: {"count": count} if sub.is_admin else None)
+
+    assert member.queue.empty()
+    # The admin's queue overflowed, so its backlog collapses into a resync marker.
+    assert admin.queue.get_nowait() == ("resync", {})
+    assert admin.queue.empty()
+    assert broker.stats()["overflows"] == 1
+
+    broker.unsubscribe(member)
+    assert broker.subscribe(None, False) is not None
+
+
+def test_stream_pushes_visible_reservation_changes(client):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-stream@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-stream@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+
+    ticket = client.post(
+        "/api/reservations/stream-ticket", headers={"Authorization": f"Bearer {admin_token}"}
+    ).get_json()["ticket"]
+    admin_stream = client.get("/api/reservations/stream", query_string={"ticket": ticket}, buffered=False)
+    public_stream = client.get("/api/reservations/stream", buffered=False)
+    assert public_stream.headers["Content-Type"].startswith("text/event-stream")
+    admin_chunks = iter(admin_stream.response)
+    public_chunks = iter(public_stream.response)
+    assert _read_event(admin_chunks) == ("pending-count", {"count": 0})
+
+    now = datetime.utcnow()
+    create_resp = client.post(
+        "/api/reservations",
+        headers={"Authorization": f"Bearer {member_token}"},
+        json={
+            "purpose": "合宿",
+            "displayMessage": "合宿",
+            "description": "テスト",
+            "attendeeCount": 3,
+            "startTime": (now + timedelta(days=1)).isoformat(),
+            "endTime": (now + timedelta(days=2)).isoformat(),
+        },
+    )
+    reservation_id = create_resp.get_json()["reservation"]["id"]
+
+    event, data = _read_event(admin_chunks)
+    assert event == "reservation"
+    assert data["event"]["id"] == reservation_id
+    assert data["event"]["purpose"] == "合宿"
+    assert _read_event(admin_chunks) == ("pending-count", {"count": 1})
+
+    client.patch(
+        f"/api/admin/reservations/{reservation_id}/status",
+        headers={"Authorization": f"Bearer {admin_token}"},
+        json={"status": "approved"},
+    )
+    # The pending reservation was never pushed to the public stream; the approval is.
+    event, data = _read_event(public_chunks)
+    assert event == "reservation"
+    assert data["action"] == "upsert"
+    assert data["event"]["id"] == reservation_id
+    assert data["event"]["isOwner"] is False
+
+    admin_stream.close()
+    public_stream.close()
+
+
+def test_stream_tickets_are_short_lived_and_not_access_tokens(client, monkeypatch):
+    token = register_user_and_get_token(client, email="ticket@example.com", password="Secret123!", is_admin=True)
+    headers = {"Authorization": f"Bearer {token}"}
+    ticket = client.post("/api/reservations/stream-ticket", headers=headers).get_json()["ticket"]
+
+    # A ticket cannot stand in for the access token on other endpoints...
+    assert client.get("/api/auth/me", headers={"Authorization": f"Bearer {ticket}"}).status_code == 422
+    # ...an access token is not a ticket, and tickets expire.
+    stream = client.get("/api/reservations/stream", query_string={"ticket": token})
+    assert stream.status_code == 401
+    monkeypatch.setattr("app.routes.reservations.STREAM_TICKET_TTL", -1)
+    assert client.get("/api/reservations/stream", query_string={"ticket": ticket}).status_code == 401
+    assert client.post("/api/reservations/stream-ticket").status_code == 401
+
+
+def test_gunicorn_config_refuses_multiple_workers():
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", Path(__file__).parents[1] / "gunicorn.conf.py")
+    conf = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(conf)
+
+    def server(**cfg):
+        return SimpleNamespace(cfg=SimpleNamespace(**cfg))
+
+    conf.on_starting(server(workers=conf.workers, threads=conf.threads))
+    with pytest.raises(RuntimeError, match="single gunicorn worker"):
+        conf.on_starting(server(workers=2, threads=conf.threads))
+    with pytest.raises(RuntimeError, match="no thread for requests"):
+        conf.on_starting(server(workers=1, threads=conf.SSE_MAX_SUBSCRIBERS))
@@ -0,0 +1,214 @@
+"""Tests for the reservation export endpoint."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.database import session_scope
+from app.models import Reservation, User
+from app.models.reservation import ReservationStatus
+from app.routes.export import export_jobs
+from app.utils.export_jobs import ExportJobStore
+from tests.utils import register_user_and_get_token
+
+
+def _admin_headers(client) -> dict[str, str]:
+    token = register_user_and_get_token(client, email="admin-export@example.com", password="Secret123!", is_admin=True)
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _seed(count: int, *, status: ReservationStatus = ReservationStatus.APPROVED) -> None:
+    now = datetime.utcnow()
+    with session_scope() as session:
+        user = session.query(User).filter(User.email == "admin-export@example.com").one()
+        session.add_all(
+            Reservation(
+                user_id=user.id,
+                status=status,
+                purpose=f"予約 {index}",
+                description="改行を含む\n詳細",
+                start_time=now + timedelta(days=index),
+                end_time=now + timedelta(days=index, hours=2),
+            )
+            for index in range(count)
+        )
+
+
+def _rows(text: str) -> list[list[str]]:
+    assert text.startswith("\ufeff")
+    return list(csv.reader(io.StringIO(text[1:])))
+
+
+def test_export_streams_csv_in_chunks(client, monkeypatch):
+    monkeypatch.setattr("app.routes.export.EXPORT_CHUNK_SIZE", 2)
+    headers = _admin_headers(client)
+    _seed(5)
+
+    response = client.get("/api/admin/reservations/export", headers=headers)
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert "Content-Encoding" not in response.headers
+
+    rows = _rows(response.get_data(as_text=True))
+    assert rows[0][0] == "予約ID"
+    assert [row[5] for row in rows[1:]] == [f"予約 {index}" for index in range(5)]
+    assert rows[1][10] == "改行を含む\n詳細"
+    assert rows[1][3] == "Tester"
+
+
+def test_export_is_gzipped_when_accepted(client):
+    headers = _admin_headers(client)
+    _seed(3)
+    _seed(2, status=ReservationStatus.PENDING)
+
+    plain = client.get("/api/admin/reservations/export?status=pending", headers=headers)
+    compressed = client.get(
+        "/api/admin/reservations/export?status=pending",
+        headers={**headers, "Accept-Encoding": "gzip"},
+    )
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["Vary"]
+    assert gzip.decompress(compressed.get_data()).decode("utf-8") == plain.get_data(as_text=True)
+    assert len(_rows(plain.get_data(as_text=True))) == 3
+
+
+def _wait_for(client, headers, job_id: str) -> dict:
+    for _ in range(200):
+        job = client.get(f"/api/admin/reservations/export-jobs/{job_id}", headers=headers).get_json()["job"]
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("export job did not finish")
+
+
+def test_export_job_runs_in_background_and_is_reused(client, monkeypatch, tmp_path):
+    monkeypatch.setattr(export_jobs, "directory", tmp_path)
+    headers = _admin_headers(client)
+    _seed(3)
+
+    created = client.post("/api/admin/reservations/export-jobs", headers=headers, json={"status": "approved"})
+    assert created.status_code == 202
+    job = _wait_for(client, headers, created.get_json()["job"]["id"])
+    assert job["status"] == "completed"
+
+    download = client.get(job["downloadUrl"], headers=headers)
+    assert download.status_code == 200
+    streamed = client.get("/api/admin/reservations/export?status=approved", headers=headers)
+    assert download.get_data(as_text=True) == streamed.get_data(as_text=True)
+    assert len(_rows(download.get_data(as_text=True))) == 4
+
+    again = client.post("/api/admin/reservations/export-jobs", headers=headers, json={"status": "approved"})
+    assert again.status_code == 200
+    assert again.get_json() == {"job": job, "reused": True}
+    other = client.post("/api/admin/reservations/export-jobs", headers=headers, json={"status": "pending"})
+    assert other.status_code == 202
+    _wait_for(client, headers, other.get_json()["job"]["id"])
+
+
+def test_export_jobs_expire_and_are_cleaned_up(client, monkeypatch, tmp_path):
+    clock = [1000.0]
+    monkeypatch.setattr(export_jobs, "directory", tmp_path)
+    monkeypatch.setattr(export_jobs, "_clock", lambda: clock[0])
+    headers = _admin_headers(client)
+    _seed(1)
+
+    job_id = client.post("/api/admin/reservations/export-jobs", headers=headers, json={}).get_json()["job"]["id"]
+    _wait_for(client, headers, job_id)
+    assert (tmp_path / f"{job_id}.csv").exists()
+
+    clock[0] += export_jobs.ttl
+    assert client.get(f"/api/admin/reservations/export-jobs/{job_id}", headers=headers).status_code == 404
+    assert export_jobs.cleanup() == 1
+    assert list(tmp_path.iterdir()) == []
+    assert client.get("/api/admin/reservations/export-jobs/not-a-job", headers=headers).status_code == 404
+
+
+def test_running_export_jobs_outlive_the_ttl_until_their_heartbeat_stops(tmp_path):
+    clock = [1000.0]
+    owner = ExportJobStore(tmp_path, ttl=10, stale_after=30, max_workers=1, clock=lambda: clock[0])
+    other = ExportJobStore(tmp_path, ttl=10, stale_after=30, max_workers=1, clock=lambda: clock[0])
+    release = threading.Event()
+
+    job, _ = owner.submit("slow", filename="slow.csv", suffix=".csv", write=lambda handle: release.wait(5))
+    clock[0] += 60
+    assert owner.submit("slow", filename="slow.csv", suffix=".csv", write=lambda handle: None) == (job, True)
+    assert owner.cleanup() == 0
+
+    owner.heartbeat()
+    clock[0] += 20
+    assert other.get(job.id) is not None
+    clock[0] += 10
+    assert other.get(job.id) is None
+    _, reused = other.submit("slow", filename="slow.csv", suffix=".csv", write=lambda handle: None)
+    assert not reused
+
+    release.set()
+    for _ in range(200):
+        if owner.get(job.id).status == "completed":
+            break
+        time.sleep(0.01)
+    assert owner.get(job.id).finished_at == clock[0]
+    clock[0] += 10
+    assert owner.get(job.id) is None
+
+
+def test_export_changed_since_returns_rows_after_watermark(client):
+    headers = _admin_headers(client)
+    _seed(3)
+    now = datetime.utcnow()
+    with session_scope() as session:
+        reservations = session.query(Reservation).order_by(Reservation.id).all()
+        for reservation, age in zip(reservations, (timedelta(hours=2), timedelta(minutes=10), timedelta(0))):
+            reservation.updated_at = now - age
+
+    full = client.get("/api/admin/reservations/export", headers=headers)
+    watermark = full.headers["X-Export-Watermark"]
+    assert watermark.endswith("Z")
+    assert len(_rows(full.get_data(as_text=True))) == 4
+
+    since = (now - timedelta(hours=1)).isoformat() + "Z"
+    incremental = client.get(f"/api/admin/reservations/export?changedSince={since}", headers=headers)
+    assert incremental.status_code == 200
+    # The row written "just now" is newer than the watermark and waits for the next run.
+    assert [row[5] for row in _rows(incremental.get_data(as_text=True))[1:]] == ["予約 1"]
+    assert incremental.headers["X-Export-Watermark"] >= watermark
+
+    bad = client.get("/api/admin/reservations/export?changedSince=yesterday", headers=headers)
+    assert bad.status_code == 400
+
+
+def test_export_ndjson_streams_one_object_per_line(client, monkeypatch, tmp_path):
+    monkeypatch.setattr("app.routes.export.EXPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(export_jobs, "directory", tmp_path)
+    headers = _admin_headers(client)
+    _seed(3)
+
+    response = client.get("/api/admin/reservations/export?format=ndjson", headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+    assert 'filename="reservations_' in response.headers["Content-Disposition"]
+    assert response.headers["Content-Disposition"].endswith('.ndjson"')
+
+    lines = response.get_data(as_text=True).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert [record["purpose"] for record in records] == ["予約 0", "予約 1", "予約 2"]
+    assert records[0]["status"] == "approved"
+    assert records[0]["description"] == "改行を含む\n詳細"
+    assert records[0]["user"]["email"] == "admin-export@example.com"
+    assert records[0]["startTime"].endswith("Z")
+
+    job_id = client.post(
+        "/api/admin/reservations/export-jobs", headers=headers, json={"format": "ndjson"}
+    ).get_json()["job"]["id"]
+    job = _wait_for(client, headers, job_id)
+    download = client.get(job["downloadUrl"], headers=headers)
+    assert download.mimetype == "application/x-ndjson"
+    assert download.get_data(as_text=True).splitlines() == lines
+
+    assert client.get("/api/admin/reservations/export?format=xml", headers=headers).status_code == 400
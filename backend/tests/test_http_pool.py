@@ -0,0 +1,93 @@
+"""Tests for the keep-alive webhook client and GAS batching."""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import get_settings
+from app.utils import email
+from app.utils.http_pool import HttpConnectionPool
+
+
+class _ScriptHandler(BaseHTTPRequestHandler):
+    """Mimics Apps Script: POST /exec answers 302, the result is a GET away."""
+
+    protocol_version = "HTTP/1.1"
+    peers: set = set()
+    posts: list = []
+
+    def do_POST(self):
+        self.peers.add(self.client_address)
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.posts.append(payload)
+        results = [{"status": "error" if m["to"].startswith("bad") else "ok"} for m in payload.get("messages", [])]
+        type(self).last_result = {"status": "ok", "results": results} if results else {"status": "ok"}
+        self.send_response(302)
+        self.send_header("Location", "/echo")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.peers.add(self.client_address)
+        body = json.dumps(type(self).last_result).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def script_url():
+    _ScriptHandler.peers = set()
+    _ScriptHandler.posts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ScriptHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/exec"
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_reuse_one_connection_across_redirects(script_url):
+    pool = HttpConnectionPool()
+    for index in range(3):
+        response = pool.request("POST", script_url, body=json.dumps({"to": f"{index}@example.com"}).encode())
+        assert response.status == 200
+        assert json.loads(response.body) == {"status": "ok"}
+        assert response.url.endswith("/echo")
+
+    assert len(_ScriptHandler.peers) == 1
+    assert pool.stats() == {"requests": 6, "connections": 1, "reused": 5, "idle": 1}
+    pool.close()
+
+
+def test_gas_batch_posts_once_and_falls_back_for_failures(script_url, monkeypatch):
+    settings = replace(
+        get_settings(),
+        gas_webhook_url=script_url,
+        gas_webhook_secret="secret",
+        gas_batch_size=10,
+        mail_server=None,
+    )
+    monkeypatch.setattr(email, "get_settings", lambda: settings)
+    monkeypatch.setattr(email, "_gas_http", None)
+
+    email._send_all(["a@example.com", "b@example.com"], "件名", "本文")
+    assert len(_ScriptHandler.posts) == 1
+    assert [m["to"] for m in _ScriptHandler.posts[0]["messages"]] == ["a@example.com", "b@example.com"]
+    assert _ScriptHandler.posts[0]["secret"] == "secret"
+
+    # SMTP is not configured, so a recipient the script rejects cannot be delivered.
+    with pytest.raises(email.NotificationError, match="bad@example.com"):
+        email._send_all(["a@example.com", "bad@example.com"], "件名", "本文")
+    assert len(_ScriptHandler.posts) == 2
+    assert email.gas_stats()["connections"] == 1
@@ -0,0 +1,38 @@
+"""Tests for the in-memory reservation interval index."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+
+from scripts.interval_index import IntervalIndex
+
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(7)
+    base = datetime(2030, 1, 1)
+    intervals = {}
+    for reservation_id in range(1, 400):
+        start = base + timedelta(hours=rng.randint(0, 2000))
+        intervals[reservation_id] = (start, start + timedelta(hours=rng.randint(0, 120)))
+
+    index = IntervalIndex()
+    index.load((reservation_id, start, end) for reservation_id, (start, end) in intervals.items())
+    for reservation_id in rng.sample(sorted(intervals), 50):
+        index.discard(reservation_id)
+        del intervals[reservation_id]
+    for reservation_id in range(400, 450):
+        start = base + timedelta(hours=rng.randint(0, 2000))
+        intervals[reservation_id] = (start, start + timedelta(hours=rng.randint(0, 120)))
+        index.upsert(reservation_id, *intervals[reservation_id])
+
+    for _ in range(200):
+        window_start = base + timedelta(hours=rng.randint(-50, 2100))
+        window_end = window_start + timedelta(hours=rng.randint(0, 300))
+        expected = sorted(
+            reservation_id
+            for reservation_id, (start, end) in intervals.items()
+            if end >= window_start and start <= window_end
+        )
+        assert sorted(index.overlapping(window_start, window_end)) == expected
+
@@ -0,0 +1,238 @@
+"""Tests for the transactional notification outbox."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.database import session_scope
+from app.models import OutboxMessage
+from app.utils.email import outbox_dispatcher
+from app.utils.outbox import CLAIM_LEASE
+from tests.utils import count_queries, register_user_and_get_token
+
+
+@pytest.fixture()
+def sent(monkeypatch):
+    """Deliver synchronously and record every email instead of sending it."""
+    emails: list[tuple[str, str]] = []
+    monkeypatch.setattr(outbox_dispatcher, "_submit", lambda fn, *args: fn(*args))
+    monkeypatch.setattr(
+        "app.utils.email._send_email_sync",
+        lambda to_email, subject, body: emails.append((to_email, subject)) or True,
+    )
+    return emails
+
+
+def _messages() -> list[OutboxMessage]:
+    with session_scope() as session:
+        messages = session.query(OutboxMessage).order_by(OutboxMessage.id).all()
+        session.expunge_all()
+        return messages
+
+
+def _create_reservation(client) -> int:
+    register_user_and_get_token(client, email="admin-outbox@example.com", password="Secret123!", is_admin=True)
+    token = register_user_and_get_token(client, email="member-outbox@example.com", password="Secret123!", is_admin=False)
+    start = datetime.utcnow() + timedelta(days=3)
+    response = client.post(
+        "/api/reservations",
+        headers={"Authorization": f"Bearer {token}"},
+        json={
+            "startTime": start.isoformat() + "Z",
+            "endTime": (start + timedelta(hours=2)).isoformat() + "Z",
+            "purpose": "合宿",
+            "displayMessage": "合宿",
+            "description": "詳細",
+            "notifyApplicant": True,
+        },
+    )
+    assert response.status_code == 201
+    return response.get_json()["reservation"]["id"]
+
+
+def test_reservation_writes_outbox_rows_and_dispatcher_sends_them(client, sent):
+    reservation_id = _create_reservation(client)
+
+    messages = _messages()
+    assert [(m.kind, m.status) for m in messages] == [
+        ("new_reservation", "pending"),
+        ("reservation_received", "pending"),
+    ]
+    snapshot = json.loads(messages[0].payload)["reservation"]
+    assert snapshot["id"] == reservation_id
+    assert snapshot["applicant_email"] == "member-outbox@example.com"
+    assert snapshot["status"] == "pending"
+    assert sent == []
+
+    with count_queries() as statements:
+        assert outbox_dispatcher.run_once() == 2
+    # Everything the emails need travels in the snapshot.
+    assert not [sql for sql in statements if "FROM reservations" in sql]
+    assert [to for to, _ in sent] == ["admin-outbox@example.com", "member-outbox@example.com"]
+    assert [(m.status, m.attempts) for m in _messages()] == [("sent", 1), ("sent", 1)]
+    assert outbox_dispatcher.run_once() == 0
+
+
+def test_failed_sends_back_off_then_dead_letter_and_replay(client, sent, monkeypatch):
+    clock = [datetime(2030, 1, 1)]
+    monkeypatch.setattr(outbox_dispatcher, "_clock", lambda: clock[0])
+    monkeypatch.setattr(outbox_dispatcher, "max_attempts", 3)
+    monkeypatch.setattr("app.utils.email._send_email_sync", lambda to_email, subject, body: False)
+    _create_reservation(client)
+
+    delays = []
+    for _ in range(3):
+        assert outbox_dispatcher.run_once() == 2
+        message = _messages()[0]
+        delays.append(message.next_attempt_at - clock[0])
+        clock[0] = message.next_attempt_at
+    base = outbox_dispatcher.retry_base
+    assert delays[:2] == [base, base * 2]
+    assert [(m.status, m.attempts) for m in _messages()] == [("dead", 3), ("dead", 3)]
+    assert "admin-outbox@example.com" in _messages()[0].last_error
+    assert outbox_dispatcher.run_once() == 0
+
+    with session_scope() as session:
+        assert outbox_dispatcher.replay(session, [_messages()[0].id]) == 1
+    replayed = _messages()[0]
+    assert (replayed.status, replayed.attempts, replayed.last_error) == ("pending", 0, None)
+
+    with session_scope() as session:
+        outbox_dispatcher.enqueue(session, "unknown_kind")
+    clock[0] += timedelta(seconds=1)
+    assert outbox_dispatcher.run_once() == 2
+    assert "No outbox handler" in _messages()[-1].last_error
+
+
+def test_expired_claim_is_picked_up_again(client, sent, monkeypatch):
+    clock = [datetime(2030, 1, 1)]
+    monkeypatch.setattr(outbox_dispatcher, "_clock", lambda: clock[0])
+    _create_reservation(client)
+    # A dispatcher that claims but never reports back, as if the process died.
+    monkeypatch.setattr(outbox_dispatcher, "_submit", lambda fn, *args: None)
+    assert outbox_dispatcher.run_once() == 2
+    assert {m.status for m in _messages()} == {"sending"}
+    assert outbox_dispatcher.run_once() == 0
+
+    clock[0] += CLAIM_LEASE
+    monkeypatch.setattr(outbox_dispatcher, "_submit", lambda fn, *args: fn(*args))
+    assert outbox_dispatcher.run_once() == 2
+    assert [(m.status, m.attempts) for m in _messages()] == [("sent", 2), ("sent", 2)]
+    assert len(sent) == 2
+
+
+
+def test_admin_recipients_are_cached_until_preferences_change(client, sent):
+    register_user_and_get_token(client, email="admin-outbox@example.com", password="Secret123!", is_admin=True)
+    second = register_user_and_get_token(client, email="admin-two@example.com", password="Secret123!", is_admin=True)
+    token = register_user_and_get_token(client, email="member-outbox@example.com", password="Secret123!", is_admin=False)
+    start = datetime.utcnow() + timedelta(days=3)
+    payload = {
+        "startTime": start.isoformat() + "Z",
+        "endTime": (start + timedelta(hours=2)).isoformat() + "Z",
+        "purpose": "合宿",
+        "displayMessage": "合宿",
+        "description": "詳細",
+        "notifyApplicant": False,
+    }
+
+    def deliver() -> tuple[list[str], int]:
+        client.post("/api/reservations", headers={"Authorization": f"Bearer {token}"}, json=payload)
+        sent.clear()
+        with count_queries() as statements:
+            outbox_dispatcher.run_once()
+        recipient_queries = [sql for sql in statements if "WHERE users.is_admin" in sql]
+        return [to for to, _ in sent], len(recipient_queries)
+
+    both = ["admin-outbox@example.com", "admin-two@example.com"]
+    assert deliver() == (both, 1)
+    assert deliver() == (both, 0)
+
+    response = client.put(
+        "/api/auth/me",
+        headers={"Authorization": f"Bearer {second}"},
+        json={"receives_notification": False},
+    )
+    assert response.status_code == 200
+    assert deliver() == (["admin-outbox@example.com"], 1)
+
+
+def test_rows_enqueued_with_only_an_id_still_deliver(client, sent):
+    reservation_id = _create_reservation(client)
+    outbox_dispatcher.run_once()
+    sent.clear()
+    with session_scope() as session:
+        outbox_dispatcher.enqueue(session, "reservation_received", reservation_id=reservation_id)
+        outbox_dispatcher.enqueue(session, "reservation_received", reservation_id=reservation_id + 100)
+
+    assert outbox_dispatcher.run_once() == 2
+    assert sent == [("member-outbox@example.com", "【KC Reserve】予約申請を受け付けました: 合宿")]
+    assert {m.status for m in _messages()} == {"sent"}
+
+
+def test_digest_coalesces_admin_events_until_window_or_cap(client, sent, monkeypatch):
+    clock = [datetime(2030, 1, 1)]
+    monkeypatch.setattr(outbox_dispatcher, "_clock", lambda: clock[0])
+    monkeypatch.setattr(outbox_dispatcher, "digest_window", timedelta(seconds=60))
+    monkeypatch.setattr(outbox_dispatcher, "digest_max", 3)
+    register_user_and_get_token(client, email="admin-outbox@example.com", password="Secret123!", is_admin=True)
+    token = register_user_and_get_token(client, email="member-outbox@example.com", password="Secret123!", is_admin=False)
+    start = datetime.utcnow() + timedelta(days=3)
+
+    def submit(purpose: str, notify_applicant: bool = False) -> None:
+        response = client.post(
+            "/api/reservations",
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "startTime": start.isoformat() + "Z",
+                "endTime": (start + timedelta(hours=2)).isoformat() + "Z",
+                "purpose": purpose,
+                "displayMessage": purpose,
+                "description": "詳細",
+                "notifyApplicant": notify_applicant,
+            },
+        )
+        assert response.status_code == 201
+
+    submit("合宿A", notify_applicant=True)
+    submit("合宿B")
+    # Applicant mail is not held; the admin events wait for the window.
+    assert outbox_dispatcher.run_once() == 1
+    assert sent == [("member-outbox@example.com", "【KC Reserve】予約申請を受け付けました: 合宿A")]
+
+    sent.clear()
+    clock[0] += timedelta(seconds=60)
+    assert outbox_dispatcher.run_once() == 2
+    assert sent == [("admin-outbox@example.com", "【KC Reserve】新規予約申請 2件")]
+
+    sent.clear()
+    for purpose in ("合宿C", "合宿D", "合宿E"):
+        submit(purpose)
+    assert outbox_dispatcher.run_once() == 3
+    assert sent == [("admin-outbox@example.com", "【KC Reserve】新規予約申請 3件")]
+    assert {m.status for m in _messages()} == {"sent"}
+    assert outbox_dispatcher.stats()["digests"] >= 2
+
+
+def test_digest_does_not_pull_backed_off_messages_forward(client, sent, monkeypatch):
+    clock = [datetime(2030, 1, 1)]
+    monkeypatch.setattr(outbox_dispatcher, "_clock", lambda: clock[0])
+    monkeypatch.setattr(outbox_dispatcher, "digest_window", timedelta(seconds=60))
+    register_user_and_get_token(client, email="admin-outbox@example.com", password="Secret123!", is_admin=True)
+    with session_scope() as session:
+        backed_off = outbox_dispatcher.enqueue(session, "new_reservation", reservation_id=1)
+        session.flush()
+        # A digest send that already failed once and is waiting out its backoff.
+        backed_off.attempts = 1
+        backed_off.last_error = "NotificationError: Failed to send to admin-outbox@example.com"
+        backed_off.next_attempt_at = clock[0] + timedelta(minutes=10)
+        retry_at = backed_off.next_attempt_at
+    with session_scope() as session:
+        outbox_dispatcher.enqueue(session, "cancellation_request", reservation_id=2)
+
+    clock[0] += timedelta(seconds=60)
+    assert [message_id for message_id, *_ in outbox_dispatcher._claim()] == [_messages()[1].id]
+    assert (_messages()[0].status, _messages()[0].next_attempt_at) == ("pending", retry_at)
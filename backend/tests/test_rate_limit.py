@@ -0,0 +1,181 @@
+"""Tests for the outbound mail token-bucket limiter."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.config import get_settings
+from app.database import session_scope
+from app.models import OutboxMessage
+from app.utils import email
+from app.utils.rate_limit import RateLimited, RateLimiter
+from tests.test_outbox import _create_reservation, _messages
+from tests.utils import register_user_and_get_token
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+
+
+def test_bursts_queue_in_order_until_the_wait_exceeds_the_limit():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        name="smtp", per_minute=60, burst=2, daily=100, max_wait=3, clock=clock, sleep=clock.sleep
+    )
+
+    # Two sends fit the burst; the next ones reserve the following seconds.
+    assert [limiter.acquire() for _ in range(5)] == [0, 0, 1, 2, 3]
+    with pytest.raises(RateLimited) as excinfo:
+        limiter.acquire()
+    assert excinfo.value.retry_after == 4
+    assert limiter.stats()["backlogSeconds"] == 3
+
+    clock.now = 10
+    assert limiter.acquire(2) == 0
+    assert limiter.stats() == {
+        "perMinute": 60,
+        "burst": 2,
+        "daily": 100,
+        "available": 0,
+        "dailyRemaining": 93,
+        "waiting": 0,
+        "backlogSeconds": 0,
+        "acquired": 7,
+        "delayed": 3,
+        "deferred": 1,
+        "waitedSeconds": 6,
+    }
+    assert clock.sleeps == [1, 2, 3]
+
+
+def test_daily_quota_refills_evenly():
+    clock = FakeClock()
+    limiter = RateLimiter(
+        name="gas", per_minute=60, burst=10, daily=2, max_wait=30, clock=clock, sleep=clock.sleep
+    )
+    limiter.acquire(2)
+    with pytest.raises(RateLimited) as excinfo:
+        limiter.acquire()
+    assert excinfo.value.retry_after == pytest.approx(12 * 60 * 60)
+
+    clock.now = 12 * 60 * 60
+    assert limiter.acquire() == 0
+
+
+class FakeTransport:
+    def __init__(self):
+        self.sent: list[str] = []
+
+    def send(self, message):
+        self.sent.append(message["To"])
+
+
+@pytest.fixture()
+def smtp_only(monkeypatch):
+    """Route mail through a recording SMTP transport with fresh limiters."""
+
+    def configure(**overrides):
+        settings = replace(
+            get_settings(),
+            mail_server="smtp.example.com",
+            mail_username="mailer@example.com",
+            mail_password="secret",
+            gas_webhook_url=None,
+            mail_rate_limit=True,
+            **overrides,
+        )
+        transport = FakeTransport()
+        monkeypatch.setattr(email, "get_settings", lambda: settings)
+        monkeypatch.setattr(email, "_smtp_transport", lambda _settings: transport)
+        monkeypatch.setattr(email, "_rate_limiters", {})
+        monkeypatch.setattr(email.outbox_dispatcher, "_submit", lambda fn, *args: fn(*args))
+        return transport
+
+    return configure
+
+
+def test_exhausted_quota_defers_outbox_messages_without_using_attempts(client, smtp_only):
+    transport = smtp_only(mail_send_daily=1)
+    _create_reservation(client)
+
+    before = email.outbox_dispatcher.stats()["deferred"]
+    assert email.outbox_dispatcher.run_once() == 2
+    assert transport.sent == ["admin-outbox@example.com"]
+
+    with session_scope() as session:
+        admin, applicant = session.query(OutboxMessage).order_by(OutboxMessage.id).all()
+        assert (admin.status, admin.attempts) == ("sent", 1)
+        assert (applicant.status, applicant.attempts) == ("pending", 0)
+        assert applicant.last_error.startswith("Deferred: smtp send rate exceeded")
+        assert applicant.next_attempt_at > datetime.utcnow() + timedelta(hours=23)
+
+    assert email.outbox_dispatcher.stats()["deferred"] == before + 1
+    assert email.rate_limit_stats()["smtp"]["deferred"] == 1
+    assert email.rate_limit_stats()["smtp"]["dailyRemaining"] == 0
+
+
+def test_event_is_deferred_before_any_recipient_when_quota_cannot_cover_it(client, smtp_only):
+    transport = smtp_only(mail_send_daily=2)
+    register_user_and_get_token(client, email="admin-second@example.com", password="Secret123!", is_admin=True)
+    _create_reservation(client)
+    with session_scope() as session:
+        session.query(OutboxMessage).filter(OutboxMessage.kind == "reservation_received").delete()
+    assert email._send_email_sync("warmup@example.com", "件名", "本文")  # leaves one send for today
+
+    assert email.outbox_dispatcher.run_once() == 1
+    # Neither admin got a copy that the deferred retry would later repeat.
+    assert transport.sent == ["warmup@example.com"]
+    assert [(m.status, m.attempts) for m in _messages()] == [("pending", 0)]
+    assert email.rate_limit_stats()["smtp"]["dailyRemaining"] == 1
+
+
+
+def _admin_event(client, admins: int) -> None:
+    """Queue one new-reservation event addressed to ``admins`` admins."""
+    for index in range(admins - 1):
+        register_user_and_get_token(client, email=f"admin-{index}@example.com", password="Secret123!", is_admin=True)
+    _create_reservation(client)
+    with session_scope() as session:
+        session.query(OutboxMessage).filter(OutboxMessage.kind == "reservation_received").delete()
+
+
+def test_event_larger_than_the_burst_is_sent_in_paced_chunks(client, smtp_only):
+    transport = smtp_only()
+    clock = FakeClock()
+    clock.sleep = lambda seconds: setattr(clock, "now", clock.now + seconds)
+    # Four sends exceed burst + rate * max_wait, so no single reservation could cover them.
+    email._rate_limiters["smtp"] = RateLimiter(
+        name="smtp", per_minute=60, burst=2, daily=100, max_wait=1, clock=clock, sleep=clock.sleep
+    )
+    _admin_event(client, 4)
+
+    assert email.outbox_dispatcher.run_once() == 1
+    assert len(transport.sent) == 4
+    assert [(m.status, m.attempts) for m in _messages()] == [("sent", 1)]
+    assert clock.now == 2
+
+
+def test_rate_limit_after_the_first_sends_uses_an_attempt(client, smtp_only):
+    transport = smtp_only()
+    clock = FakeClock()  # sleeps do not advance time, so the backlog keeps growing
+    email._rate_limiters["smtp"] = RateLimiter(
+        name="smtp", per_minute=60, burst=2, daily=100, max_wait=1, clock=clock, sleep=clock.sleep
+    )
+    _admin_event(client, 4)
+
+    assert email.outbox_dispatcher.run_once() == 1
+    assert len(transport.sent) == 3
+    [message] = _messages()
+    assert (message.status, message.attempts) == ("pending", 1)
+    assert "partway through the event" in message.last_error
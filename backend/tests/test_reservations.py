@@ -4,7 +4,12 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta
 
-from tests.utils import register_user_and_get_token, seed_whitelist
+from app.database import session_scope
+from app.models import Reservation, ReservationCounter, User, WhitelistEntry
+from app.models.reservation import ReservationStatus, ReservationVisibility
+from app.routes.reservations import _decode_watermark, _pending_count, calendar_cache
+from app.schemas import serialize_reservation
+from tests.utils import count_queries, register_user_and_get_token, seed_whitelist
 
 
 def _reservation_payload(**overrides):
@@ -52,8 +57,8 @@ def test_user_can_create_and_view_their_reservation(client):
 def test_create_reservation_sends_received_notification_when_enabled(client, monkeypatch):
     received_notifications = []
 
-    def fake_send(reservation_id):
-        received_notifications.append(reservation_id)
+    def fake_send(snapshot, **kwargs):
+        received_notifications.append(snapshot.id)
 
     monkeypatch.setattr(
         "app.routes.reservations.send_reservation_received_notification",
@@ -81,8 +86,8 @@ def test_create_reservation_sends_received_notification_when_enabled(client, mon
 def test_create_reservation_skips_received_notification_when_disabled(client, monkeypatch):
     received_notifications = []
 
-    def fake_send(reservation_id):
-        received_notifications.append(reservation_id)
+    def fake_send(snapshot, **kwargs):
+        received_notifications.append(snapshot.id)
 
     monkeypatch.setattr(
         "app.routes.reservations.send_reservation_received_notification",
@@ -155,8 +160,8 @@ def test_admin_can_approve_and_public_list_shows_it(client):
 def test_admin_status_update_notifies_applicant_when_enabled(client, monkeypatch):
     sent_notifications = []
 
-    def fake_send(reservation_id, previous_status=None):
-        sent_notifications.append((reservation_id, previous_status))
+    def fake_send(snapshot, previous_status=None, **kwargs):
+        sent_notifications.append((snapshot.id, previous_status))
 
     monkeypatch.setattr(
         "app.routes.reservations.send_reservation_status_notification",
@@ -196,7 +201,7 @@ def test_admin_status_update_notifies_applicant_when_enabled(client, monkeypatch
 def test_admin_export_csv_includes_status_updated_by(client, monkeypatch):
     monkeypatch.setattr(
         "app.routes.reservations.send_reservation_status_notification",
-        lambda reservation_id, previous_status=None: None,
+        lambda snapshot, previous_status=None, **kwargs: None,
     )
 
     admin_token = register_user_and_get_token(
@@ -236,8 +241,8 @@ def test_admin_export_csv_includes_status_updated_by(client, monkeypatch):
 def test_admin_status_update_skips_applicant_notification_when_disabled(client, monkeypatch):
     sent_notifications = []
 
-    def fake_send(reservation_id, previous_status=None):
-        sent_notifications.append((reservation_id, previous_status))
+    def fake_send(snapshot, previous_status=None, **kwargs):
+        sent_notifications.append((snapshot.id, previous_status))
 
     monkeypatch.setattr(
         "app.routes.reservations.send_reservation_status_notification",
@@ -403,3 +408,617 @@ def test_calendar_endpoint_masks_titles_for_anonymous(client):
     assert admin_events[anon_id]["purpose"] == "秘密のイベント"
     assert "displayMessage" not in admin_events[anon_id]
     assert admin_events[anon_id]["statusUpdatedByDisplayName"] == "Tester"
+
+
+def _seed_reservations(owner_email: str, count: int) -> None:
+    """Insert approved reservations, each with its own applicant and approver."""
+    now = datetime.utcnow()
+    with session_scope() as session:
+        owner = session.query(User).filter(User.email == owner_email).one()
+        offset = session.query(User).count()
+        for index in range(count):
+            applicant = User(email=f"applicant{offset + index}@example.com", hashed_password="x")
+            approver = User(email=f"approver{offset + index}@example.com", hashed_password="x", is_admin=True)
+            session.add(WhitelistEntry(email=applicant.email, display_name=f"Applicant {index}"))
+            session.add_all([applicant, approver])
+            session.flush()
+            for user_id in (owner.id, applicant.id):
+                session.add(
+                    Reservation(
+                        user_id=user_id,
+                        status_updated_by_user_id=approver.id,
+                        status=ReservationStatus.APPROVED,
+                        visibility=ReservationVisibility.PUBLIC,
+                        purpose=f"予約 {index}",
+                        display_message="登山チーム",
+                        description="テスト予約",
+                        attendee_count=2,
+                        start_time=now + timedelta(days=index),
+                        end_time=now + timedelta(days=index, hours=3),
+                    )
+                )
+    # Seeding bypasses the API write paths, so invalidate the calendar cache here.
+    calendar_cache.clear()
+
+
+def test_read_endpoints_issue_constant_number_of_queries(client):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-queries@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-queries@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+    requests = [
+        ("/api/reservations/calendar", None),
+        ("/api/reservations/calendar", admin_headers),
+        ("/api/reservations", admin_headers),
+        ("/api/reservations", member_headers),
+        ("/api/reservations/mine", member_headers),
+    ]
+
+    def query_counts() -> list[int]:
+        counts = []
+        for url, headers in requests:
+            with count_queries() as statements:
+                response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            counts.append(len(statements))
+        return counts
+
+    _seed_reservations("member-queries@example.com", 2)
+    small = query_counts()
+    _seed_reservations("member-queries@example.com", 20)
+    large = query_counts()
+
+    assert small == large
+
+
+def test_calendar_cache_hits_and_invalidates_on_write(client):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-cache@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-cache@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    assert client.get("/api/reservations/calendar").get_json()["events"] == []
+    with count_queries() as statements:
+        assert client.get("/api/reservations/calendar").get_json()["events"] == []
+    assert statements == []
+
+    create_resp = client.post(
+        "/api/reservations",
+        headers={"Authorization": f"Bearer {member_token}"},
+        json=_reservation_payload(),
+    )
+    reservation_id = create_resp.get_json()["reservation"]["id"]
+    client.patch(
+        f"/api/admin/reservations/{reservation_id}/status",
+        headers=admin_headers,
+        json={"status": "approved"},
+    )
+
+    events = client.get("/api/reservations/calendar").get_json()["events"]
+    assert [event["id"] for event in events] == [reservation_id]
+
+    stats = client.get("/api/admin/metrics", headers=admin_headers).get_json()["calendarCache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["invalidations"] == 2
+
+
+def test_read_endpoints_answer_conditional_requests(client):
+    member_token = register_user_and_get_token(
+        client,
+        email="member-etag@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    headers = {"Authorization": f"Bearer {member_token}"}
+    client.post("/api/reservations", headers=headers, json=_reservation_payload())
+
+    for url in ("/api/reservations", "/api/reservations/mine", "/api/reservations/calendar"):
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+
+        calendar_cache.clear()
+        with count_queries() as statements:
+            revalidated = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert revalidated.status_code == 304
+        assert revalidated.headers["ETag"] == etag
+        assert len(statements) == 1  # only the version aggregate
+
+    mine_etag = client.get("/api/reservations/mine", headers=headers).headers["ETag"]
+    client.post("/api/reservations", headers=headers, json=_reservation_payload())
+    changed = client.get("/api/reservations/mine", headers={**headers, "If-None-Match": mine_etag})
+    assert changed.status_code == 200
+    assert len(changed.get_json()["reservations"]) == 2
+
+
+def test_whitelist_edits_invalidate_reservation_etags(client):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-etag-whitelist@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-etag-whitelist@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    headers = {"Authorization": f"Bearer {member_token}"}
+    reservation_id = client.post("/api/reservations", headers=headers, json=_reservation_payload()).get_json()[
+        "reservation"
+    ]["id"]
+    client.patch(f"/api/admin/reservations/{reservation_id}/status", headers=admin_headers, json={"status": "approved"})
+    with session_scope() as session:
+        member = session.query(User).filter(User.email == "member-etag-whitelist@example.com").one()
+        member.display_name = None  # shown through the whitelist name instead
+        entry_id = session.query(WhitelistEntry.id).filter(WhitelistEntry.email == member.email).scalar()
+
+    urls = ("/api/reservations/mine", "/api/reservations")
+    etags = {url: client.get(url, headers=headers).headers["ETag"] for url in urls}
+
+    renamed = client.put(f"/api/admin/whitelist/{entry_id}", headers=admin_headers, json={"display_name": "山田"})
+    assert renamed.status_code == 200
+    for url, etag in etags.items():
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.get_json()["reservations"][0]["user"]["displayName"] == "山田"
+        etags[url] = response.headers["ETag"]
+
+    assert client.delete(f"/api/admin/whitelist/{entry_id}", headers=admin_headers).status_code == 204
+    for url, etag in etags.items():
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.get_json()["reservations"][0]["user"]["displayName"] is None
+
+
+def test_list_endpoints_support_keyset_pagination(client):
+    member_token = register_user_and_get_token(
+        client,
+        email="member-pages@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    _seed_reservations("member-pages@example.com", 5)
+    headers = {"Authorization": f"Bearer {member_token}"}
+
+    def walk(url: str) -> list[int]:
+        seen: list[int] = []
+        cursor = None
+        while True:
+            query = {"limit": 2}
+            if cursor:
+                query["cursor"] = cursor
+            body = client.get(url, headers=headers, query_string=query).get_json()
+            assert len(body["reservations"]) <= 2
+            seen.extend(item["id"] for item in body["reservations"])
+            cursor = body["nextCursor"]
+            if cursor is None:
+                return seen
+
+    full_list = [item["id"] for item in client.get("/api/reservations", headers=headers).get_json()["reservations"]]
+    assert len(full_list) == 10
+    assert walk("/api/reservations") == full_list
+
+    full_mine = [item["id"] for item in client.get("/api/reservations/mine", headers=headers).get_json()["reservations"]]
+    assert len(full_mine) == 5
+    assert walk("/api/reservations/mine") == full_mine
+
+    bad = client.get("/api/reservations", query_string={"cursor": "not-a-cursor"})
+    assert bad.status_code == 400
+
+
+def test_changes_endpoint_returns_deltas_since_cursor(client, monkeypatch):
+    monkeypatch.setattr("app.routes.reservations.CHANGES_WATERMARK_LAG", timedelta(0))
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-delta@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-delta@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+
+    cursor = client.get("/api/reservations/changes").get_json()["cursor"]
+
+    reservation_id = client.post("/api/reservations", headers=member_headers, json=_reservation_payload()).get_json()[
+        "reservation"
+    ]["id"]
+
+    # Pending reservations are hidden from the public but visible to their owner.
+    public_delta = client.get("/api/reservations/changes", query_string={"since": cursor}).get_json()
+    assert public_delta["changes"] == []
+    owner_delta = client.get(
+        "/api/reservations/changes", headers=member_headers, query_string={"since": cursor}
+    ).get_json()
+    assert [event["id"] for event in owner_delta["changes"]] == [reservation_id]
+    assert owner_delta["changes"][0]["isOwner"] is True
+
+    client.patch(
+        f"/api/admin/reservations/{reservation_id}/status",
+        headers=admin_headers,
+        json={"status": "approved"},
+    )
+    public_delta = client.get("/api/reservations/changes", query_string={"since": cursor}).get_json()
+    assert [event["id"] for event in public_delta["changes"]] == [reservation_id]
+    cursor = public_delta["cursor"]
+
+    quiet = client.get("/api/reservations/changes", query_string={"since": cursor}).get_json()
+    assert quiet["changes"] == [] and quiet["removed"] == []
+    assert _decode_watermark(quiet["cursor"]) >= _decode_watermark(cursor)
+
+    client.delete(f"/api/admin/reservations/{reservation_id}", headers=admin_headers)
+    deleted = client.get("/api/reservations/changes", query_string={"since": cursor}).get_json()
+    assert deleted["changes"] == []
+    assert deleted["removed"] == [reservation_id]
+    assert deleted["cursor"] != cursor
+
+    assert client.get("/api/reservations/changes", query_string={"since": "???"}).status_code == 400
+
+
+def test_changes_cursor_trails_writes_that_may_still_be_committing(client, monkeypatch):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-lag@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    cursor = client.get("/api/reservations/changes").get_json()["cursor"]
+
+    reservation_id = client.post("/api/reservations", headers=admin_headers, json=_reservation_payload()).get_json()[
+        "reservation"
+    ]["id"]
+    client.patch(
+        f"/api/admin/reservations/{reservation_id}/status",
+        headers=admin_headers,
+        json={"status": "approved"},
+    )
+    with session_scope() as session:
+        updated_at = session.get(Reservation, reservation_id).updated_at
+
+    # A write this recent may belong to a transaction that is still committing
+    # rows with earlier stamps; the cursor must not move past it yet.
+    recent = client.get("/api/reservations/changes", query_string={"since": cursor}).get_json()
+    assert recent["changes"] == []
+    assert _decode_watermark(recent["cursor"]) < updated_at
+
+    monkeypatch.setattr("app.routes.reservations.CHANGES_WATERMARK_LAG", timedelta(0))
+    settled = client.get("/api/reservations/changes", query_string={"since": recent["cursor"]}).get_json()
+    assert [event["id"] for event in settled["changes"]] == [reservation_id]
+
+
+def test_changes_only_remove_reservations_the_viewer_could_see(client, monkeypatch):
+    monkeypatch.setattr("app.routes.reservations.CHANGES_WATERMARK_LAG", timedelta(0))
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-removed@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-removed@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    other_token = register_user_and_get_token(
+        client,
+        email="other-removed@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+    other_headers = {"Authorization": f"Bearer {other_token}"}
+    cursor = client.get("/api/reservations/changes").get_json()["cursor"]
+
+    def create() -> int:
+        return client.post("/api/reservations", headers=member_headers, json=_reservation_payload()).get_json()[
+            "reservation"
+        ]["id"]
+
+    def set_status(reservation_id: int, status: str) -> None:
+        client.patch(
+            f"/api/admin/reservations/{reservation_id}/status", headers=admin_headers, json={"status": status}
+        )
+
+    def delta(headers=None) -> dict:
+        return client.get("/api/reservations/changes", headers=headers, query_string={"since": cursor}).get_json()
+
+    # A pending request rejected before anyone else could see it leaves no trace.
+    rejected = create()
+    set_status(rejected, "rejected")
+    assert delta()["removed"] == []
+    assert delta(other_headers)["removed"] == []
+
+    withdrawn = create()
+    set_status(withdrawn, "approved")
+    set_status(withdrawn, "cancelled")
+    assert delta()["removed"] == [withdrawn]
+    assert delta(other_headers)["removed"] == [withdrawn]
+    owner_delta = delta(member_headers)
+    assert owner_delta["removed"] == []
+    assert {event["id"] for event in owner_delta["changes"]} == {rejected, withdrawn}
+    assert delta(admin_headers)["removed"] == []
+
+
+def test_deleting_a_pending_reservation_leaves_no_public_tombstone(client, monkeypatch):
+    monkeypatch.setattr("app.routes.reservations.CHANGES_WATERMARK_LAG", timedelta(0))
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-delete-pending@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-delete-pending@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+    cursor = client.get("/api/reservations/changes").get_json()["cursor"]
+
+    ids = [
+        client.post("/api/reservations", headers=member_headers, json=_reservation_payload()).get_json()[
+            "reservation"
+        ]["id"]
+        for _ in range(2)
+    ]
+    client.patch(f"/api/admin/reservations/{ids[1]}/status", headers=admin_headers, json={"status": "approved"})
+    for reservation_id in ids:
+        assert client.delete(f"/api/admin/reservations/{reservation_id}", headers=admin_headers).status_code == 204
+
+    # Only the approved reservation was ever on the public calendar.
+    removed = client.get("/api/reservations/changes", query_string={"since": cursor}).get_json()["removed"]
+    assert removed == [ids[1]]
+
+
+def test_occupancy_endpoint_aggregates_approved_reservations(client):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-occupancy@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-occupancy@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+
+    # JST 2030-05-01 09:00 == 2030-05-01T00:00Z
+    stays = [
+        ("2030-05-01T00:00:00Z", "2030-05-02T00:00:00Z", 4),  # 5/1 09:00 - 5/2 09:00 JST
+        ("2030-05-01T03:00:00Z", "2030-05-01T05:00:00Z", 2),  # overlaps the first on 5/1
+        ("2030-05-02T00:00:00Z", "2030-05-02T02:00:00Z", 3),  # starts as the first ends
+    ]
+    for start, end, attendees in stays:
+        reservation_id = client.post(
+            "/api/reservations",
+            headers=member_headers,
+            json=_reservation_payload(startTime=start, endTime=end, attendeeCount=attendees),
+        ).get_json()["reservation"]["id"]
+        client.patch(
+            f"/api/admin/reservations/{reservation_id}/status",
+            headers=admin_headers,
+            json={"status": "approved"},
+        )
+    client.post(
+        "/api/reservations",
+        headers=member_headers,
+        json=_reservation_payload(startTime="2030-05-01T00:00:00Z", endTime="2030-05-01T01:00:00Z"),
+    )  # pending, ignored
+
+    query = {"start": "2030-04-30T15:00:00Z", "end": "2030-05-03T14:59:00Z", "bucket": "day"}
+    body = client.get("/api/reservations/occupancy", query_string=query).get_json()
+    by_date = {item["date"]: item for item in body["buckets"]}
+    assert list(by_date) == ["2030-05-01", "2030-05-02", "2030-05-03"]
+    assert by_date["2030-05-01"] == {
+        **by_date["2030-05-01"],
+        "reservationCount": 2,
+        "attendeeTotal": 6,
+        "peakConcurrent": 2,
+        "peakAttendees": 6,
+    }
+    assert by_date["2030-05-02"]["reservationCount"] == 2
+    assert by_date["2030-05-02"]["peakConcurrent"] == 1
+    assert by_date["2030-05-03"]["reservationCount"] == 0
+
+    with count_queries() as statements:
+        cached = client.get("/api/reservations/occupancy", query_string=query).get_json()
+    assert cached == body
+    assert statements == []
+
+    weekly = client.get("/api/reservations/occupancy", query_string={**query, "bucket": "week"}).get_json()
+    assert weekly["buckets"][0]["date"] == "2030-04-29"
+    assert weekly["buckets"][0]["attendeeTotal"] == 9
+    assert weekly["buckets"][0]["peakConcurrent"] == 2
+
+
+def test_occupancy_hides_attendees_of_anonymous_reservations_from_non_admins(client):
+    admin_token = register_user_and_get_token(
+        client,
+        email="admin-occupancy-anon@example.com",
+        password="Secret123!",
+        is_admin=True,
+    )
+    member_token = register_user_and_get_token(
+        client,
+        email="member-occupancy-anon@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    member_headers = {"Authorization": f"Bearer {member_token}"}
+    for visibility, attendees in (("public", 3), ("anonymous", 5)):
+        reservation_id = client.post(
+            "/api/reservations",
+            headers=member_headers,
+            json=_reservation_payload(
+                startTime="2030-05-01T00:00:00Z",
+                endTime="2030-05-01T05:00:00Z",
+                attendeeCount=attendees,
+                visibility=visibility,
+            ),
+        ).get_json()["reservation"]["id"]
+        client.patch(
+            f"/api/admin/reservations/{reservation_id}/status",
+            headers=admin_headers,
+            json={"status": "approved"},
+        )
+
+    query = {"start": "2030-04-30T15:00:00Z", "end": "2030-04-30T15:00:00Z", "bucket": "day"}
+
+    def first_bucket(headers=None) -> dict:
+        bucket = client.get("/api/reservations/occupancy", headers=headers, query_string=query).get_json()["buckets"][0]
+        return {key: bucket[key] for key in ("reservationCount", "attendeeTotal", "peakConcurrent", "peakAttendees")}
+
+    hidden = {"reservationCount": 2, "attendeeTotal": 3, "peakConcurrent": 2, "peakAttendees": 3}
+    assert first_bucket() == hidden
+    assert first_bucket(member_headers) == hidden
+    assert first_bucket(admin_headers) == {
+        "reservationCount": 2,
+        "attendeeTotal": 8,
+        "peakConcurrent": 2,
+        "peakAttendees": 8,
+    }
+    assert first_bucket() == hidden  # the admin view is cached separately
+
+
+def test_serializer_output_matches_for_loaded_and_expired_instances(client):
+    register_user_and_get_token(client, email="owner@example.com", password="Password123!", is_admin=False)
+    _seed_reservations("owner@example.com", 2)
+
+    with session_scope() as session:
+        for reservation in session.query(Reservation).all():
+            loaded = [serialize_reservation(reservation, include_private=flag) for flag in (False, True)]
+            session.expire(reservation)
+            expired = [serialize_reservation(reservation, include_private=flag) for flag in (False, True)]
+            assert loaded == expired
+            assert loaded[0]["description"] is None
+            assert loaded[1]["statusUpdatedBy"]["email"].startswith("approver")
+
+
+def test_row_projections_match_orm_serialization(client):
+    admin_token = register_user_and_get_token(client, email="admin-rows@example.com", password="Secret123!", is_admin=True)
+    register_user_and_get_token(client, email="owner-rows@example.com", password="Secret123!", is_admin=False)
+    _seed_reservations("owner-rows@example.com", 3)
+
+    response = client.get("/api/reservations", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == 200
+
+    with session_scope() as session:
+        reservations = session.query(Reservation).order_by(Reservation.start_time, Reservation.id).all()
+        expected = [serialize_reservation(reservation, include_private=True) for reservation in reservations]
+    assert response.get_json()["reservations"] == expected
+    # Applicants have no display name of their own and fall back to the whitelist.
+    assert {item["user"]["displayName"] for item in expected} >= {"Applicant 0", "Applicant 1"}
+
+
+def test_pending_count_is_maintained_across_writes_and_reconciled(client):
+    admin_token = register_user_and_get_token(client, email="admin-pending@example.com", password="Secret123!", is_admin=True)
+    user_token = register_user_and_get_token(client, email="member-pending@example.com", password="Secret123!", is_admin=False)
+    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    user_headers = {"Authorization": f"Bearer {user_token}"}
+
+    def pending_count() -> int:
+        response = client.get("/api/admin/reservations/pending-count", headers=admin_headers)
+        assert response.status_code == 200
+        return response.get_json()["count"]
+
+    assert pending_count() == 0
+    ids = [
+        client.post("/api/reservations", headers=user_headers, json=_reservation_payload()).get_json()["reservation"]["id"]
+        for _ in range(3)
+    ]
+    assert pending_count() == 3
+
+    client.patch(f"/api/admin/reservations/{ids[0]}/status", headers=admin_headers, json={"status": "approved"})
+    assert pending_count() == 2
+    client.patch(f"/api/reservations/{ids[0]}", headers=user_headers, json={"status": "cancellation_requested"})
+    assert pending_count() == 3
+    client.delete(f"/api/admin/reservations/{ids[1]}", headers=admin_headers)
+    assert pending_count() == 2
+
+    # Reads trust the counter until it is due for reconciliation, then recount.
+    with session_scope() as session:
+        counter = session.get(ReservationCounter, "pending")
+        assert counter.value == 2
+        counter.value = 40
+    with count_queries() as statements:
+        assert pending_count() == 40
+    assert not any("count(" in statement.lower() for statement in statements)
+
+    with session_scope() as session:
+        session.get(ReservationCounter, "pending").reconciled_at = datetime.utcnow() - timedelta(hours=1)
+    with count_queries() as statements:
+        assert pending_count() == 2
+    # The recount happens inside the UPDATE instead of writing back a value read
+    # earlier, which could overwrite a concurrent writer's increment.
+    updates = [statement for statement in statements if statement.lower().startswith("update reservation_counters")]
+    assert len(updates) == 1
+    assert "select count(" in updates[0].lower()
+
+
+def test_pending_count_recreates_a_missing_counter_without_conflicts(client, monkeypatch):
+    member_token = register_user_and_get_token(
+        client,
+        email="member-counter@example.com",
+        password="Secret123!",
+        is_admin=False,
+    )
+    headers = {"Authorization": f"Bearer {member_token}"}
+    with session_scope() as session:
+        session.query(ReservationCounter).delete()
+
+    assert client.post("/api/reservations", headers=headers, json=_reservation_payload()).status_code == 201
+    with session_scope() as session:
+        assert session.get(ReservationCounter, "pending").value == 1
+
+    # Another request created the row after this one found it missing: the
+    # write must overwrite it rather than fail on the primary key.
+    with session_scope() as session:
+        session.add(Reservation(
+            user_id=session.query(User.id).filter(User.email == "member-counter@example.com").scalar(),
+            purpose="並行",
+            start_time=datetime.utcnow(),
+            end_time=datetime.utcnow() + timedelta(hours=1),
+        ))
+        session.flush()
+        monkeypatch.setattr(session, "get", lambda *args, **kwargs: None)
+        assert _pending_count(session) == 2
+    with session_scope() as session:
+        assert session.get(ReservationCounter, "pending").value == 2
@@ -0,0 +1,108 @@
+"""Tests for the persistent SMTP transport."""
+
+from __future__ import annotations
+
+import smtplib
+from email.message import EmailMessage
+
+import pytest
+
+from app.utils import smtp
+from app.utils.smtp import SmtpTransport
+
+
+class FakeSMTP:
+    instances: list["FakeSMTP"] = []
+
+    def __init__(self, host, port, timeout=None):
+        self.host = host
+        self.calls: list[str] = []
+        self.sent: list[str] = []
+        self.drop_next = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self, context=None):
+        self.calls.append("starttls")
+
+    def login(self, username, password):
+        self.calls.append("login")
+
+    def send_message(self, message):
+        if self.drop_next:
+            self.drop_next = False
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        self.sent.append(message["To"])
+
+    def quit(self):
+        self.calls.append("quit")
+
+    def close(self):
+        self.calls.append("close")
+
+
+@pytest.fixture()
+def transport(monkeypatch):
+    FakeSMTP.instances = []
+    lookups = []
+    monkeypatch.setattr(smtp.smtplib, "SMTP", FakeSMTP)
+    monkeypatch.setattr(
+        smtp.socket,
+        "getaddrinfo",
+        lambda host, *args: lookups.append(host) or [(None, None, None, None, ("192.0.2.10", 587))],
+    )
+    clock = [0.0]
+    transport = SmtpTransport(
+        host="smtp.example.com",
+        port=587,
+        username="mailer",
+        password="secret",
+        use_tls=True,
+        idle_timeout=60,
+        clock=lambda: clock[0],
+    )
+    return transport, clock, lookups
+
+
+def _message(to: str) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = to
+    message.set_content("body")
+    return message
+
+
+def test_recipients_share_one_session(transport):
+    transport, clock, lookups = transport
+    for to in ("a@example.com", "b@example.com", "c@example.com"):
+        transport.send(_message(to))
+        clock[0] += 1
+
+    assert lookups == ["smtp.example.com"]
+    assert len(FakeSMTP.instances) == 1
+    server = FakeSMTP.instances[0]
+    assert server.host == "192.0.2.10"
+    assert server.calls == ["starttls", "login"]
+    assert server.sent == ["a@example.com", "b@example.com", "c@example.com"]
+    assert transport.stats()["connections"] == 1
+
+
+def test_idle_and_dropped_sessions_reconnect(transport):
+    transport, clock, lookups = transport
+    transport.send(_message("a@example.com"))
+
+    clock[0] += 61
+    transport.send(_message("b@example.com"))
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].calls[-1] == "quit"
+
+    FakeSMTP.instances[1].drop_next = True
+    transport.send(_message("c@example.com"))
+    assert len(FakeSMTP.instances) == 3
+    assert FakeSMTP.instances[2].sent == ["c@example.com"]
+    assert lookups == ["smtp.example.com"]
+    assert transport.stats() == {
+        "resolves": 1,
+        "connections": 3,
+        "reconnects": 1,
+        "sent": 3,
+        "idleTimeoutSeconds": 60,
+    }
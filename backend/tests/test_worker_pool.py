@@ -0,0 +1,91 @@
+"""Tests for the bounded notification worker pool."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from app.utils.worker_pool import WorkerPool
+from tests.utils import register_user_and_get_token
+
+
+def _blocked_pool(overflow: str) -> tuple[WorkerPool, threading.Event, list[str]]:
+    """A one-worker, one-slot pool whose worker is stuck on a first task."""
+    pool = WorkerPool(workers=1, queue_size=1, overflow=overflow, name="test")
+    release = threading.Event()
+    started = threading.Event()
+    ran: list[str] = []
+
+    def block() -> None:
+        started.set()
+        release.wait(5)
+        ran.append("block")
+
+    pool.submit(block)
+    assert started.wait(5)
+    pool.submit(ran.append, "queued")
+    return pool, release, ran
+
+
+def test_drop_newest_rejects_when_full():
+    pool, release, ran = _blocked_pool("drop_newest")
+    assert pool.submit(ran.append, "overflow") is False
+    assert pool.stats()["queued"] == 1
+
+    release.set()
+    pool.join()
+    assert ran == ["block", "queued"]
+    assert pool.stats() == {
+        "workers": 1,
+        "busy": 0,
+        "queued": 0,
+        "maxQueue": 1,
+        "overflowPolicy": "drop_newest",
+        "submitted": 3,
+        "completed": 2,
+        "failed": 0,
+        "dropped": 1,
+        "callerRuns": 0,
+    }
+
+
+def test_drop_oldest_replaces_waiting_task():
+    pool, release, ran = _blocked_pool("drop_oldest")
+    assert pool.submit(ran.append, "overflow") is True
+
+    release.set()
+    pool.join()
+    assert ran == ["block", "overflow"]
+    assert pool.stats()["dropped"] == 1
+
+
+def test_caller_runs_executes_in_submitting_thread():
+    pool, release, ran = _blocked_pool("caller_runs")
+    callers: list[str] = []
+    assert pool.submit(lambda: callers.append(threading.current_thread().name)) is True
+    assert callers == [threading.current_thread().name]
+
+    release.set()
+    pool.join()
+    assert pool.stats()["callerRuns"] == 1
+
+
+def test_failing_task_does_not_kill_worker():
+    pool = WorkerPool(workers=1, queue_size=4, name="test")
+    ran: list[int] = []
+    pool.submit(lambda: 1 / 0)
+    pool.submit(ran.append, 1)
+    pool.join()
+    assert ran == [1]
+    assert pool.stats()["failed"] == 1
+
+    with pytest.raises(ValueError):
+        WorkerPool(workers=1, queue_size=1, overflow="block")
+
+
+def test_metrics_expose_notification_queue(client):
+    token = register_user_and_get_token(client, email="admin-pool@example.com", password="Secret123!", is_admin=True)
+    response = client.get("/api/admin/metrics", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    assert {"queued", "maxQueue", "dropped", "busy"} <= set(response.get_json()["notifications"])
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from typing import Iterator
 
-from app.database import session_scope
+from sqlalchemy import event
+
+from app.database import engine, session_scope
 from app.models import WhitelistEntry
 
 
@@ -29,3 +34,24 @@ def register_user_and_get_token(client, *, email: str, password: str, is_admin:
     assert response.status_code == 201, response.get_json()
     body = response.get_json()
     return body["accessToken"]
+
+
+@contextmanager
+def count_queries() -> Iterator[list[str]]:
+    """Collect SQL statements the current thread executes inside the block.
+
+    Notification threads started by earlier requests may still be querying, so
+    statements from other threads are ignored.
+    """
+    statements: list[str] = []
+    thread_id = threading.get_ident()
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() == thread_id:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _record)